@@ -0,0 +1,193 @@
+# backend/app/async_database.py
+"""
+Módulo de Base de Datos Asíncrona
+=================================
+Pool de conexiones asyncio (aiomysql) usado por los routers ``async``.
+Convive con el pool síncrono de ``database.py``, que sigue sirviendo a los
+procesos en segundo plano como la carga de Excel.
+
+Cada petición HTTP comparte una única conexión (``RequestConnection``) que se
+obtiene del pool la primera vez que se necesita y se libera al terminar la
+petición desde ``RequestConnectionMiddleware``.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+import aiomysql
+from fastapi import Request
+from .config import settings
+from .database import PoolTimeoutError
+
+_async_pool = None
+_init_lock = asyncio.Lock()
+
+
+async def init_async_pool():
+    """
+    Inicializa el pool asíncrono de conexiones a MySQL.
+
+    Returns:
+        aiomysql.Pool: Pool de conexiones asíncrono.
+
+    Raises:
+        Exception: Si no se puede crear el pool.
+    """
+    global _async_pool
+    if _async_pool is None:
+        async with _init_lock:
+            if _async_pool is None:
+                try:
+                    _async_pool = await aiomysql.create_pool(
+                        host=settings.MYSQL_HOST,
+                        port=settings.MYSQL_PORT,
+                        user=settings.MYSQL_USER,
+                        password=settings.MYSQL_PASSWORD,
+                        db=settings.MYSQL_DATABASE,
+                        minsize=settings.ASYNC_DB_POOL_MIN,
+                        maxsize=settings.ASYNC_DB_POOL_MAX,
+                        pool_recycle=settings.DB_POOL_RECYCLE,
+                        autocommit=True
+                    )
+                except Exception as e:
+                    raise Exception(f"Error al inicializar el pool asíncrono: {str(e)}")
+    return _async_pool
+
+
+async def close_async_pool():
+    """
+    Cierra el pool asíncrono y espera a que se liberen sus conexiones.
+    """
+    global _async_pool
+    if _async_pool is not None:
+        _async_pool.close()
+        await _async_pool.wait_closed()
+        _async_pool = None
+
+
+async def _acquire(pool):
+    """
+    Obtiene una conexión del pool respetando DB_POOL_TIMEOUT.
+
+    Raises:
+        PoolTimeoutError: Si el pool está agotado durante más de DB_POOL_TIMEOUT.
+        Exception: Si hay un error al obtener la conexión.
+    """
+    try:
+        return await asyncio.wait_for(pool.acquire(), timeout=settings.DB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PoolTimeoutError(
+            f"No se obtuvo una conexión asíncrona en {settings.DB_POOL_TIMEOUT}s"
+        )
+    except Exception as e:
+        raise Exception(f"Error al obtener la conexión: {str(e)}")
+
+
+class RequestConnection:
+    """
+    Unidad de trabajo de una petición: una sola conexión, obtenida de forma
+    perezosa y compartida por la autenticación y la lógica de negocio.
+
+    Las llamadas que la usan deben ser secuenciales (no ``asyncio.gather``),
+    ya que una conexión MySQL no admite consultas concurrentes.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._conn = None
+
+    async def get(self):
+        """
+        Devuelve la conexión de la petición, obteniéndola del pool si aún no existe.
+
+        Returns:
+            aiomysql.Connection: Conexión asignada a la petición.
+        """
+        if self._conn is None:
+            self._pool = await init_async_pool()
+            self._conn = await _acquire(self._pool)
+        return self._conn
+
+    def release(self):
+        """
+        Devuelve la conexión al pool si llegó a obtenerse. Se puede llamar
+        antes de una espera larga sin base de datos (p. ej. un hash bcrypt);
+        la siguiente llamada a ``get`` obtiene otra conexión.
+        """
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+
+class RequestConnectionMiddleware:
+    """
+    Middleware ASGI que crea un ``RequestConnection`` por petición y lo libera
+    cuando la respuesta (incluido un posible cuerpo en streaming) ha terminado.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        db = RequestConnection()
+        scope.setdefault("state", {})["db"] = db
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            db.release()
+
+
+def get_db(request: Request) -> RequestConnection:
+    """
+    Dependencia FastAPI que entrega la unidad de trabajo de la petición.
+
+    Args:
+        request (Request): Petición en curso.
+
+    Returns:
+        RequestConnection: Conexión perezosa de la petición.
+    """
+    return request.state.db
+
+
+@asynccontextmanager
+async def get_async_conn(db: Optional[RequestConnection] = None):
+    """
+    Proporciona una conexión asíncrona de manera segura.
+
+    Si se recibe la unidad de trabajo de la petición se reutiliza su conexión
+    (que libera el middleware); si no, se obtiene y devuelve una del pool.
+
+    Args:
+        db (RequestConnection | None): Conexión de la petición.
+
+    Yields:
+        aiomysql.Connection: Una conexión a MySQL.
+
+    Raises:
+        PoolTimeoutError: Si el pool está agotado durante más de DB_POOL_TIMEOUT.
+        Exception: Si hay un error al obtener la conexión.
+    """
+    if db is not None:
+        conn = await db.get()
+        try:
+            yield conn
+        except Exception:
+            # No dejar una transacción a medias a las siguientes llamadas de la petición
+            if conn.get_transaction_status():
+                await conn.rollback()
+            raise
+        return
+
+    pool = await init_async_pool()
+    conn = await _acquire(pool)
+    try:
+        yield conn
+    except Exception:
+        if conn.get_transaction_status():
+            await conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
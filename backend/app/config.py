@@ -26,9 +26,35 @@ class Settings(BaseSettings):
         MYSQL_PASSWORD (str): Contraseña de MySQL.
         MYSQL_DATABASE (str): Nombre de la base de datos MySQL.
         MYSQL_ROOT_PASSWORD (str): Contraseña de root de MySQL.
+        DB_POOL_SIZE (int): Conexiones permanentes del pool.
+        DB_POOL_MAX_OVERFLOW (int): Conexiones extra permitidas en picos de carga.
+        DB_POOL_TIMEOUT (float): Segundos máximos de espera para obtener una conexión.
+        DB_POOL_RECYCLE (int): Segundos de vida de una conexión antes de reciclarla.
+        ASYNC_DB_POOL_MIN (int): Conexiones mínimas del pool asíncrono.
+        ASYNC_DB_POOL_MAX (int): Conexiones máximas del pool asíncrono.
         SECRET_KEY (str): Clave secreta para tokens.
         ALGORITHM (str): Algoritmo de encriptación.
         ACCESS_TOKEN_EXPIRE_MINUTES (int): Tiempo de expiración del token de acceso.
+        PRINCIPAL_CACHE_TTL (int): Segundos que se cachea el usuario autenticado.
+        PRINCIPAL_CACHE_SIZE (int): Número máximo de usuarios autenticados en caché.
+        REVOCATION_REFRESH_SECONDS (float): Intervalo de refresco del mapa de revocación.
+        BCRYPT_ROUNDS (int): Coste de bcrypt; los hashes con otro coste se regeneran al iniciar sesión.
+        HASH_WORKERS (int): Procesos dedicados a calcular hashes de contraseñas.
+        HASH_QUEUE_LIMIT (int): Operaciones de hash pendientes antes de responder 503.
+        BUSINESS_OPEN_HOUR (int): Hora de apertura usada para calcular disponibilidad.
+        BUSINESS_CLOSE_HOUR (int): Hora de cierre usada para calcular disponibilidad.
+        AVAILABILITY_SLOT_MINUTES (int): Granularidad de los huecos de disponibilidad.
+        AVAILABILITY_MAX_DAYS (int): Días máximos por consulta de disponibilidad.
+        MAX_BLOCK_MINUTES (int): Duración máxima de una reserva o bloque de calendario; acota
+            la búsqueda de solapamientos (los bloques manuales más largos deben dividirse).
+        RESERVATION_CACHE_TTL (int): Segundos que se cachea la lista de reservas de cada cliente.
+        RESERVATION_CACHE_SIZE (int): Número máximo de clientes con su lista de reservas en caché.
+        SERVICE_CATALOG_TTL (int): Segundos que se sirve la instantánea del catálogo de servicios sin releerla.
+        IMPORT_WORKERS (int): Hilos que procesan importaciones Excel en segundo plano.
+        IMPORT_PARSE_WORKERS (int): Procesos que leen y validan archivos Excel en paralelo (uno por archivo).
+        IMPORT_QUEUE_LIMIT (int): Importaciones en cola o en curso antes de responder 503.
+        IMPORT_JOB_TTL (int): Segundos que se conserva el resultado de una importación terminada.
+        IMPORT_MAX_FILE_MB (int): Tamaño máximo en MB de cada archivo Excel subido.
     """
     # Configuración de la aplicación
     APP_NAME: str = "Biblioteca Digital"
@@ -43,10 +69,37 @@ class Settings(BaseSettings):
     MYSQL_DATABASE: str
     MYSQL_ROOT_PASSWORD: str
 
+    # Configuración del pool de conexiones
+    DB_POOL_SIZE: int = 10
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    ASYNC_DB_POOL_MIN: int = 1
+    ASYNC_DB_POOL_MAX: int = 20
+
     # Configuración de seguridad
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL: int = 60
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    REVOCATION_REFRESH_SECONDS: float = 2.0
+    BCRYPT_ROUNDS: int = 12
+    HASH_WORKERS: int = 2
+    HASH_QUEUE_LIMIT: int = 32
+    BUSINESS_OPEN_HOUR: int = 8
+    BUSINESS_CLOSE_HOUR: int = 20
+    AVAILABILITY_SLOT_MINUTES: int = 15
+    AVAILABILITY_MAX_DAYS: int = 62
+    MAX_BLOCK_MINUTES: int = 1440
+    RESERVATION_CACHE_TTL: int = 60
+    RESERVATION_CACHE_SIZE: int = 10000
+    SERVICE_CATALOG_TTL: int = 30
+    IMPORT_WORKERS: int = 2
+    IMPORT_PARSE_WORKERS: int = 4
+    IMPORT_QUEUE_LIMIT: int = 10
+    IMPORT_JOB_TTL: int = 3600
+    IMPORT_MAX_FILE_MB: int = 100
 
     class Config:
         env_file = ENV_PATH
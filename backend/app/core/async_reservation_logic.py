@@ -0,0 +1,406 @@
+# backend/app/core/async_reservation_logic.py
+"""
+Lógica de Reservas (asíncrona)
+==============================
+Versiones ``async`` de las funciones de ``reservation_logic`` sobre el pool
+aiomysql. Reutiliza las mismas consultas SQL y el formateo de fechas.
+"""
+
+import csv
+import io
+import json
+import logging
+from decimal import Decimal
+from typing import Optional
+import aiomysql
+from ..async_database import get_async_conn, RequestConnection
+from . import reference_data, reservation_cache
+from .serialization import dumps
+from .reservation_logic import (
+    EXPORT_BATCH_SIZE,
+    format_datetimes, present, parse_booking_window, booking_days, ReservationConflictError,
+    SQL_ACTIVE_SERVICE, SQL_INSERT_RESERVATION, SQL_INSERT_BLOCK,
+    lock_days_query, SQL_ENSURE_DAY_LOCK, SQL_OVERLAPPING_BLOCK, blocks_in_range_params,
+    SQL_RESERVATION_WINDOW, reactivates,
+    build_listing_query, build_page, SQL_USER_RESERVATIONS,
+    SQL_SYNC_START, SQL_RESERVATION_CHANGES, encode_sync_token, decode_sync_token, SQL_RESERVATION_BY_ID, SQL_UPDATE_STATUS,
+    SQL_RESERVATION_OWNER, SQL_CANCEL_RESERVATION, SQL_DELETE_RESERVATION
+)
+
+
+async def lock_window(conn, cur, start, end):
+    """
+    Versión asíncrona de ``reservation_logic.lock_window``: abre una
+    transacción con los días de [start, end) bloqueados y comprueba que el
+    horario siga libre. Si falla, ``get_async_conn`` deshace la transacción.
+
+    Args:
+        conn (aiomysql.Connection): Conexión.
+        cur (aiomysql.Cursor): Cursor de ``conn``.
+        start (datetime): Inicio del horario.
+        end (datetime): Fin del horario (exclusivo).
+
+    Raises:
+        ReservationConflictError: Si el horario ya está ocupado.
+    """
+    days = booking_days(start, end)
+    # Fuera de la transacción (autocommit): la lectura de bloques debe tomar
+    # su instantánea después de obtener los cerrojos.
+    await cur.executemany(SQL_ENSURE_DAY_LOCK, [(day,) for day in days])
+    await conn.begin()
+    await cur.execute(lock_days_query(days), days)
+    await cur.fetchall()
+    await cur.execute(SQL_OVERLAPPING_BLOCK, blocks_in_range_params(start, end))
+    if await cur.fetchone():
+        raise ReservationConflictError("The selected time slot is no longer available")
+
+
+async def create_reservation(id_user: int, reservation_data: dict, db: Optional[RequestConnection] = None):
+    """
+    Crea una nueva reserva y bloquea el horario en el calendario.
+
+    La comprobación de solapamiento y los dos INSERT van en una transacción
+    serializada por los cerrojos de los días que toca la reserva.
+
+    Args:
+        id_user (int): ID del usuario que hace la reserva.
+        reservation_data (dict): Datos de la reserva.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        int: ID de la nueva reserva.
+
+    Raises:
+        ValueError: Si las fechas no son válidas o el servicio no existe o está inactivo.
+        ReservationConflictError: Si el horario ya está ocupado.
+    """
+    start, end = parse_booking_window(reservation_data)
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_ACTIVE_SERVICE, (reservation_data["id_service"],))
+                service = await cur.fetchone()
+                if not service:
+                    raise ValueError("Service not found or inactive")
+                await lock_window(conn, cur, start, end)
+
+                await cur.execute(
+                    SQL_INSERT_RESERVATION,
+                    (
+                        id_user,
+                        reservation_data["id_service"],
+                        reference_data.status_id(reference_data.STATUS_PENDING),
+                        start,
+                        end,
+                        service["price"],
+                        reservation_data["payment_method"]
+                    )
+                )
+                new_id = cur.lastrowid
+
+                await cur.execute(
+                    SQL_INSERT_BLOCK,
+                    (
+                        new_id,
+                        f"Reserva: {service['name']}",
+                        start,
+                        end
+                    )
+                )
+                await conn.commit()
+        reservation_cache.invalidate(id_user)
+        return new_id
+    except ValueError:
+        raise
+    except Exception as e:
+        logging.error(f"Error al crear reserva: {str(e)}")
+        raise
+
+
+async def get_user_reservations(id_user: int, db: Optional[RequestConnection] = None):
+    """
+    Obtiene todas las reservas de un usuario.
+
+    Args:
+        id_user (int): ID del usuario.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        list: Lista de reservas del usuario con información del servicio y estado.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_USER_RESERVATIONS, (id_user,))
+                rows = await cur.fetchall()
+        return [present(row) for row in rows]
+    except Exception as e:
+        logging.error(f"Error al obtener reservas del usuario {id_user}: {str(e)}")
+        raise
+
+
+async def get_user_reservations_json(id_user: int, db: Optional[RequestConnection] = None) -> bytes:
+    """
+    Devuelve las reservas de un usuario ya serializadas, desde ``reservation_cache`` si están.
+
+    Args:
+        id_user (int): ID del usuario.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bytes: JSON de la lista de reservas.
+    """
+    body = reservation_cache.get(id_user)
+    if body is None:
+        seen = reservation_cache.version(id_user)
+        body = dumps(await get_user_reservations(id_user, db=db))
+        reservation_cache.put(id_user, body, seen)
+    return body
+
+
+async def get_all_reservations(filters: Optional[dict] = None, cursor: Optional[str] = None, limit: int = 50,
+                               db: Optional[RequestConnection] = None):
+    """
+    Obtiene una página de las reservas del sistema (para administradores).
+
+    Args:
+        filters (dict | None): Filtros de ``RESERVATION_FILTERS``.
+        cursor (str | None): Cursor devuelto por la página anterior.
+        limit (int): Tamaño de página.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict: Reservas de la página (con servicio, usuario y estado) y cursor de la siguiente.
+
+    Raises:
+        ValueError: Si el cursor no es válido.
+    """
+    sql, params = build_listing_query(filters, cursor, limit + 1)
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+        return build_page(list(rows), limit)
+    except Exception as e:
+        logging.error(f"Error al obtener todas las reservas: {str(e)}")
+        raise
+
+
+def _json_default(value):
+    return float(value) if isinstance(value, Decimal) else str(value)
+
+
+def _export_chunk(rows: list, fmt: str, columns: list, header: bool = False) -> bytes:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(columns)
+        for row in rows:
+            format_datetimes(present(row))
+            writer.writerow([row[column] for column in columns])
+        return buffer.getvalue().encode()
+    return "".join(
+        json.dumps(format_datetimes(present(row)), default=_json_default, ensure_ascii=False) + "\n" for row in rows
+    ).encode()
+
+
+async def stream_reservations(fmt: str, filters: Optional[dict] = None):
+    """
+    Genera la exportación de reservas leyendo con un cursor de servidor (sin buffer).
+
+    Usa una conexión propia del pool durante todo el streaming. Si el cliente
+    corta la descarga, la conexión se cierra en lugar de drenar el resto del
+    resultado.
+
+    Args:
+        fmt (str): ``ndjson`` o ``csv``.
+        filters (dict | None): Filtros de ``RESERVATION_FILTERS``.
+
+    Yields:
+        bytes: Bloques de hasta ``EXPORT_BATCH_SIZE`` filas serializadas.
+    """
+    sql, params = build_listing_query(filters)
+    async with get_async_conn() as conn:
+        cur = await conn.cursor(aiomysql.SSDictCursor)
+        finished = False
+        try:
+            await cur.execute(sql, params)
+            columns = [column[0] for column in cur.description]
+            columns.insert(columns.index("service_name") + 1, "status_name")
+            if fmt == "csv":
+                yield _export_chunk([], fmt, columns, header=True)
+            while True:
+                rows = await cur.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                yield _export_chunk(rows, fmt, columns)
+            finished = True
+        except Exception as e:
+            logging.error(f"Error al exportar reservas: {str(e)}")
+            raise
+        finally:
+            if finished:
+                await cur.close()
+            else:
+                conn.close()
+
+
+async def get_reservation_changes(since: Optional[str] = None, limit: int = 500,
+                                  db: Optional[RequestConnection] = None):
+    """
+    Obtiene las reservas insertadas, modificadas o borradas desde un token de sincronización.
+
+    Sin ``since`` no devuelve filas, solo el token inicial: el cliente lo pide
+    antes de cargar el listado completo y a partir de ahí aplica los cambios.
+    Las reservas borradas llegan con ``state = false``.
+
+    Args:
+        since (str | None): ``next_token`` de la llamada anterior.
+        limit (int): Máximo de filas a devolver.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict: ``{"items": [...], "next_token": str, "has_more": bool}``.
+
+    Raises:
+        ValueError: Si el token no es válido.
+    """
+    position = decode_sync_token(since) if since else None
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                if position is None:
+                    await cur.execute(SQL_SYNC_START)
+                    start = await cur.fetchone()
+                    return {"items": [], "next_token": encode_sync_token(start["updated_at"], 0), "has_more": False}
+                after, id_reservation = position
+                await cur.execute(SQL_RESERVATION_CHANGES, (after, after, id_reservation, limit + 1))
+                rows = list(await cur.fetchall())
+    except Exception as e:
+        logging.error(f"Error al obtener cambios de reservas: {str(e)}")
+        raise
+
+    items = rows[:limit]
+    next_token = encode_sync_token(items[-1]["updated_at"], items[-1]["id_reservation"]) if items else since
+    return {"items": [present(row) for row in items], "next_token": next_token, "has_more": len(rows) > limit}
+
+
+async def get_reservation_by_id(id_reservation: int, db: Optional[RequestConnection] = None):
+    """
+    Obtiene una reserva por su ID.
+
+    Args:
+        id_reservation (int): ID de la reserva.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict | None: Datos de la reserva.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_RESERVATION_BY_ID, (id_reservation,))
+                result = await cur.fetchone()
+        return present(result) if result else None
+    except Exception as e:
+        logging.error(f"Error al obtener reserva con id {id_reservation}: {str(e)}")
+        raise
+
+
+async def update_reservation_status(id_reservation: int, id_reservation_status: int, db: Optional[RequestConnection] = None):
+    """
+    Actualiza el estado de una reserva.
+
+    Reactivar una reserva cancelada vuelve a ocupar su horario, así que pasa
+    por los mismos cerrojos y la misma comprobación de solapamiento que al
+    reservar.
+
+    Args:
+        id_reservation (int): ID de la reserva.
+        id_reservation_status (int): Nuevo ID del estado.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bool: True si la actualización fue exitosa.
+
+    Raises:
+        ValueError: Si el estado no existe.
+        ReservationConflictError: Si se reactiva y su horario ya está ocupado.
+    """
+    reference_data.require_status(id_reservation_status)
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_RESERVATION_WINDOW, (id_reservation,))
+                reservation = await cur.fetchone()
+                if reactivates(reservation, id_reservation_status):
+                    await lock_window(conn, cur, reservation["start_datetime"], reservation["end_datetime"])
+                    await cur.execute(SQL_UPDATE_STATUS, (id_reservation_status, id_reservation))
+                    await conn.commit()
+                else:
+                    await cur.execute(SQL_UPDATE_STATUS, (id_reservation_status, id_reservation))
+        reservation_cache.invalidate(reservation["id_user"] if reservation else None)
+        return True
+    except ValueError:
+        raise
+    except Exception as e:
+        logging.error(f"Error al actualizar estado de reserva {id_reservation}: {str(e)}")
+        raise
+
+
+async def cancel_reservation(id_reservation: int, id_user: int, db: Optional[RequestConnection] = None):
+    """
+    Cancela una reserva (solo si pertenece al usuario).
+
+    Args:
+        id_reservation (int): ID de la reserva.
+        id_user (int): ID del usuario que quiere cancelar.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bool: True si la cancelación fue exitosa.
+
+    Raises:
+        ValueError: Si la reserva no existe o no pertenece al usuario.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_RESERVATION_OWNER, (id_reservation,))
+                reservation = await cur.fetchone()
+                if not reservation or reservation["id_user"] != id_user:
+                    raise ValueError("Reservation not found or unauthorized")
+                await cur.execute(SQL_CANCEL_RESERVATION, (reference_data.status_id(reference_data.STATUS_CANCELLED), id_reservation))
+        reservation_cache.invalidate(id_user)
+        return True
+    except ValueError:
+        raise
+    except Exception as e:
+        logging.error(f"Error al cancelar reserva {id_reservation}: {str(e)}")
+        raise
+
+
+async def delete_reservation(id_reservation: int, db: Optional[RequestConnection] = None):
+    """
+    Elimina lógicamente una reserva.
+
+    Args:
+        id_reservation (int): ID de la reserva.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bool: True si la eliminación fue exitosa.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_RESERVATION_OWNER, (id_reservation,))
+                owner = await cur.fetchone()
+                await cur.execute(SQL_DELETE_RESERVATION, (id_reservation,))
+        reservation_cache.invalidate(owner["id_user"] if owner else None)
+        return True
+    except Exception as e:
+        logging.error(f"Error al eliminar reserva {id_reservation}: {str(e)}")
+        raise
@@ -0,0 +1,124 @@
+# backend/app/core/async_service_logic.py
+"""
+Lógica de Servicios (asíncrona)
+===============================
+Versiones ``async`` de las funciones CRUD de ``service_logic`` sobre el pool
+aiomysql. Reutiliza las mismas consultas SQL.
+"""
+
+import logging
+from typing import Optional
+import aiomysql
+from ..async_database import get_async_conn, RequestConnection
+from . import service_catalog
+from .service_logic import (
+    SQL_ALL_SERVICES, SQL_SERVICE_BY_ID, SQL_INSERT_SERVICE, SQL_UPDATE_SERVICE, SQL_DELETE_SERVICE
+)
+
+
+async def get_all_services(db: Optional[RequestConnection] = None):
+    """
+    Obtiene todos los servicios registrados en la base de datos.
+
+    Args:
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        list[dict]: Lista de registros con la información de los servicios.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_ALL_SERVICES)
+                return list(await cur.fetchall())
+    except Exception as e:
+        logging.error(f"Error al obtener todos los servicios: {str(e)}")
+        raise
+
+
+async def get_service_by_id(id_service: int, db: Optional[RequestConnection] = None):
+    """
+    Obtiene un servicio específico por su ID.
+
+    Args:
+        id_service (int): Identificador del servicio.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict | None: Registro del servicio si existe, de lo contrario None.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_SERVICE_BY_ID, (id_service,))
+                return await cur.fetchone()
+    except Exception as e:
+        logging.error(f"Error al obtener servicio con id {id_service}: {str(e)}")
+        raise
+
+
+async def create_service(data: dict, db: Optional[RequestConnection] = None):
+    """
+    Crea un nuevo servicio en la base de datos.
+
+    Args:
+        data (dict): Diccionario con los campos 'name', 'description',
+                     'duration_minutes', 'price' y 'state'.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        int: ID del servicio recién creado.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    SQL_INSERT_SERVICE,
+                    (data["name"], data.get("description"), data["duration_minutes"], data["price"], data["state"])
+                )
+                new_id = cur.lastrowid
+        service_catalog.invalidate()
+        return new_id
+    except Exception as e:
+        logging.error(f"Error al crear servicio: {str(e)}")
+        raise
+
+
+async def update_service(id_service: int, data: dict, db: Optional[RequestConnection] = None):
+    """
+    Actualiza los datos de un servicio existente.
+
+    Args:
+        id_service (int): Identificador del servicio a actualizar.
+        data (dict): Campos actualizados con sus nuevos valores.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    SQL_UPDATE_SERVICE,
+                    (data["name"], data.get("description"), data["duration_minutes"], data["price"], data["state"], id_service)
+                )
+        service_catalog.invalidate()
+    except Exception as e:
+        logging.error(f"Error al actualizar servicio con id {id_service}: {str(e)}")
+        raise
+
+
+async def delete_service(id_service: int, db: Optional[RequestConnection] = None):
+    """
+    Elimina un servicio por su ID.
+
+    Args:
+        id_service (int): Identificador del servicio a eliminar.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(SQL_DELETE_SERVICE, (id_service,))
+        service_catalog.invalidate()
+    except Exception as e:
+        logging.error(f"Error al eliminar servicio con id {id_service}: {str(e)}")
+        raise
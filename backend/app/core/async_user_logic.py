@@ -0,0 +1,297 @@
+# backend/app/core/async_user_logic.py
+"""
+Lógica de Usuarios (asíncrona)
+==============================
+Versiones ``async`` de las funciones de ``user_logic`` sobre el pool aiomysql.
+Reutiliza las mismas consultas SQL para que ambos caminos no diverjan.
+"""
+
+import logging
+from typing import Optional
+import aiomysql
+from ..async_database import get_async_conn, RequestConnection
+from ..models import UserCreate
+from . import principal_cache, revocation, password_hashing
+from .user_logic import (
+    SQL_USER_BY_EMAIL, SQL_INSERT_ACCOUNT, SQL_INSERT_PROFILE, SQL_ALL_USERS,
+    SQL_USER_BY_ID, SQL_UPDATE_PROFILE, SQL_UPDATE_EMAIL, SQL_UPDATE_ROLE, SQL_SET_STATE,
+    SQL_SET_LOGGED_IN, SQL_REVOKE_TOKENS, SQL_UPDATE_PASSWORD
+)
+
+
+async def get_user_by_email(email: str, db: Optional[RequestConnection] = None) -> Optional[dict]:
+    """
+    Busca un usuario por su correo electrónico.
+
+    Args:
+        email (str): Correo electrónico del usuario.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict | None: Información combinada del usuario y su perfil, o None si no existe.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_USER_BY_EMAIL, (email,))
+                return await cur.fetchone()
+    except Exception as e:
+        logging.error(f"Error al obtener usuario por email ({email}): {str(e)}")
+        raise
+
+
+async def create_user(user_data: UserCreate, db: Optional[RequestConnection] = None) -> dict:
+    """
+    Crea un nuevo usuario junto con su perfil asociado.
+
+    El hash bcrypt se calcula en el pool de procesos de ``password_hashing``,
+    después de devolver al pool la conexión de la petición para no retenerla
+    durante el hash.
+
+    Args:
+        user_data (UserCreate): Objeto con los datos del usuario.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict: Información del usuario recién creado.
+
+    Raises:
+        HashingSaturatedError: Si la cola de hash de contraseñas está llena.
+    """
+    try:
+        if db is not None:
+            db.release()
+        hashed = await password_hashing.hash_password(user_data.password)
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await conn.begin()
+                await cur.execute(SQL_INSERT_ACCOUNT, (user_data.email, hashed, user_data.id_role))
+                id_user = cur.lastrowid
+                await cur.execute(
+                    SQL_INSERT_PROFILE,
+                    (id_user, user_data.first_name, user_data.last_name, user_data.phone)
+                )
+                await conn.commit()
+
+        return {
+            "id_user": id_user,
+            "email": user_data.email,
+            "first_name": user_data.first_name,
+            "last_name": user_data.last_name,
+            "phone": user_data.phone,
+            "id_role": user_data.id_role,
+            "state": True
+        }
+    except Exception as e:
+        logging.error(f"Error al crear usuario ({user_data.email}): {str(e)}")
+        raise
+
+
+async def authenticate_user(email: str, password: str, db: Optional[RequestConnection] = None) -> Optional[dict]:
+    """
+    Autentica un usuario verificando su contraseña.
+
+    Si el hash guardado usa un coste bcrypt distinto de ``BCRYPT_ROUNDS`` se
+    reemplaza de forma transparente por uno nuevo.
+
+    Ninguna conexión queda retenida mientras se espera al pool de hash (que
+    admite más operaciones en cola que conexiones tiene el pool asíncrono):
+    la conexión de la petición se devuelve tras leer el usuario y la
+    actualización del hash usa una conexión propia del pool.
+
+    Args:
+        email (str): Correo electrónico del usuario.
+        password (str): Contraseña sin cifrar ingresada por el usuario.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict | None: Datos del usuario si la autenticación es exitosa, de lo contrario None.
+
+    Raises:
+        HashingSaturatedError: Si la cola de hash de contraseñas está llena.
+    """
+    try:
+        user = await get_user_by_email(email, db=db)
+        if db is not None:
+            db.release()
+        if not user:
+            return None
+        valid, new_hash = await password_hashing.verify_and_update(password, user["password"])
+        if not valid:
+            return None
+        if new_hash:
+            async with get_async_conn() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(SQL_UPDATE_PASSWORD, (new_hash, user["id_user"]))
+        user.pop("password", None)
+        return user
+    except Exception as e:
+        logging.error(f"Error al autenticar usuario ({email}): {str(e)}")
+        raise
+
+
+async def get_all_users(db: Optional[RequestConnection] = None) -> list:
+    """
+    Obtiene todos los usuarios registrados en el sistema.
+
+    Args:
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        list: Lista de todos los usuarios con sus perfiles.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_ALL_USERS)
+                return list(await cur.fetchall())
+    except Exception as e:
+        logging.error(f"Error al obtener todos los usuarios: {str(e)}")
+        raise
+
+
+async def get_user_by_id(user_id: int, db: Optional[RequestConnection] = None) -> Optional[dict]:
+    """
+    Obtiene un usuario por su ID.
+
+    Args:
+        user_id (int): ID del usuario.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict | None: Información del usuario o None si no existe.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_USER_BY_ID, (user_id,))
+                return await cur.fetchone()
+    except Exception as e:
+        logging.error(f"Error al obtener usuario por ID ({user_id}): {str(e)}")
+        raise
+
+
+async def update_user(user_id: int, user_data: dict, db: Optional[RequestConnection] = None) -> dict:
+    """
+    Actualiza los datos de un usuario.
+
+    Args:
+        user_id (int): ID del usuario a actualizar.
+        user_data (dict): Datos a actualizar.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict: Datos actualizados del usuario.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await conn.begin()
+                await cur.execute(
+                    SQL_UPDATE_PROFILE,
+                    (user_data.get('first_name'), user_data.get('last_name'),
+                     user_data.get('phone'), user_id)
+                )
+                if 'email' in user_data:
+                    await cur.execute(SQL_UPDATE_EMAIL, (user_data['email'], user_id))
+                if 'id_role' in user_data:
+                    await cur.execute(SQL_UPDATE_ROLE, (user_data['id_role'], user_id))
+                await conn.commit()
+
+        principal_cache.invalidate_principal(user_id=user_id)
+        revocation.forget(user_id)
+        return await get_user_by_id(user_id, db=db)
+    except Exception as e:
+        logging.error(f"Error al actualizar usuario ({user_id}): {str(e)}")
+        raise
+
+
+async def deactivate_user(user_id: int, db: Optional[RequestConnection] = None) -> bool:
+    """
+    Desactiva un usuario (soft delete).
+
+    Args:
+        user_id (int): ID del usuario a desactivar.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bool: True si se desactivó correctamente.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(SQL_SET_STATE, (False, user_id))
+        principal_cache.invalidate_principal(user_id=user_id)
+        revocation.forget(user_id)
+        return True
+    except Exception as e:
+        logging.error(f"Error al desactivar usuario ({user_id}): {str(e)}")
+        raise
+
+
+async def activate_user(user_id: int, db: Optional[RequestConnection] = None) -> bool:
+    """
+    Reactiva un usuario.
+
+    Args:
+        user_id (int): ID del usuario a reactivar.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bool: True si se reactivó correctamente.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(SQL_SET_STATE, (True, user_id))
+        principal_cache.invalidate_principal(user_id=user_id)
+        revocation.forget(user_id)
+        return True
+    except Exception as e:
+        logging.error(f"Error al reactivar usuario ({user_id}): {str(e)}")
+        raise
+
+
+async def set_logged_in(user_id: int, logged_in: bool, db: Optional[RequestConnection] = None) -> bool:
+    """
+    Marca si el usuario tiene una sesión iniciada (columna ``is_logged_in``).
+
+    Args:
+        user_id (int): ID del usuario.
+        logged_in (bool): Nuevo valor.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bool: True si se actualizó correctamente.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(SQL_SET_LOGGED_IN, (logged_in, user_id))
+        return True
+    except Exception as e:
+        logging.error(f"Error al actualizar la sesión del usuario ({user_id}): {str(e)}")
+        raise
+
+
+async def revoke_tokens(user_id: int, db: Optional[RequestConnection] = None) -> bool:
+    """
+    Revoca todos los tokens del usuario incrementando su ``token_version``.
+
+    Args:
+        user_id (int): ID del usuario.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        bool: True si se revocaron correctamente.
+    """
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(SQL_REVOKE_TOKENS, (user_id,))
+        principal_cache.invalidate_principal(user_id=user_id)
+        revocation.forget(user_id)
+        return True
+    except Exception as e:
+        logging.error(f"Error al revocar los tokens del usuario ({user_id}): {str(e)}")
+        raise
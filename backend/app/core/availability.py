@@ -0,0 +1,178 @@
+# backend/app/core/availability.py
+"""
+Motor de Disponibilidad
+=======================
+Calcula los huecos reservables de un servicio en un rango de fechas.
+
+Los ``calendar_block`` activos de la ventana se vuelcan a un único
+``bytearray`` con un byte por hueco de ``AVAILABILITY_SLOT_MINUTES``:
+``0`` libre, ``1`` ocupado. La base devuelve cada bloque como segundos desde
+el inicio de la ventana, marcarlo es una asignación de slice y buscar dónde
+cabe el servicio es una búsqueda de rachas de ceros con ``re`` sobre el
+propio buffer, así que no hay bucles Python por minuto ni aritmética de
+``datetime`` por bloque.
+"""
+
+import logging
+import math
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+from ..async_database import get_async_conn, RequestConnection
+from ..config import settings
+from . import service_catalog
+from .reservation_logic import ACTIVE_BLOCKS_IN_RANGE, blocks_in_range_params
+
+FREE = 0
+BUSY = 1
+
+# Offsets en segundos desde el inicio de la ventana de cada bloque ocupado.
+# Parámetros: (inicio de ventana, inicio de ventana) + blocks_in_range_params(inicio, fin)
+SQL_BUSY_BLOCKS = (
+    "SELECT TIMESTAMPDIFF(SECOND, %s, b.start_datetime), TIMESTAMPDIFF(SECOND, %s, b.end_datetime)"
+    + ACTIVE_BLOCKS_IN_RANGE
+)
+
+
+@lru_cache(maxsize=64)
+def _free_run(needed: int):
+    return re.compile(b"\\x00{%d,}" % needed)
+
+
+def build_bitmap(days: int, blocks, slot_minutes: int, not_before: int = 0) -> bytearray:
+    """
+    Construye el mapa de ocupación de la ventana.
+
+    Cada día ocupa ``1440 // slot_minutes`` bytes consecutivos (el día
+    completo), de modo que un bloque, aunque cruce la medianoche, se marca con
+    una sola asignación de slice.
+
+    Args:
+        days (int): Número de días de la ventana.
+        blocks (iterable): Pares ``(inicio, fin)`` ocupados, en segundos desde el inicio de la ventana.
+        slot_minutes (int): Duración de cada hueco.
+        not_before (int): Segundo de la ventana antes del cual todo se marca ocupado.
+
+    Returns:
+        bytearray: ``days * 1440 // slot_minutes`` bytes, un byte por hueco.
+    """
+    size = days * (1440 // slot_minutes)
+    bitmap = bytearray(size)
+    busy = bytes([BUSY]) * size
+    slot_seconds = slot_minutes * 60
+
+    for start, end in blocks:
+        lo = max(start // slot_seconds, 0)
+        hi = min(-(-end // slot_seconds), size)
+        if lo < hi:
+            bitmap[lo:hi] = busy[:hi - lo]
+
+    if not_before > 0:
+        hi = min(-(-not_before // slot_seconds), size)
+        bitmap[:hi] = busy[:hi]
+
+    return bitmap
+
+
+def find_slots(bitmap: bytearray, days: int, slot_minutes: int, open_minute: int,
+               close_minute: int, needed: int) -> list:
+    """
+    Busca, día por día y dentro del horario de apertura, los huecos donde caben
+    ``needed`` huecos libres consecutivos.
+
+    Args:
+        bitmap (bytearray): Mapa construido por ``build_bitmap``.
+        days (int): Número de días de la ventana.
+        slot_minutes (int): Duración de cada hueco.
+        open_minute (int): Minuto del día en que abre el negocio.
+        close_minute (int): Minuto del día en que cierra.
+        needed (int): Huecos consecutivos que ocupa el servicio.
+
+    Returns:
+        list[list[int]]: Índices (dentro del día) de los huecos de inicio para cada día.
+    """
+    pattern = _free_run(needed)
+    slots_per_day = 1440 // slot_minutes
+    first = -(-open_minute // slot_minutes)
+    last = close_minute // slot_minutes
+    result = []
+    for day in range(days):
+        base = day * slots_per_day
+        starts = []
+        for run in pattern.finditer(bitmap, base + first, base + last):
+            starts.extend(range(run.start() - base, run.end() - base - needed + 1))
+        result.append(starts)
+    return result
+
+
+def _slot_label(index: int, slot_minutes: int) -> str:
+    minute = index * slot_minutes
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+async def get_availability(id_service: int, date_from: date, date_to: date,
+                           db: Optional[RequestConnection] = None) -> dict:
+    """
+    Calcula los huecos reservables de un servicio entre dos fechas (inclusive).
+
+    Args:
+        id_service (int): ID del servicio.
+        date_from (date): Primer día.
+        date_to (date): Último día.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict: Datos con la forma de ``AvailabilityOut``.
+
+    Raises:
+        ValueError: Si el rango no es válido o el servicio no existe o está inactivo.
+    """
+    if date_to < date_from:
+        raise ValueError("'to' must not be before 'from'")
+    days = (date_to - date_from).days + 1
+    if days > settings.AVAILABILITY_MAX_DAYS:
+        raise ValueError(f"Range too large (max {settings.AVAILABILITY_MAX_DAYS} days)")
+
+    try:
+        snapshot = await service_catalog.get_snapshot(db=db)
+        service = snapshot.services.get(id_service)
+        if not service or not service.state:
+            raise ValueError("Service not found or inactive")
+
+        window_start = datetime.combine(date_from, datetime.min.time())
+        window_end = window_start + timedelta(days=days)
+        async with get_async_conn(db) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    SQL_BUSY_BLOCKS,
+                    (window_start, window_start) + blocks_in_range_params(window_start, window_end)
+                )
+                blocks = await cur.fetchall()
+    except ValueError:
+        raise
+    except Exception as e:
+        logging.error(f"Error al calcular disponibilidad del servicio {id_service}: {str(e)}")
+        raise
+
+    slot = settings.AVAILABILITY_SLOT_MINUTES
+    open_minute = settings.BUSINESS_OPEN_HOUR * 60
+    close_minute = settings.BUSINESS_CLOSE_HOUR * 60
+    needed = max(math.ceil(service.duration_minutes / slot), 1)
+
+    elapsed = int((datetime.now() - window_start).total_seconds())
+    bitmap = build_bitmap(days, blocks, slot, not_before=elapsed)
+    per_day = find_slots(bitmap, days, slot, open_minute, close_minute, needed)
+
+    return {
+        "id_service": id_service,
+        "duration_minutes": service.duration_minutes,
+        "slot_minutes": slot,
+        "days": [
+            {
+                "date": (date_from + timedelta(days=i)).isoformat(),
+                "slots": [_slot_label(s, slot) for s in starts]
+            }
+            for i, starts in enumerate(per_day) if starts
+        ]
+    }
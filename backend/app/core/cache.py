@@ -0,0 +1,114 @@
+# backend/app/core/cache.py
+"""
+Caché en Memoria
+================
+Caché LRU con expiración (TTL) y segura entre hilos, usada para guardar datos
+calientes dentro del proceso (principales autenticados, respuestas, etc.).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+class TTLCache:
+    """
+    Caché LRU acotada cuyas entradas expiran tras ``ttl`` segundos.
+
+    Args:
+        maxsize (int): Número máximo de entradas; al superarlo se expulsa la menos usada.
+        ttl (float): Segundos de vida de cada entrada.
+        on_evict (callable | None): ``on_evict(key, value)`` por cada entrada que la
+            caché descarta sola (por tamaño o expiración); no se llama en ``pop`` ni ``clear``.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, on_evict: Optional[Callable] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Devuelve el valor asociado a ``key`` si existe y no ha expirado.
+
+        Args:
+            key: Clave buscada.
+            default: Valor devuelto si no hay entrada válida.
+
+        Returns:
+            El valor cacheado o ``default``.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at >= time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+            self.misses += 1
+        self._evicted([(key, value)])
+        return default
+
+    def set(self, key, value):
+        """
+        Guarda ``value`` bajo ``key`` y expulsa la entrada menos usada si se excede el tamaño.
+
+        Args:
+            key: Clave de la entrada.
+            value: Valor a guardar.
+        """
+        evicted = []
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                old_key, (_, old_value) = self._data.popitem(last=False)
+                evicted.append((old_key, old_value))
+        self._evicted(evicted)
+
+    def _evicted(self, items: list):
+        # Fuera del lock: el callback puede volver a usar la caché
+        if self.on_evict is not None:
+            for key, value in items:
+                self.on_evict(key, value)
+
+    def pop(self, key, default=None):
+        """
+        Elimina la entrada ``key`` y devuelve su valor.
+
+        Args:
+            key: Clave a eliminar.
+            default: Valor devuelto si no existe.
+
+        Returns:
+            El valor eliminado o ``default``.
+        """
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def clear(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Devuelve tamaño, aciertos y fallos de la caché.
+
+        Returns:
+            dict: Estadísticas de uso.
+        """
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
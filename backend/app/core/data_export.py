@@ -0,0 +1,221 @@
+# backend/app/core/data_export.py
+"""
+Exportación de Tablas
+=====================
+Exporta servicios, clientes y reservas a CSV o Excel (.xlsx) con las mismas
+columnas que espera el importador (``import_schemas``), de modo que un
+archivo exportado se puede volver a importar. Las contraseñas nunca se
+exportan: la columna ``password`` sale vacía y hay que rellenarla antes de
+reimportar clientes.
+
+Las filas se leen con un cursor de servidor por bloques de
+``EXPORT_BATCH_SIZE``. Solo el CSV se envía en streaming, según se lee. El
+Excel se escribe con openpyxl en modo ``write_only`` (cada fila va directa al
+XML temporal de la hoja) en un archivo temporal anónimo y se envía por trozos
+cuando está completo: no se construye en memoria, pero el primer byte tarda
+lo que tarda generar el libro entero.
+
+Las reservas no hacen JOIN con ``reservation_status``: el nombre del estado
+se resuelve con ``reference_data``, como en los listados.
+"""
+
+import asyncio
+import csv
+import io
+import logging
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+from typing import BinaryIO
+import aiomysql
+from openpyxl import Workbook
+from ..async_database import get_async_conn
+from . import reference_data
+from .reservation_logic import EXPORT_BATCH_SIZE
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+FILE_CHUNK_BYTES = 64 * 1024
+
+# Tipo -> (consulta, columnas). Las primeras columnas son las del esquema de importación.
+EXPORTS = {
+    "services": (
+        """SELECT name, description, duration_minutes, price, state
+           FROM service ORDER BY id_service""",
+        ("name", "description", "duration_minutes", "price", "state"),
+    ),
+    "users": (
+        """SELECT u.email, '' AS password, p.first_name, p.last_name, p.phone,
+                  r.name AS role, u.state
+           FROM user_account u
+           JOIN role r ON r.id_role = u.id_role
+           LEFT JOIN user_profile p ON p.id_user = u.id_user
+           ORDER BY u.id_user""",
+        ("email", "password", "first_name", "last_name", "phone", "role", "state"),
+    ),
+    "reservations": (
+        """SELECT u.email, s.name AS service, r.start_datetime, r.id_reservation_status,
+                  r.payment_method, r.end_datetime, r.total_price
+           FROM reservation r
+           JOIN user_account u ON u.id_user = r.id_user
+           JOIN service s ON s.id_service = r.id_service
+           WHERE r.state = TRUE
+           ORDER BY r.id_reservation""",
+        ("email", "service", "start_datetime", "status", "payment_method", "end_datetime", "total_price"),
+    ),
+}
+
+
+def _reservation_row(row: dict):
+    row["status"] = reference_data.with_status_name(row).pop("status_name")
+
+
+# Tipo -> ajuste de cada fila leída antes de escribirla
+ROW_HOOKS = {"reservations": _reservation_row}
+
+
+def _cell(value):
+    # Valor para openpyxl: Decimal a float, booleanos como 1/0 (lo que acepta el importador)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return _cell(value)
+
+
+def csv_chunk(rows: list, columns: tuple, header: bool = False) -> bytes:
+    """
+    Serializa un bloque de filas como CSV.
+
+    Args:
+        rows (list[dict]): Filas del bloque.
+        columns (tuple[str]): Columnas en orden.
+        header (bool): Si se escribe primero la cabecera.
+
+    Returns:
+        bytes: CSV en UTF-8.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+    return buffer.getvalue().encode()
+
+
+async def iter_batches(kind: str):
+    """
+    Lee la tabla de un tipo de exportación con un cursor de servidor.
+
+    Si el consumidor deja de iterar (p. ej. el cliente corta la descarga),
+    la conexión se cierra en lugar de drenar el resto del resultado.
+
+    Args:
+        kind (str): services, users o reservations.
+
+    Yields:
+        list[dict]: Bloques de hasta ``EXPORT_BATCH_SIZE`` filas.
+    """
+    sql, _ = EXPORTS[kind]
+    hook = ROW_HOOKS.get(kind)
+    async with get_async_conn() as conn:
+        cur = await conn.cursor(aiomysql.SSDictCursor)
+        finished = False
+        try:
+            await cur.execute(sql)
+            while True:
+                rows = await cur.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                if hook:
+                    for row in rows:
+                        hook(row)
+                yield rows
+            finished = True
+        except Exception as e:
+            logging.error(f"Error al exportar {kind}: {str(e)}")
+            raise
+        finally:
+            if finished:
+                await cur.close()
+            else:
+                conn.close()
+
+
+async def stream_csv(columns: tuple, batches):
+    """
+    Genera un CSV a partir de bloques de filas, según llegan.
+
+    Args:
+        columns (tuple[str]): Columnas en orden.
+        batches: Iterador asíncrono de bloques (``iter_batches``).
+
+    Yields:
+        bytes: Cabecera y luego un trozo de CSV por bloque.
+    """
+    yield csv_chunk([], columns, header=True)
+    async for rows in batches:
+        yield csv_chunk(rows, columns)
+
+
+def _append_rows(sheet, rows: list, columns: tuple):
+    for row in rows:
+        sheet.append([_cell(row[column]) for column in columns])
+
+
+async def write_xlsx(columns: tuple, batches, title: str) -> BinaryIO:
+    """
+    Escribe un Excel completo con openpyxl en modo ``write_only``.
+
+    Cada bloque se añade a la hoja en un hilo aparte para no bloquear el
+    event loop mientras se leen los siguientes. El libro se guarda en un
+    ``TemporaryFile``: no tiene nombre en disco y el sistema lo libera al
+    cerrarse, aunque la descarga no llegue a empezar.
+
+    Args:
+        columns (tuple[str]): Columnas en orden.
+        batches: Iterador asíncrono de bloques (``iter_batches``).
+        title (str): Nombre de la hoja.
+
+    Returns:
+        BinaryIO: Archivo .xlsx abierto y posicionado al inicio; lo cierra ``iter_file``.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    sheet.append(list(columns))
+    async for rows in batches:
+        await asyncio.to_thread(_append_rows, sheet, rows, columns)
+
+    spool = tempfile.TemporaryFile(prefix="export-", suffix=".xlsx")
+    try:
+        await asyncio.to_thread(workbook.save, spool)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def iter_file(spool: BinaryIO):
+    """
+    Envía un archivo por trozos y lo cierra al terminar (o si se corta la descarga).
+
+    Args:
+        spool (BinaryIO): Archivo temporal de ``write_xlsx``.
+
+    Yields:
+        bytes: Trozos de hasta ``FILE_CHUNK_BYTES``.
+    """
+    try:
+        while chunk := spool.read(FILE_CHUNK_BYTES):
+            yield chunk
+    finally:
+        spool.close()
@@ -0,0 +1,70 @@
+# backend/app/core/http_cache.py
+"""
+Respuestas Condicionales
+========================
+Utilidades para servir cuerpos JSON ya serializados con un ETag fuerte y
+responder ``304 Not Modified`` cuando el cliente envía ``If-None-Match``.
+"""
+
+import hashlib
+from fastapi import Request, Response
+
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Calcula un ETag fuerte a partir del contenido.
+
+    Al depender solo de los bytes, todos los workers generan el mismo ETag
+    para la misma representación.
+
+    Args:
+        body (bytes): Cuerpo de la respuesta.
+
+    Returns:
+        str: ETag entre comillas.
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Comprueba si la cabecera ``If-None-Match`` contiene el ETag dado.
+
+    Args:
+        if_none_match (str): Valor de la cabecera (puede ser una lista o ``*``).
+        etag (str): ETag actual.
+
+    Returns:
+        bool: True si el cliente ya tiene esta representación.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Devuelve ``304`` si el cliente ya tiene ``etag`` o el cuerpo JSON completo en caso contrario.
+
+    Args:
+        request (Request): Petición entrante.
+        body (bytes): JSON ya serializado.
+        etag (str): ETag de ``body``.
+
+    Returns:
+        Response: Respuesta lista para devolver desde la ruta.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,72 @@
+# backend/app/core/import_history.py
+"""
+Historial de Importaciones
+==========================
+Guarda el resumen de cada archivo importado bajo el tipo de importación y la
+huella sha256 de su contenido (tabla ``import_history``). Si se vuelve a
+subir un archivo idéntico byte a byte, la carga devuelve el resumen guardado
+sin leerlo ni consultar la base nombre por nombre; ``force=true`` ignora el
+historial.
+"""
+
+import json
+import logging
+from typing import Optional
+import aiomysql
+from ..async_database import get_async_conn, RequestConnection
+from ..database import get_conn
+
+SQL_FIND_IMPORTS = "SELECT content_sha256, summary FROM import_history WHERE kind = %s AND content_sha256 IN ({})"
+SQL_RECORD_IMPORT = """
+    INSERT INTO import_history (kind, content_sha256, filename, summary)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE filename = VALUES(filename), summary = VALUES(summary)
+"""
+
+
+async def find_cached(kind: str, hashes: list, db: Optional[RequestConnection] = None) -> dict:
+    """
+    Busca en el historial los resúmenes de varias huellas a la vez.
+
+    Args:
+        kind (str): Tipo de importación.
+        hashes (list[str]): Huellas sha256 (hex) de los archivos subidos.
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        dict: Huella -> resumen guardado, solo para las que ya se importaron.
+    """
+    if not hashes:
+        return {}
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_FIND_IMPORTS.format(", ".join(["%s"] * len(hashes))), [kind] + hashes)
+                rows = await cur.fetchall()
+    except Exception as e:
+        logging.error(f"Error al consultar el historial de importaciones: {str(e)}")
+        raise
+    return {row["content_sha256"]: json.loads(row["summary"]) for row in rows}
+
+
+def record(kind: str, content_sha256: str, filename: str, summary: dict):
+    """
+    Guarda (o reemplaza) el resumen de un archivo importado.
+
+    Args:
+        kind (str): Tipo de importación.
+        content_sha256 (str): Huella sha256 (hex) del contenido.
+        filename (str): Nombre con el que se subió.
+        summary (dict): Resultado del archivo devuelto por la importación.
+    """
+    try:
+        with get_conn() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(SQL_RECORD_IMPORT, (kind, content_sha256, filename, json.dumps(summary)))
+                conn.commit()
+            finally:
+                cur.close()
+    except Exception as e:
+        logging.error(f"Error al guardar el historial de la importación {filename}: {str(e)}")
+        raise
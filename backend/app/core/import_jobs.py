@@ -0,0 +1,277 @@
+# backend/app/core/import_jobs.py
+"""
+Trabajos de Importación Excel
+=============================
+Ejecuta las cargas de Excel como trabajos en un pool de hilos acotado
+(``IMPORT_WORKERS``), fuera del event loop, y guarda su progreso en memoria
+para consultarlo con ``GET /upload/jobs/{id}``.
+
+Dentro de un trabajo, cada archivo se lee y valida en paralelo en un pool de
+procesos (``IMPORT_PARSE_WORKERS``, un archivo por proceso); solo la escritura
+en la base se hace en serie, en el orden de subida. Cada archivo tiene su
+propio resultado, sus tiempos (parse, validate, write) y su propio
+presupuesto de tiempo, que no cuenta la espera detrás de otros archivos.
+
+Los archivos que ya se importaron antes con el mismo contenido (misma huella
+sha256 en ``import_history``) no se procesan: su detalle es el resumen
+guardado, marcado con ``cached``.
+
+Se admiten como máximo ``IMPORT_QUEUE_LIMIT`` trabajos en cola o en curso; los
+terminados se descartan pasados ``IMPORT_JOB_TTL`` segundos. El registro es
+local al proceso: el estado de un trabajo solo lo conoce el worker que lo
+aceptó.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from ..config import settings
+from . import import_history, import_schemas, logic_upload_excel
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+COUNTERS = ("total", "completed", "skipped", "failed")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_jobs = {}      # job_id -> dict del trabajo
+_lock = threading.Lock()
+
+
+class ImportQueueFullError(Exception):
+    """Se lanza cuando ya hay ``IMPORT_QUEUE_LIMIT`` trabajos pendientes."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.IMPORT_WORKERS, thread_name_prefix="excel-import")
+        return _executor
+
+
+def _get_parse_executor() -> ProcessPoolExecutor:
+    global _parse_executor
+    with _lock:
+        if _parse_executor is None:
+            _parse_executor = ProcessPoolExecutor(max_workers=settings.IMPORT_PARSE_WORKERS)
+        return _parse_executor
+
+
+def _prune(now: float):
+    expired = [
+        job_id for job_id, job in _jobs.items()
+        if job["finished_at"] and now - job["finished_at"] > settings.IMPORT_JOB_TTL
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def _summarize(job: dict):
+    details = job["details"]
+    job["summary"] = {
+        "total_files": len(details),
+        "failed_files": sum(1 for d in details if d["status"] == FAILED),
+        "total_processed": sum(d["total"] for d in details),
+        "completed": sum(d["completed"] for d in details),
+        "skipped": sum(d["skipped"] for d in details),
+        "failed": sum(d["failed"] for d in details),
+        "timings": [{"filename": d["filename"], **d["timings"]} for d in details],
+    }
+
+
+def _snapshot(job: dict) -> dict:
+    copy = dict(job)
+    copy["summary"] = dict(job["summary"])
+    copy["details"] = [dict(d) for d in job["details"]]
+    return copy
+
+
+def _discard(future: Future):
+    # Borra el archivo de filas de una preparación que ya no se va a escribir
+    if future.cancel():
+        return
+    try:
+        os.unlink(future.result()["rows_path"])
+    except Exception:
+        pass
+
+
+def _run(job: dict, files: list, max_time: int):
+    # files: (índice en details, nombre, ruta temporal, huella) de los archivos a procesar
+    with _lock:
+        job["status"] = RUNNING
+        job["started_at"] = time.time()
+
+    schema = import_schemas.get_schema(job["kind"])
+    parse_executor = _get_parse_executor()
+    futures = [
+        parse_executor.submit(logic_upload_excel.prepare_file, path, filename, max_time, schema)
+        for _, filename, path, _ in files
+    ]
+    consumed = 0
+
+    try:
+        for (index, filename, path, content_sha256), future in zip(files, futures):
+            def on_progress(results, index=index):
+                with _lock:
+                    job["details"][index].update({k: results[k] for k in COUNTERS})
+                    _summarize(job)
+
+            try:
+                try:
+                    prepared = future.result()
+                finally:
+                    consumed += 1
+                    os.unlink(path)
+                with _lock:
+                    job["details"][index].update(
+                        status=RUNNING, total=prepared["total"], failed=prepared["failed"],
+                        timings=prepared["timings"]
+                    )
+                    _summarize(job)
+
+                # El presupuesto de escritura es el que le sobró a su propia preparación
+                spent = sum(prepared["timings"].values())
+                file_result = logic_upload_excel.write_prepared(
+                    prepared, time.time() + max_time - spent, on_progress=on_progress, schema=schema
+                )
+                file_result.update(status=COMPLETED, error=None, cached=False)
+                try:
+                    import_history.record(job["kind"], content_sha256, filename, file_result)
+                except Exception:
+                    pass  # sin historial el archivo solo se volverá a procesar
+            except (ValueError, TimeoutError) as e:
+                file_result = dict(job["details"][index], status=FAILED, error=str(e))
+                file_result["errors"] = [str(e)] + file_result["errors"]
+            except Exception as e:
+                # Un fallo inesperado (p. ej. de la base) solo marca este archivo; se sigue con el resto
+                logging.error(f"Error al importar {filename} (trabajo {job['job_id']}): {str(e)}")
+                error = f"Error inesperado: {str(e)}"
+                file_result = dict(job["details"][index], status=FAILED, error=error)
+                file_result["errors"] = [error] + file_result["errors"]
+
+            with _lock:
+                job["details"][index] = file_result
+                _summarize(job)
+
+        # El trabajo solo falla si no se pudo cargar ningún archivo
+        failures = [d["error"] for d in job["details"] if d["status"] == FAILED]
+        if failures and len(failures) == len(job["details"]):
+            status, error = FAILED, failures[0] if len(failures) == 1 else "; ".join(failures)
+        else:
+            status, error = COMPLETED, None
+    except Exception as e:
+        logging.error(f"Error al procesar el trabajo de importación {job['job_id']}: {str(e)}")
+        status, error = FAILED, f"Error inesperado: {str(e)}"
+    finally:
+        # Si el trabajo se cortó antes, descartar lo que no se llegó a escribir
+        for future in futures[consumed:]:
+            _discard(future)
+        for _, _, path, _ in files:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    with _lock:
+        job["status"] = status
+        job["error"] = error
+        job["finished_at"] = time.time()
+
+
+def submit(files: list, max_time: int, cached: Optional[dict] = None, kind: str = "services") -> dict:
+    """
+    Encola la importación de uno o varios archivos.
+
+    Args:
+        files (list[tuple[str, str, str]]): Tuplas (nombre, ruta temporal, huella sha256) de
+            cada archivo. El trabajo borra cada archivo temporal al terminar con él.
+        max_time (int): Tiempo máximo de procesamiento de cada archivo, en segundos.
+        cached (dict | None): Huella -> resumen guardado de los archivos ya importados; esos
+            archivos no se procesan. Si todos lo están, el trabajo nace terminado.
+        kind (str): Tipo de registro que se importa (ver ``import_schemas.SCHEMAS``).
+
+    Returns:
+        dict: Estado inicial del trabajo (incluye ``job_id``).
+
+    Raises:
+        ImportQueueFullError: Si ya hay demasiados trabajos pendientes.
+    """
+    cached = cached or {}
+    details, to_process = [], []
+    for filename, path, content_sha256 in files:
+        if content_sha256 in cached:
+            details.append(dict(cached[content_sha256], filename=filename, status=COMPLETED,
+                                error=None, cached=True))
+        else:
+            to_process.append((len(details), filename, path, content_sha256))
+            details.append({
+                "filename": filename, "status": QUEUED, "error": None, "cached": False,
+                **{k: 0 for k in COUNTERS}, "errors": [], "timings": {}
+            })
+
+    now = time.time()
+    with _lock:
+        _prune(now)
+        pending = sum(1 for job in _jobs.values() if job["status"] in (QUEUED, RUNNING))
+        if to_process and pending >= settings.IMPORT_QUEUE_LIMIT:
+            raise ImportQueueFullError(
+                f"Hay {pending} importaciones pendientes; reintente cuando terminen"
+            )
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": QUEUED,
+            "error": None,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "summary": {},
+            "details": details,
+        }
+        if not to_process:
+            job.update(status=COMPLETED, started_at=now, finished_at=now)
+        _summarize(job)
+        _jobs[job["job_id"]] = job
+        snapshot = _snapshot(job)
+
+    for filename, path, content_sha256 in files:
+        if content_sha256 in cached:
+            os.unlink(path)
+    if to_process:
+        _get_executor().submit(_run, job, to_process, max_time)
+    return snapshot
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """
+    Devuelve una copia del estado actual de un trabajo.
+
+    Args:
+        job_id (str): Identificador devuelto por ``submit``.
+
+    Returns:
+        dict | None: Estado, conteos por archivo y resumen, o None si no existe o ya expiró.
+    """
+    with _lock:
+        job = _jobs.get(job_id)
+        return _snapshot(job) if job else None
+
+
+def shutdown():
+    """
+    Detiene los pools de importación sin esperar a los trabajos en curso.
+    """
+    global _executor, _parse_executor
+    with _lock:
+        executor, _executor = _executor, None
+        parse_executor, _parse_executor = _parse_executor, None
+    for pool in (executor, parse_executor):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,267 @@
+# backend/app/core/import_schemas.py
+"""
+Esquemas de Importación Masiva
+==============================
+Registro de los tipos de registro que admite la carga masiva
+(``POST /upload/excel?kind=...``). Todos comparten el mismo pipeline de
+``logic_upload_excel`` (lectura por bloques, validación por columnas en el
+pool de procesos, deduplicación con consultas por lote e INSERT multi-fila);
+cada esquema solo aporta sus columnas, reglas y consultas:
+
+- ``services``: servicios (``ServiceSchema``).
+- ``users``: clientes con su perfil. Las contraseñas se hashean al preparar
+  el archivo, en el proceso de la importación que lo lee y valida, antes de
+  que la etapa de escritura abra su conexión y sus transacciones.
+- ``reservations``: reservas históricas (ya terminadas). Cliente, servicio y
+  estado se resuelven por email y nombre con mapas en memoria: servicios una
+  vez por archivo, emails por lotes a medida que aparecen y estados desde
+  ``reference_data``.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict
+import pandas as pd
+from . import password_hashing, reference_data, reservation_cache
+from .logic_upload_excel import (
+    IMPORT_CHUNK_SIZE, ImportSchema, SERVICE_SCHEMA, add_error, name_key
+)
+from .user_logic import SQL_INSERT_ACCOUNT, SQL_INSERT_PROFILE
+
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+
+SQL_USER_IDS_BY_EMAIL = "SELECT id_user, email FROM user_account WHERE email IN ({})"
+SQL_ALL_SERVICE_REFS = "SELECT id_service, name, duration_minutes, price FROM service"
+SQL_EXISTING_RESERVATIONS = """
+    SELECT r.id_user, r.id_service, r.start_datetime
+    FROM reservation r
+    WHERE r.id_user IN ({}) AND r.start_datetime BETWEEN %s AND %s
+"""
+SQL_IMPORT_RESERVATION = """INSERT INTO reservation
+    (id_user, id_service, id_reservation_status, start_datetime, end_datetime, total_price, payment_method, state)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, TRUE)"""
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    return df[column].fillna("").astype(str).str.strip()
+
+
+def _first_reason(index, rules: list) -> pd.Series:
+    # Motivo de la primera regla incumplida de cada fila ('' si ninguna)
+    reasons = pd.Series("", index=index)
+    for failed, message in reversed(rules):
+        reasons = reasons.mask(failed, message)
+    return reasons
+
+
+def user_ids_by_email(cur, emails: list, known: Dict[str, int]) -> Dict[str, int]:
+    """
+    Completa el mapa email -> id_user con los emails que aún no contiene.
+
+    Args:
+        cur: Cursor (dictionary=True) de la conexión de importación
+        emails: Emails (en minúsculas) que se necesitan
+        known: Mapa del archivo; se actualiza en el sitio
+
+    Returns:
+        El mismo mapa ``known``
+    """
+    missing = list({email for email in emails if email not in known})
+    for i in range(0, len(missing), IMPORT_CHUNK_SIZE):
+        chunk = missing[i:i + IMPORT_CHUNK_SIZE]
+        cur.execute(SQL_USER_IDS_BY_EMAIL.format(", ".join(["%s"] * len(chunk))), chunk)
+        known.update((row["email"].lower(), row["id_user"]) for row in cur.fetchall())
+    return known
+
+
+class UserSchema(ImportSchema):
+    """
+    Importación de clientes (cuenta + perfil), duplicados por email.
+
+    Filas nativas: (row_num, email, password, first_name, last_name, phone);
+    tras ``prepare``, la contraseña ya es su hash.
+    """
+    kind = "users"
+    columns = frozenset({"email", "password", "first_name", "last_name", "phone"})
+
+    def validate(self, df):
+        email = _text(df, "email").str.lower()
+        password = df["password"].fillna("").astype(str)
+        first_name = _text(df, "first_name")
+        last_name = _text(df, "last_name")
+        phone = _text(df, "phone")
+
+        reasons = _first_reason(df.index, [
+            (~email.str.fullmatch(EMAIL_PATTERN), "email no válido"),
+            (email.str.len() > 100, "email demasiado largo (máx. 100)"),
+            (password == "", "contraseña vacía"),
+            ((first_name == "") | (last_name == ""), "nombre y apellido son obligatorios"),
+            ((first_name.str.len() > 50) | (last_name.str.len() > 50), "nombre o apellido demasiado largo (máx. 50)"),
+            ((phone == "") | (phone.str.len() > 15), "teléfono vacío o demasiado largo (máx. 15)"),
+        ])
+        rows = pd.DataFrame({
+            "row_num": df.index + 2,
+            "email": email,
+            "password": password,
+            "first_name": first_name,
+            "last_name": last_name,
+            "phone": phone,
+        })
+        return rows, reasons
+
+    def to_native(self, valid):
+        return list(zip(
+            valid["row_num"].tolist(), valid["email"].tolist(), valid["password"].tolist(),
+            valid["first_name"].tolist(), valid["last_name"].tolist(), valid["phone"].tolist(),
+        ))
+
+    def key(self, row):
+        return row[1]
+
+    def open(self, cur):
+        return {"id_role": reference_data.role_id(reference_data.CLIENT_ROLE)}
+
+    def existing_keys(self, cur, rows, context):
+        return set(user_ids_by_email(cur, [row[1] for row in rows], {}))
+
+    def prepare(self, rows):
+        hashes = password_hashing.hash_many([row[2] for row in rows])
+        return [row[:2] + (hashed,) + row[3:] for row, hashed in zip(rows, hashes)]
+
+    def insert(self, cur, rows, context):
+        # Cuenta y perfil en la transacción del bloque (insert_chunk): si falla
+        # el perfil, el savepoint deshace también la cuenta
+        cur.executemany(SQL_INSERT_ACCOUNT, [(row[1], row[2], context["id_role"]) for row in rows])
+        ids = user_ids_by_email(cur, [row[1] for row in rows], {})
+        cur.executemany(SQL_INSERT_PROFILE, [(ids[row[1]],) + row[3:] for row in rows])
+
+
+class ReservationSchema(ImportSchema):
+    """
+    Importación de reservas históricas; duplicadas si coinciden cliente,
+    servicio e inicio.
+
+    Filas nativas: (row_num, email, service, start_datetime, status,
+    payment_method); tras resolver: (row_num, id_user, id_service,
+    id_reservation_status, start, end, total_price, payment_method). Solo se
+    aceptan reservas ya terminadas, por eso no se crean bloques de
+    calendario (solo cuentan para la disponibilidad futura).
+    """
+    kind = "reservations"
+    columns = frozenset({"email", "service", "start_datetime", "status", "payment_method"})
+
+    def validate(self, df):
+        email = _text(df, "email").str.lower()
+        service = _text(df, "service")
+        start = pd.to_datetime(df["start_datetime"], errors="coerce")
+        status = _text(df, "status").str.lower()
+        payment = _text(df, "payment_method")
+
+        reasons = _first_reason(df.index, [
+            (~email.str.fullmatch(EMAIL_PATTERN), "email no válido"),
+            (service == "", "servicio vacío"),
+            (start.isna(), "fecha de inicio no válida"),
+            (start >= pd.Timestamp.now(), "solo se importan reservas pasadas"),
+            (status == "", "estado vacío"),
+            ((payment == "") | (payment.str.len() > 50), "método de pago vacío o demasiado largo (máx. 50)"),
+        ])
+        rows = pd.DataFrame({
+            "row_num": df.index + 2,
+            "email": email,
+            "service": service,
+            "start_datetime": start,
+            "status": status,
+            "payment_method": payment,
+        })
+        return rows, reasons
+
+    def to_native(self, valid):
+        return list(zip(
+            valid["row_num"].tolist(), valid["email"].tolist(), valid["service"].tolist(),
+            [ts.to_pydatetime() for ts in valid["start_datetime"]],
+            valid["status"].tolist(), valid["payment_method"].tolist(),
+        ))
+
+    def key(self, row):
+        return f"{row[1]}|{name_key(row[2])}|{row[3].isoformat()}"
+
+    def open(self, cur):
+        cur.execute(SQL_ALL_SERVICE_REFS)
+        services = {
+            name_key(s["name"]): (s["id_service"], s["name"], s["duration_minutes"], float(s["price"]))
+            for s in cur.fetchall()
+        }
+        return {"services": services, "statuses": reference_data.current().status_ids, "users": {}}
+
+    def existing_keys(self, cur, rows, context):
+        if not rows:
+            return set()
+        users = user_ids_by_email(cur, [row[1] for row in rows], context["users"])
+        ids = list({users[row[1]] for row in rows if row[1] in users})
+        if not ids:
+            return set()
+        emails = {id_user: email for email, id_user in users.items()}
+        names = {ref[0]: ref[1] for ref in context["services"].values()}
+        cur.execute(
+            SQL_EXISTING_RESERVATIONS.format(", ".join(["%s"] * len(ids))),
+            ids + [min(row[3] for row in rows), max(row[3] for row in rows)]
+        )
+        return {
+            f"{emails[r['id_user']]}|{name_key(names.get(r['id_service'], ''))}|{r['start_datetime'].isoformat()}"
+            for r in cur.fetchall()
+        }
+
+    def resolve(self, cur, rows, results, context):
+        users = user_ids_by_email(cur, [row[1] for row in rows], context["users"])
+        now = datetime.now()
+        resolved = []
+        for row_num, email, service_name, start, status, payment in rows:
+            service = context["services"].get(name_key(service_name))
+            if email not in users:
+                reason = f"cliente no registrado ({email})"
+            elif not service:
+                reason = f"servicio no encontrado ({service_name})"
+            elif status not in context["statuses"]:
+                reason = f"estado no válido ({status})"
+            elif start + timedelta(minutes=service[2]) > now:
+                reason = "la reserva aún no ha terminado"
+            else:
+                resolved.append((
+                    row_num, users[email], service[0], context["statuses"][status],
+                    start, start + timedelta(minutes=service[2]), service[3], payment
+                ))
+                continue
+            results["failed"] += 1
+            add_error(results, f"Fila {row_num}: {reason}")
+        return resolved
+
+    def insert(self, cur, rows, context):
+        cur.executemany(SQL_IMPORT_RESERVATION, [row[1:] for row in rows])
+
+    def finish(self, results):
+        # Tras el último commit: las listas cacheadas de los clientes afectados quedan obsoletas
+        if results["completed"]:
+            reservation_cache.clear()
+
+
+SCHEMAS: Dict[str, ImportSchema] = {
+    schema.kind: schema for schema in (SERVICE_SCHEMA, UserSchema(), ReservationSchema())
+}
+
+
+def get_schema(kind: str) -> ImportSchema:
+    """
+    Devuelve el esquema de un tipo de importación.
+
+    Args:
+        kind (str): services, users o reservations.
+
+    Returns:
+        ImportSchema: Esquema registrado.
+
+    Raises:
+        ValueError: Si el tipo no existe.
+    """
+    schema = SCHEMAS.get(kind)
+    if not schema:
+        raise ValueError(f"Tipo de importación no válido: {kind} (use {', '.join(SCHEMAS)})")
+    return schema
@@ -1,119 +1,717 @@
 # backend/app/core/logic_upload_excel.py
 from ..database import get_conn
+from . import service_catalog
+from .service_logic import SQL_INSERT_SERVICE
+import csv
+import io
+import os
+import pickle
+import tempfile
+import numpy as np
 import pandas as pd
 import time
-from typing import Dict, Any
+import unicodedata
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+from functools import partial
+from typing import Dict, Any, Tuple, Callable, Iterator, Optional, Union
 import logging
 
-EXPECTED_COLUMNS = {"name", "description", "duration_minutes", "price", "state"}
+EXPECTED_COLUMNS = frozenset({"name", "description", "duration_minutes", "price", "state"})
 
-def process_excel(file_content: bytes, filename: str, start_time: float, max_time: int = 180) -> Dict[str, Any]:
+# Firmas de los primeros bytes de cada formato admitido
+XLSX_MAGIC = b"PK\x03\x04"        # contenedor zip de Office Open XML
+PARQUET_MAGIC = b"PAR1"
+XLS_MAGIC = b"\xd0\xcf\x11\xe0"   # OLE2 de Excel 97-2003
+CSV_DELIMITERS = ",;\t|"
+
+# Filas por INSERT multi-fila y nombres por consulta de duplicados
+IMPORT_CHUNK_SIZE = 500
+# Errores detallados que se guardan por archivo; del resto solo se cuenta cuántos hay
+MAX_REPORTED_ERRORS = 10
+SQL_EXISTING_NAMES = "SELECT name FROM service WHERE name IN ({})"
+
+# Valores aceptados en la columna "state" (comparados en minúsculas y sin espacios)
+STATE_VALUES = {
+    "1": True, "0": False,
+    "1.0": True, "0.0": False,
+    "true": True, "false": False,
+    "si": True, "sí": True, "no": False,
+    "activo": True, "inactivo": False,
+    "": False,
+}
+
+def validate_services(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
     """
-    Procesa un archivo Excel y devuelve un resumen detallado de los resultados.
-    
+    Valida y normaliza todas las filas del Excel con operaciones por columna.
+
+    Cada fila recibe como motivo de error la primera regla que incumple, en
+    este orden: nombre vacío, duración no entera, duración <= 0, precio no
+    numérico, precio negativo, estado no reconocido.
+
     Args:
-        file_content: Contenido del archivo en bytes
+        df: DataFrame leído del Excel con las columnas de EXPECTED_COLUMNS
+
+    Returns:
+        Tupla (filas normalizadas, motivos). Las filas traen row_num, name,
+        description, duration_minutes, price y state; el motivo es '' si la
+        fila es válida.
+    """
+    names = df["name"].fillna("").astype(str).str.strip()
+    descriptions = df["description"].fillna("").astype(str).str.strip()
+    duration = pd.to_numeric(df["duration_minutes"], errors="coerce")
+    price = pd.to_numeric(df["price"], errors="coerce")
+    state = df["state"].fillna("").astype(str).str.strip().str.lower().map(STATE_VALUES)
+
+    reasons = pd.Series(
+        np.select(
+            [
+                names == "",
+                duration.isna() | (duration % 1 != 0),
+                duration <= 0,
+                price.isna(),
+                price < 0,
+                state.isna(),
+            ],
+            [
+                "nombre vacío",
+                "La duración debe ser un número entero",
+                "La duración debe ser mayor a 0",
+                "El precio debe ser numérico",
+                "El precio no puede ser negativo",
+                "Estado no válido (use 1/0, true/false o sí/no)",
+            ],
+            default="",
+        ),
+        index=df.index,
+    )
+
+    rows = pd.DataFrame({
+        "row_num": df.index + 2,  # +2 porque Excel empieza en 1 y hay header
+        "name": names,
+        "description": descriptions,
+        "duration_minutes": duration,
+        "price": price,
+        "state": state,
+    })
+    return rows, reasons
+
+def detect_format(source: Union[str, bytes], filename: str) -> str:
+    """
+    Detecta el formato del archivo por su contenido, no por su extensión.
+
+    Args:
+        source: Ruta del archivo o su contenido en bytes
+        filename: Nombre del archivo (para los mensajes)
+
+    Returns:
+        'xlsx', 'parquet' o 'csv'
+
+    Raises:
+        ValueError: Si es un .xls antiguo o un binario no reconocido
+    """
+    if isinstance(source, bytes):
+        sample = source[:4096]
+    else:
+        with open(source, "rb") as f:
+            sample = f.read(4096)
+
+    if sample.startswith(XLSX_MAGIC):
+        return "xlsx"
+    if sample.startswith(PARQUET_MAGIC):
+        return "parquet"
+    if sample.startswith(XLS_MAGIC):
+        raise ValueError(f"El archivo {filename} es un Excel 97-2003 (.xls); guárdelo como .xlsx o .csv")
+    if not sample or b"\x00" in sample:
+        raise ValueError(f"Formato no válido: {filename}")
+    return "csv"
+
+def check_columns(columns, filename: str, expected: frozenset = EXPECTED_COLUMNS):
+    """
+    Comprueba que la cabecera tenga todas las columnas esperadas.
+
+    Args:
+        columns: Nombres de columna leídos del archivo
+        filename: Nombre del archivo (para los mensajes)
+        expected: Columnas obligatorias del esquema
+
+    Raises:
+        ValueError: Si falta alguna columna
+    """
+    missing_cols = set(expected) - set(columns)
+    if missing_cols:
+        raise ValueError(
+            f"El archivo {filename} no tiene las columnas requeridas: {', '.join(missing_cols)}"
+        )
+
+def read_chunks(source: Union[str, bytes], filename: str, chunk_size: int = IMPORT_CHUNK_SIZE,
+                expected: frozenset = EXPECTED_COLUMNS) -> Iterator[pd.DataFrame]:
+    """
+    Devuelve las filas del archivo por bloques con el lector de su formato.
+
+    Todos los lectores validan la cabecera al llamarlos y entregan
+    DataFrames indexados por fila de datos (desde 0), así que la validación
+    y la inserción no dependen del formato.
+
+    Args:
+        source: Ruta del archivo o su contenido en bytes
         filename: Nombre del archivo
-        start_time: Tiempo de inicio del proceso
-        max_time: Tiempo máximo permitido en segundos
-    
+        chunk_size: Filas por bloque
+        expected: Columnas obligatorias del esquema
+
     Returns:
-        Dict con estadísticas del proceso
+        Iterador de DataFrames
+
+    Raises:
+        ValueError: Si el formato no es válido, el archivo no se puede leer o le faltan columnas
     """
-    results = {
-        "filename": filename,
-        "completed": 0,
-        "skipped": 0,
-        "failed": 0,
-        "total": 0,
-        "errors": []
+    readers = {
+        "xlsx": read_excel_chunks,
+        "csv": read_csv_chunks,
+        "parquet": read_parquet_chunks,
     }
+    return readers[detect_format(source, filename)](source, filename, chunk_size, expected)
+
+def read_excel_chunks(source: Union[str, bytes], filename: str, chunk_size: int = IMPORT_CHUNK_SIZE,
+                      expected: frozenset = EXPECTED_COLUMNS) -> Iterator[pd.DataFrame]:
+    """
+    Abre un Excel en modo solo lectura y devuelve sus filas por bloques.
+
+    La cabecera se valida al llamar a la función; las filas se leen de forma
+    perezosa con openpyxl (iter_rows), así que la memoria depende del tamaño
+    del bloque y no del archivo. Se omiten las filas totalmente vacías. El
+    índice de cada bloque es el número de fila de Excel menos 2, igual que el
+    de pd.read_excel, para que validate_services calcule row_num.
+
+    Args:
+        source: Ruta del archivo o su contenido en bytes
+        filename: Nombre del archivo (para los mensajes)
+        chunk_size: Filas por bloque
+        expected: Columnas obligatorias del esquema
+
+    Returns:
+        Iterador de DataFrames con las columnas de la cabecera
 
+    Raises:
+        ValueError: Si el archivo no se puede leer o le faltan columnas
+    """
     try:
-        df = pd.read_excel(file_content, engine='openpyxl')
-        df = df.fillna('')  # Rellenar valores nulos
+        workbook = load_workbook(
+            io.BytesIO(source) if isinstance(source, bytes) else source,
+            read_only=True, data_only=True
+        )
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None) or ()
     except Exception as e:
         raise ValueError(f"No se pudo leer el archivo {filename}: {str(e)}")
 
-    # Validar columnas
-    missing_cols = EXPECTED_COLUMNS - set(df.columns)
-    if missing_cols:
-        raise ValueError(
-            f"El archivo {filename} no tiene las columnas requeridas: {', '.join(missing_cols)}"
+    columns = [str(value).strip() if value is not None else "" for value in header]
+    try:
+        check_columns(columns, filename, expected)
+    except ValueError:
+        workbook.close()
+        raise
+
+    width = len(columns)
+
+    def chunks():
+        try:
+            buffer, index = [], []
+            for excel_row, values in enumerate(rows, start=2):
+                if all(value is None or value == "" for value in values):
+                    continue
+                # En modo solo lectura las filas pueden venir más cortas que la cabecera
+                buffer.append(values[:width] + (None,) * (width - len(values)))
+                index.append(excel_row - 2)
+                if len(buffer) == chunk_size:
+                    yield pd.DataFrame.from_records(buffer, columns=columns, index=index)
+                    buffer, index = [], []
+            if buffer:
+                yield pd.DataFrame.from_records(buffer, columns=columns, index=index)
+        finally:
+            workbook.close()
+
+    return chunks()
+
+def read_csv_chunks(source: Union[str, bytes], filename: str, chunk_size: int = IMPORT_CHUNK_SIZE,
+                    expected: frozenset = EXPECTED_COLUMNS) -> Iterator[pd.DataFrame]:
+    """
+    Lee un CSV (UTF-8) por bloques con el parser en C de pandas.
+
+    El separador (coma, punto y coma, tabulador o barra) se detecta en la
+    cabecera. Todo se lee como texto, igual que llegaría de una celda, y la
+    conversión de tipos la hace validate_services.
+
+    Args:
+        source: Ruta del archivo o su contenido en bytes
+        filename: Nombre del archivo (para los mensajes)
+        chunk_size: Filas por bloque
+        expected: Columnas obligatorias del esquema
+
+    Returns:
+        Iterador de DataFrames con las columnas de la cabecera
+
+    Raises:
+        ValueError: Si el archivo no se puede leer o le faltan columnas
+    """
+    try:
+        if isinstance(source, bytes):
+            first_line = source.split(b"\n", 1)[0]
+        else:
+            with open(source, "rb") as f:
+                first_line = f.readline()
+        header = first_line.decode("utf-8-sig").rstrip("\r\n")
+        try:
+            delimiter = csv.Sniffer().sniff(header, delimiters=CSV_DELIMITERS).delimiter
+        except csv.Error:
+            delimiter = ","
+        reader = pd.read_csv(
+            io.BytesIO(source) if isinstance(source, bytes) else source,
+            sep=delimiter, engine="c", encoding="utf-8-sig", dtype=str,
+            keep_default_na=False, na_values=[""], chunksize=chunk_size
         )
+    except Exception as e:
+        raise ValueError(f"No se pudo leer el archivo {filename}: {str(e)}")
 
-    with get_conn() as conn:
-        cur = conn.cursor(dictionary=True)
-        
-        for idx, row in df.iterrows():
-            results["total"] += 1
-            row_num = idx + 2  # +2 porque Excel empieza en 1 y hay header
+    columns = [column.strip() for column in next(csv.reader([header], delimiter=delimiter), [])]
+    try:
+        check_columns(columns, filename, expected)
+    except ValueError:
+        reader.close()
+        raise
 
-            # Validar datos obligatorios
-            if not row.get("name") or str(row["name"]).strip() == "":
-                results["failed"] += 1
-                results["errors"].append(f"Fila {row_num}: nombre vacío")
-                continue
+    def chunks():
+        with reader:
+            for df in reader:
+                df.columns = columns
+                yield df
 
-            try:
-                # Validar duplicados
-                cur.execute(
-                    "SELECT id_service FROM service WHERE name = %s", 
-                    (str(row["name"]).strip(),)
-                )
-                if cur.fetchone():
-                    results["skipped"] += 1
-                    continue
+    return chunks()
 
-                # Validar y convertir datos
-                duration = int(row["duration_minutes"])
-                price = float(row["price"])
-                state = bool(int(row["state"]) if str(row["state"]).isdigit() else row["state"])
-
-                if duration <= 0:
-                    raise ValueError("La duración debe ser mayor a 0")
-                if price < 0:
-                    raise ValueError("El precio no puede ser negativo")
-
-                # Insertar
-                cur.execute(
-                    """INSERT INTO service (name, description, duration_minutes, price, state)
-                       VALUES (%s, %s, %s, %s, %s)""",
-                    (
-                        str(row["name"]).strip(),
-                        str(row.get("description", "")).strip() or None,
-                        duration,
-                        price,
-                        state,
-                    ),
-                )
-                conn.commit()
-                results["completed"] += 1
-
-            except ValueError as ve:
-                conn.rollback()
-                results["failed"] += 1
-                error_msg = f"Fila {row_num}: {str(ve)}"
-                results["errors"].append(error_msg)
-                logging.error(error_msg)
+def read_parquet_chunks(source: Union[str, bytes], filename: str, chunk_size: int = IMPORT_CHUNK_SIZE,
+                        expected: frozenset = EXPECTED_COLUMNS) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo Parquet por lotes con pyarrow, solo las columnas del esquema.
+
+    Args:
+        source: Ruta del archivo o su contenido en bytes
+        filename: Nombre del archivo (para los mensajes)
+        chunk_size: Filas por bloque
+        expected: Columnas obligatorias del esquema (las únicas que se leen)
+
+    Returns:
+        Iterador de DataFrames con las columnas esperadas
+
+    Raises:
+        ValueError: Si el archivo no se puede leer o le faltan columnas
+    """
+    try:
+        parquet = pq.ParquetFile(io.BytesIO(source) if isinstance(source, bytes) else source)
+        columns = parquet.schema_arrow.names
+    except Exception as e:
+        raise ValueError(f"No se pudo leer el archivo {filename}: {str(e)}")
+    try:
+        check_columns(columns, filename, expected)
+    except ValueError:
+        parquet.close()
+        raise
+
+    def chunks():
+        try:
+            offset = 0
+            for batch in parquet.iter_batches(batch_size=chunk_size, columns=sorted(expected)):
+                df = batch.to_pandas()
+                df.index = pd.RangeIndex(offset, offset + len(df))
+                offset += len(df)
+                yield df
+        finally:
+            parquet.close()
+
+    return chunks()
+
+def add_error(results: Dict[str, Any], message: str):
+    """
+    Registra un error de fila guardando solo los primeros MAX_REPORTED_ERRORS.
+
+    Args:
+        results: Resumen del proceso
+        message: Mensaje del error
+    """
+    if len(results["errors"]) < MAX_REPORTED_ERRORS:
+        results["errors"].append(message)
+    else:
+        results["omitted_errors"] += 1
+
+def native_rows(valid: pd.DataFrame) -> list:
+    """
+    Convierte las filas válidas a tuplas de tipos nativos de Python (el
+    conector no acepta tipos numpy).
+
+    Args:
+        valid: Filas válidas devueltas por validate_services
+
+    Returns:
+        Tuplas (row_num, name, description, duration_minutes, price, state)
+    """
+    return list(zip(
+        valid["row_num"].tolist(),
+        valid["name"].tolist(),
+        [description or None for description in valid["description"].tolist()],
+        valid["duration_minutes"].astype(int).tolist(),
+        valid["price"].astype(float).tolist(),
+        valid["state"].astype(bool).tolist(),
+    ))
+
+def name_key(name: str) -> str:
+    """
+    Normaliza un nombre de servicio para detectar duplicados como lo hace la
+    collation de MySQL (sin distinguir mayúsculas ni acentos).
+
+    Args:
+        name: Nombre del servicio
+
+    Returns:
+        Clave de comparación
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+def existing_name_keys(cur, names: list) -> set:
+    """
+    Busca en bloque qué nombres ya existen en la tabla service.
+
+    Args:
+        cur: Cursor (dictionary=True) de la conexión de importación
+        names: Nombres candidatos
+
+    Returns:
+        Claves (name_key) de los nombres ya registrados
+    """
+    keys = set()
+    for i in range(0, len(names), IMPORT_CHUNK_SIZE):
+        chunk = names[i:i + IMPORT_CHUNK_SIZE]
+        cur.execute(SQL_EXISTING_NAMES.format(", ".join(["%s"] * len(chunk))), chunk)
+        keys.update(name_key(row["name"]) for row in cur.fetchall())
+    return keys
+
+def insert_services(cur, rows: list):
+    """
+    Inserta servicios con un INSERT multi-fila.
+
+    Args:
+        cur: Cursor de la conexión de importación
+        rows: Tuplas (row_num, name, description, duration_minutes, price, state)
+    """
+    cur.executemany(SQL_INSERT_SERVICE, [row[1:] for row in rows])
+
+def insert_chunk(conn, cur, chunk: list, results: Dict[str, Any],
+                 insert: Callable[[Any, list], None] = insert_services):
+    """
+    Inserta un bloque de filas en una transacción con un INSERT multi-fila.
+
+    Las conexiones del pool están en autocommit, así que la transacción se
+    abre aquí explícitamente; sin ella los savepoints se descartarían al
+    crearse. Si el bloque falla se deshace hasta su savepoint y se reintenta
+    fila a fila, cada una con su propio savepoint, para aislar solo las filas
+    que fallan.
+
+    Args:
+        conn: Conexión de importación
+        cur: Cursor de la conexión
+        chunk: Tuplas cuyo primer elemento es el número de fila
+        results: Resumen del proceso; se actualizan completed, failed y errors
+        insert: Función (cur, filas) que escribe un lote de filas
+    """
+    conn.start_transaction()
+    cur.execute("SAVEPOINT import_chunk")
+    try:
+        insert(cur, chunk)
+        inserted = len(chunk)
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT import_chunk")
+        logging.error(f"Bloque de {len(chunk)} filas rechazado, reintentando fila a fila: {str(e)}")
+        inserted = 0
+        for row in chunk:
+            cur.execute("SAVEPOINT import_row")
+            try:
+                insert(cur, [row])
+                inserted += 1
             except Exception as e:
-                conn.rollback()
+                cur.execute("ROLLBACK TO SAVEPOINT import_row")
                 results["failed"] += 1
-                error_msg = f"Fila {row_num}: error al insertar"
-                results["errors"].append(error_msg)
+                error_msg = f"Fila {row[0]}: error al insertar"
+                add_error(results, error_msg)
                 logging.error(f"{error_msg}: {str(e)}")
+    conn.commit()
+    results["completed"] += inserted
+
+class ImportSchema:
+    """
+    Describe cómo se importa un tipo de registro.
+
+    prepare_file usa columns, validate, to_native y prepare (sin base de
+    datos, en el pool de procesos); write_prepared usa el resto con la
+    conexión de importación. Las filas nativas son tuplas cuyo primer elemento es el
+    número de fila del archivo.
+
+    Attributes:
+        kind: Nombre del tipo de importación (parámetro ``kind`` de la carga)
+        columns: Columnas obligatorias del archivo
+    """
+    kind = ""
+    columns: frozenset = frozenset()
+
+    def validate(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """Valida un bloque; devuelve (filas normalizadas con row_num, motivos)."""
+        raise NotImplementedError
+
+    def to_native(self, valid: pd.DataFrame) -> list:
+        """Convierte las filas válidas a tuplas de tipos nativos de Python."""
+        raise NotImplementedError
+
+    def prepare(self, rows: list) -> list:
+        """Trabajo de CPU sobre las filas nativas (p. ej. hashes), antes de abrir la conexión."""
+        return rows
+
+    def key(self, row: tuple) -> str:
+        """Clave de deduplicación de una fila."""
+        raise NotImplementedError
+
+    def open(self, cur) -> Dict[str, Any]:
+        """Carga una vez por archivo los mapas que necesitan las demás etapas."""
+        return {}
+
+    def existing_keys(self, cur, rows: list, context: Dict[str, Any]) -> set:
+        """Busca en bloque qué filas ya existen en la base; devuelve sus claves."""
+        raise NotImplementedError
+
+    def resolve(self, cur, rows: list, results: Dict[str, Any], context: Dict[str, Any]) -> list:
+        """Prepara las filas nuevas para insertarlas (claves foráneas...)."""
+        return rows
+
+    def insert(self, cur, rows: list, context: Dict[str, Any]):
+        """Escribe un lote de filas resueltas."""
+        raise NotImplementedError
+
+    def finish(self, results: Dict[str, Any]):
+        """Se llama al terminar el archivo, aunque haya fallado a mitad."""
+
+class ServiceSchema(ImportSchema):
+    """
+    Importación de servicios: columnas de EXPECTED_COLUMNS, duplicados por
+    nombre (sin distinguir mayúsculas ni acentos).
+    """
+    kind = "services"
+    columns = EXPECTED_COLUMNS
+
+    def validate(self, df):
+        return validate_services(df)
+
+    def to_native(self, valid):
+        return native_rows(valid)
+
+    def key(self, row):
+        return name_key(row[1])
+
+    def existing_keys(self, cur, rows, context):
+        return existing_name_keys(cur, list({row[1] for row in rows}))
+
+    def insert(self, cur, rows, context):
+        insert_services(cur, rows)
+
+    def finish(self, results):
+        # Aunque se interrumpa por timeout, las filas ya confirmadas cambian el catálogo
+        if results["completed"]:
+            service_catalog.invalidate()
 
-            # Control de timeout
-            if time.time() - start_time > max_time:
-                raise TimeoutError(
-                    f"El proceso excedió el tiempo máximo ({max_time}s). "
-                    f"Procesadas {results['completed'] + results['skipped'] + results['failed']} de {results['total']} filas."
-                )
+SERVICE_SCHEMA = ServiceSchema()
 
-        cur.close()
+def prepare_file(source: Union[str, bytes], filename: str, max_time: int = 180,
+                 schema: ImportSchema = SERVICE_SCHEMA) -> Dict[str, Any]:
+    """
+    Lee y valida un archivo completo (Excel, CSV o Parquet) sin tocar la base de datos.
+
+    Es la etapa que se ejecuta en el pool de procesos: las filas válidas se
+    escriben por bloques (pickle) en un archivo temporal que luego consume
+    write_prepared, así que la memoria sigue acotada al tamaño del bloque.
+
+    Args:
+        source: Ruta del archivo o su contenido en bytes
+        filename: Nombre del archivo
+        max_time: Tiempo máximo en segundos para leer y validar el archivo
+        schema: Esquema del tipo de registro que se importa
+
+    Returns:
+        Dict con total, failed, errors, omitted_errors, la ruta del archivo
+        de filas válidas (rows_path) y los tiempos de lectura y validación
+
+    Raises:
+        ValueError: Si el archivo no se puede leer o le faltan columnas
+        TimeoutError: Si la lectura y validación superan max_time
+    """
+    results = {
+        "filename": filename,
+        "total": 0,
+        "failed": 0,
+        "errors": [],
+        "omitted_errors": 0,
+        "rows_path": None,
+        "timings": {"parse": 0.0, "validate": 0.0},
+    }
+    timings = results["timings"]
+
+    started = time.perf_counter()
+    chunks = read_chunks(source, filename, expected=schema.columns)
+    timings["parse"] += time.perf_counter() - started
+
+    spool = tempfile.NamedTemporaryFile(delete=False, prefix="import-rows-", suffix=".pickle")
+    try:
+        with spool:
+            while True:
+                parse_start = time.perf_counter()
+                df = next(chunks, None)
+                validate_start = time.perf_counter()
+                timings["parse"] += validate_start - parse_start
+                if df is None:
+                    break
+
+                rows, reasons = schema.validate(df)
+                invalid = reasons != ""
+                results["total"] += len(rows)
+                results["failed"] += int(invalid.sum())
+                for row_num, reason in zip(rows["row_num"][invalid], reasons[invalid]):
+                    add_error(results, f"Fila {row_num}: {reason}")
+                valid_rows = schema.to_native(rows[~invalid])
+                if valid_rows:
+                    pickle.dump(schema.prepare(valid_rows), spool, protocol=pickle.HIGHEST_PROTOCOL)
+                timings["validate"] += time.perf_counter() - validate_start
+
+                if time.perf_counter() - started > max_time:
+                    raise TimeoutError(
+                        f"La lectura de {filename} excedió el tiempo máximo ({max_time}s). "
+                        f"Leídas {results['total']} filas."
+                    )
+    except BaseException:
+        chunks.close()
+        os.unlink(spool.name)
+        raise
+
+    results["rows_path"] = spool.name
+    return results
+
+def write_prepared(prepared: Dict[str, Any], deadline: float,
+                   on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   schema: ImportSchema = SERVICE_SCHEMA) -> Dict[str, Any]:
+    """
+    Inserta en la base las filas válidas que dejó prepare_file.
+
+    Cada bloque se deduplica (contra la tabla y contra lo ya visto en el
+    archivo), se resuelve con los mapas del esquema y se inserta en su propia
+    transacción. El archivo de filas se borra al terminar, haya ido bien o no.
+
+    Args:
+        prepared: Resultado de prepare_file
+        deadline: Instante (time.time()) a partir del cual se aborta con TimeoutError
+        on_progress: Función opcional que recibe el resumen parcial tras
+            cada bloque insertado
+        schema: Esquema con el que se preparó el archivo
+
+    Returns:
+        Dict con estadísticas del proceso y sus tiempos (parse, validate, write)
+    """
+    results = {
+        "filename": prepared["filename"],
+        "completed": 0,
+        "skipped": 0,
+        "failed": prepared["failed"],
+        "total": prepared["total"],
+        "errors": list(prepared["errors"]),
+        "omitted_errors": prepared["omitted_errors"],
+        "timings": dict(prepared["timings"], write=0.0),
+    }
+    started = time.perf_counter()
+
+    try:
+        with get_conn() as conn, open(prepared["rows_path"], "rb") as spool:
+            cur = conn.cursor(dictionary=True)
+            seen = set()  # claves ya registradas o vistas en el archivo
+
+            try:
+                context = schema.open(cur)
+                insert = partial(schema.insert, context=context)
+                while True:
+                    try:
+                        valid_rows = pickle.load(spool)
+                    except EOFError:
+                        break
+
+                    # Duplicados: ya registrados (una consulta por bloque) o repetidos en el archivo
+                    candidates = [row for row in valid_rows if schema.key(row) not in seen]
+                    seen |= schema.existing_keys(cur, candidates, context)
+                    pending = []
+                    for row in valid_rows:
+                        key = schema.key(row)
+                        if key in seen:
+                            results["skipped"] += 1
+                            continue
+                        seen.add(key)
+                        pending.append(row)
+
+                    pending = schema.resolve(cur, pending, results, context)
+                    if pending:
+                        insert_chunk(conn, cur, pending, results, insert)
+                    else:
+                        conn.commit()
+                    if on_progress:
+                        on_progress(results)
+
+                    # Control de timeout
+                    if time.time() > deadline:
+                        raise TimeoutError(
+                            f"La carga de {results['filename']} excedió el tiempo máximo. "
+                            f"Procesadas {results['completed'] + results['skipped'] + results['failed']} filas."
+                        )
+            except Exception:
+                # Solo deshace el bloque en curso; los anteriores ya están confirmados
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+    finally:
+        os.unlink(prepared["rows_path"])
+        schema.finish(results)
+
+    results["timings"]["write"] = time.perf_counter() - started
+    if results["failed"]:
+        logging.error(f"{results['filename']}: {results['failed']} filas fallidas")
 
     # Limitar errores a los primeros 10
-    if len(results["errors"]) > 10:
-        results["errors"] = results["errors"][:10] + [f"... y {len(results['errors']) - 10} errores más"]
+    omitted = results.pop("omitted_errors")
+    if omitted:
+        results["errors"].append(f"... y {omitted} errores más")
+
+    return results
+
+def process_excel(source: Union[str, bytes], filename: str, start_time: float, max_time: int = 180,
+                  on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  schema: ImportSchema = SERVICE_SCHEMA) -> Dict[str, Any]:
+    """
+    Procesa un archivo de principio a fin en el hilo actual.
 
-    return results
\ No newline at end of file
+    Encadena prepare_file y write_prepared con un único presupuesto de
+    tiempo contado desde start_time.
+    
+    Args:
+        source: Ruta del archivo (p. ej. la copia temporal de la subida) o su contenido en bytes
+        filename: Nombre del archivo
+        start_time: Tiempo de inicio del proceso
+        max_time: Tiempo máximo permitido en segundos
+        on_progress: Función opcional que recibe el resumen parcial tras
+            cada bloque insertado
+        schema: Esquema del tipo de registro que se importa
+
+    Returns:
+        Dict con estadísticas del proceso
+    """
+    prepared = prepare_file(source, filename, max_time - (time.time() - start_time), schema)
+    return write_prepared(prepared, start_time + max_time, on_progress=on_progress, schema=schema)
@@ -0,0 +1,156 @@
+# backend/app/core/password_hashing.py
+"""
+Hash de Contraseñas en Segundo Plano
+====================================
+Ejecuta bcrypt en un pool de procesos dedicado para que los picos de login o
+registro no acaparen la CPU del worker que atiende el resto de endpoints.
+
+El número de operaciones pendientes está acotado por ``HASH_QUEUE_LIMIT``;
+por encima de ese límite se rechaza la petición con ``HashingSaturatedError``
+en lugar de encolarla indefinidamente.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from ..config import settings
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class HashingSaturatedError(Exception):
+    """Se lanza cuando la cola de hash de contraseñas está llena."""
+
+
+@lru_cache(maxsize=4)
+def crypt_context(rounds: int) -> CryptContext:
+    """
+    Devuelve el contexto bcrypt para un coste dado.
+
+    Los hashes con un coste distinto se marcan como obsoletos para que
+    ``verify_and_update`` los regenere con el coste configurado.
+
+    Args:
+        rounds (int): Coste (log2 de iteraciones) de bcrypt.
+
+    Returns:
+        CryptContext: Contexto de passlib.
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def _hash(password: str, rounds: int) -> str:
+    return crypt_context(rounds).hash(password)
+
+
+def _verify_and_update(plain: str, hashed: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return crypt_context(rounds).verify_and_update(plain, hashed)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=settings.HASH_WORKERS)
+    return _executor
+
+
+async def _submit(fn, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.HASH_QUEUE_LIMIT:
+            raise HashingSaturatedError(
+                f"Demasiadas operaciones de contraseña en curso ({_pending}); reintente en unos segundos"
+            )
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    """
+    Genera el hash bcrypt de una contraseña en el pool de procesos.
+
+    Args:
+        password (str): Contraseña en texto plano.
+
+    Returns:
+        str: Hash de la contraseña.
+
+    Raises:
+        HashingSaturatedError: Si la cola de hash está llena.
+    """
+    return await _submit(_hash, password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_and_update(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica una contraseña y, si su hash usa un coste distinto al configurado,
+    devuelve uno nuevo para guardarlo.
+
+    Args:
+        plain (str): Contraseña en texto plano.
+        hashed (str): Hash almacenado.
+
+    Returns:
+        tuple[bool, str | None]: Si coincide y el hash nuevo (o None si no hace falta).
+
+    Raises:
+        HashingSaturatedError: Si la cola de hash está llena.
+    """
+    return await _submit(_verify_and_update, plain, hashed, settings.BCRYPT_ROUNDS)
+
+
+def hash_many(passwords: list) -> list:
+    """
+    Genera los hashes de un lote de contraseñas en el proceso actual.
+
+    Pensada para la importación, que la llama desde su pool de procesos al
+    preparar cada archivo: no usa el pool de la API ni pasa por el control de
+    admisión de ``HASH_QUEUE_LIMIT``, así que un lote grande no retrasa los logins.
+
+    Args:
+        passwords (list[str]): Contraseñas en texto plano.
+
+    Returns:
+        list[str]: Hashes en el mismo orden.
+    """
+    context = crypt_context(settings.BCRYPT_ROUNDS)
+    return [context.hash(password) for password in passwords]
+
+
+def pending() -> int:
+    """
+    Devuelve el número de operaciones de hash en curso o en cola.
+
+    Returns:
+        int: Operaciones pendientes.
+    """
+    return _pending
+
+
+def shutdown():
+    """
+    Detiene el pool de procesos.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
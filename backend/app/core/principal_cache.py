@@ -0,0 +1,90 @@
+# backend/app/core/principal_cache.py
+"""
+Caché de Principales
+====================
+Guarda en memoria el usuario autenticado (sin contraseña) asociado a cada
+email, para que las peticiones con JWT no consulten la base en cada llamada.
+
+La caché es local al proceso: ``update_user``, ``deactivate_user`` y
+``activate_user`` la invalidan explícitamente y el TTL acota cuánto puede
+tardar un cambio hecho en otro worker en verse aquí.
+"""
+
+import threading
+from typing import Optional
+from ..config import settings
+from .cache import TTLCache
+
+_email_by_id = {}          # id_user -> email, para invalidar por ID
+_index_lock = threading.Lock()
+
+
+def _forget(email: str, principal: dict):
+    # Quita del índice un principal que ya no está en la caché (expulsado, expirado o invalidado)
+    with _index_lock:
+        if _email_by_id.get(principal["id_user"]) == email:
+            del _email_by_id[principal["id_user"]]
+
+
+_principals = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL, on_evict=_forget
+)
+
+
+def get_principal(email: str) -> Optional[dict]:
+    """
+    Busca el principal cacheado de un email.
+
+    Args:
+        email (str): Email (``sub`` del token).
+
+    Returns:
+        dict | None: Datos del usuario o None si no está en caché.
+    """
+    return _principals.get(email)
+
+
+def put_principal(user: dict) -> dict:
+    """
+    Guarda un usuario en la caché, descartando el hash de la contraseña.
+
+    Args:
+        user (dict): Fila de usuario obtenida de la base de datos.
+
+    Returns:
+        dict: El principal guardado.
+    """
+    principal = {k: v for k, v in user.items() if k != "password"}
+    _principals.set(principal["email"], principal)
+    with _index_lock:
+        _email_by_id[principal["id_user"]] = principal["email"]
+    return principal
+
+
+def invalidate_principal(user_id: Optional[int] = None, email: Optional[str] = None):
+    """
+    Elimina de la caché a un usuario por ID y/o email.
+
+    Args:
+        user_id (int | None): ID del usuario.
+        email (str | None): Email del usuario.
+    """
+    if user_id is not None:
+        with _index_lock:
+            cached_email = _email_by_id.pop(user_id, None)
+        if cached_email:
+            _principals.pop(cached_email)
+    if email is not None:
+        principal = _principals.pop(email)
+        if principal is not None:
+            _forget(email, principal)
+
+
+def principal_cache_stats() -> dict:
+    """
+    Devuelve las estadísticas de la caché de principales.
+
+    Returns:
+        dict: Tamaño, aciertos y fallos.
+    """
+    return _principals.stats()
@@ -0,0 +1,247 @@
+# backend/app/core/reference_data.py
+"""
+Datos de Referencia
+===================
+Registro en memoria de las tablas ``reservation_status`` y ``role``: unas
+pocas filas que casi nunca cambian. Se carga al arrancar la aplicación y se
+puede recargar con ``POST /admin/reference-data/reload`` tras modificar esas
+tablas a mano. Si la carga del arranque falla, la primera petición la
+reintenta (``ensure_loaded``). Los procesos sin arranque asíncrono (scripts,
+comprobación de planes) lo cargan con ``load_sync()`` antes de usarlo.
+
+Los listados de reservas ya no hacen JOIN con ``reservation_status``: el
+nombre del estado se resuelve aquí al construir la respuesta. Las
+comprobaciones de rol y de estado usan los nombres de este módulo en lugar de
+ids fijos.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+import aiomysql
+from ..async_database import get_async_conn, RequestConnection
+from ..database import get_conn
+from . import reservation_cache
+
+# Nombres fijos (columna ``name``) de los que depende la lógica
+ADMIN_ROLE = "empleado"
+CLIENT_ROLE = "cliente"
+STATUS_PENDING = "Pendiente"
+STATUS_CONFIRMED = "Confirmado"
+STATUS_CANCELLED = "Cancelado"
+STATUS_COMPLETED = "Completado"
+
+SQL_ALL_STATUSES = "SELECT id_reservation_status, name FROM reservation_status"
+SQL_ALL_ROLES = "SELECT id_role, name FROM role"
+
+
+class ReferenceData:
+    """
+    Instantánea inmutable de estados y roles.
+
+    Attributes:
+        statuses (dict): ``id_reservation_status`` -> nombre.
+        status_ids (dict): Nombre en minúsculas -> ``id_reservation_status``.
+        roles (dict): ``id_role`` -> nombre.
+        role_ids (dict): Nombre en minúsculas -> ``id_role``.
+    """
+
+    __slots__ = ("statuses", "status_ids", "roles", "role_ids")
+
+    def __init__(self, statuses: list, roles: list):
+        self.statuses: Dict[int, str] = {row["id_reservation_status"]: row["name"] for row in statuses}
+        self.status_ids: Dict[str, int] = {name.lower(): id_ for id_, name in self.statuses.items()}
+        self.roles: Dict[int, str] = {row["id_role"]: row["name"] for row in roles}
+        self.role_ids: Dict[str, int] = {name.lower(): id_ for id_, name in self.roles.items()}
+
+
+_data: Optional[ReferenceData] = None
+_lock = threading.Lock()
+_load_lock = asyncio.Lock()
+
+
+async def load(db: Optional[RequestConnection] = None) -> ReferenceData:
+    """
+    Lee estados y roles de la base y reemplaza el registro.
+
+    Args:
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        ReferenceData: Registro recién cargado.
+    """
+    global _data
+    try:
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(SQL_ALL_STATUSES)
+                statuses = await cur.fetchall()
+                await cur.execute(SQL_ALL_ROLES)
+                roles = await cur.fetchall()
+    except Exception as e:
+        logging.error(f"Error al cargar los datos de referencia: {str(e)}")
+        raise
+    data = ReferenceData(statuses, roles)
+    with _lock:
+        _data = data
+    reservation_cache.clear()
+    return data
+
+
+def loaded() -> bool:
+    """
+    Indica si el registro ya está cargado.
+
+    Returns:
+        bool: True si ``current()`` puede usarse.
+    """
+    return _data is not None
+
+
+async def ensure_loaded(db: Optional[RequestConnection] = None) -> ReferenceData:
+    """
+    Carga el registro solo si aún no existe (p. ej. si falló la carga del arranque).
+
+    Args:
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        ReferenceData: Registro vigente.
+    """
+    if _data is None:
+        async with _load_lock:
+            if _data is None:
+                await load(db)
+    return _data
+
+
+def load_sync() -> ReferenceData:
+    """
+    Versión síncrona de ``load`` para procesos sin event loop (scripts, CLI).
+
+    Returns:
+        ReferenceData: Registro recién cargado.
+    """
+    global _data
+    try:
+        with get_conn() as conn:
+            cur = conn.cursor(dictionary=True)
+            try:
+                cur.execute(SQL_ALL_STATUSES)
+                statuses = cur.fetchall()
+                cur.execute(SQL_ALL_ROLES)
+                roles = cur.fetchall()
+            finally:
+                cur.close()
+    except Exception as e:
+        logging.error(f"Error al cargar los datos de referencia: {str(e)}")
+        raise
+    data = ReferenceData(statuses, roles)
+    with _lock:
+        _data = data
+    reservation_cache.clear()
+    return data
+
+
+def current() -> ReferenceData:
+    """
+    Devuelve el registro vigente.
+
+    No consulta la base: se llama desde handlers asíncronos y una carga
+    síncrona bloquearía el event loop.
+
+    Returns:
+        ReferenceData: Estados y roles.
+
+    Raises:
+        RuntimeError: Si el registro aún no se ha cargado.
+    """
+    data = _data
+    if data is None:
+        raise RuntimeError("Datos de referencia no cargados")
+    return data
+
+
+def status_id(name: str) -> int:
+    """
+    Busca el id de un estado por nombre (sin distinguir mayúsculas).
+
+    Args:
+        name (str): Nombre del estado, p. ej. ``STATUS_CANCELLED``.
+
+    Returns:
+        int: ``id_reservation_status``.
+
+    Raises:
+        ValueError: Si el estado no existe.
+    """
+    id_status = current().status_ids.get(name.lower())
+    if id_status is None:
+        raise ValueError(f"Invalid reservation status: {name}")
+    return id_status
+
+
+def role_id(name: str) -> int:
+    """
+    Busca el id de un rol por nombre (sin distinguir mayúsculas).
+
+    Args:
+        name (str): Nombre del rol, p. ej. ``CLIENT_ROLE``.
+
+    Returns:
+        int: ``id_role``.
+
+    Raises:
+        ValueError: Si el rol no existe.
+    """
+    id_role = current().role_ids.get(name.lower())
+    if id_role is None:
+        raise ValueError(f"Invalid role: {name}")
+    return id_role
+
+
+def require_status(id_reservation_status: int) -> str:
+    """
+    Comprueba que un id de estado exista.
+
+    Args:
+        id_reservation_status (int): Estado pedido.
+
+    Returns:
+        str: Nombre del estado.
+
+    Raises:
+        ValueError: Si el estado no existe.
+    """
+    name = current().statuses.get(id_reservation_status)
+    if name is None:
+        raise ValueError(f"Invalid reservation status: {id_reservation_status}")
+    return name
+
+
+def is_admin(id_role: Optional[int]) -> bool:
+    """
+    Indica si un rol tiene permisos de administración.
+
+    Args:
+        id_role (int | None): Rol del usuario.
+
+    Returns:
+        bool: True si es el rol ``ADMIN_ROLE``.
+    """
+    return id_role is not None and current().roles.get(id_role, "").lower() == ADMIN_ROLE
+
+
+def with_status_name(reservation: dict) -> dict:
+    """
+    Añade ``status_name`` a una fila de reserva a partir de su ``id_reservation_status``.
+
+    Args:
+        reservation (dict): Fila de reserva.
+
+    Returns:
+        dict: La misma fila.
+    """
+    reservation["status_name"] = current().statuses.get(reservation["id_reservation_status"])
+    return reservation
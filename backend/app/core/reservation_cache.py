@@ -0,0 +1,117 @@
+# backend/app/core/reservation_cache.py
+"""
+Caché de Reservas por Cliente
+=============================
+Guarda ya serializada (JSON en bytes) la respuesta de
+``GET /reservations/my-reservations`` de cada cliente, para que las visitas
+repetidas al panel no vuelvan a ejecutar la consulta.
+
+Cada escritura sobre una reserva (crear, cancelar, cambiar estado, eliminar,
+importar) invalida solo la entrada de su cliente. Las que cambian datos que
+aparecen en todas las listas (servicios, datos de referencia) vacían la
+caché entera. Un contador de versión por cliente evita guardar una lista
+leída antes de una escritura concurrente. Los contadores también caducan
+y tienen tamaño máximo, así que no crecen con cada cliente que alguna vez
+reservó.
+
+La caché es local al proceso y las invalidaciones no se propagan entre
+workers: una escritura hecha en otro worker solo se ve aquí cuando la
+entrada caduca, es decir, hasta ``RESERVATION_CACHE_TTL`` segundos después.
+"""
+
+import threading
+from typing import Optional
+from ..config import settings
+from .cache import TTLCache
+
+_generation = 0             # vaciados completos y contadores descartados
+_lock = threading.RLock()   # reentrante: invalidate() puede descartar un contador
+
+
+def _version_dropped(id_user: int, count: int):
+    # Sin su contador la versión del cliente vuelve a 0: se cambia la
+    # generación para que una lectura en curso con una versión anterior no
+    # pueda coincidir con la nueva y guardar una lista obsoleta.
+    global _generation
+    with _lock:
+        _generation += 1
+
+
+_bodies = TTLCache(maxsize=settings.RESERVATION_CACHE_SIZE, ttl=settings.RESERVATION_CACHE_TTL)
+# id_user -> invalidaciones del cliente
+_versions = TTLCache(
+    maxsize=settings.RESERVATION_CACHE_SIZE, ttl=settings.RESERVATION_CACHE_TTL, on_evict=_version_dropped
+)
+
+
+def get(id_user: int) -> Optional[bytes]:
+    """
+    Devuelve la lista cacheada de un cliente.
+
+    Args:
+        id_user (int): ID del cliente.
+
+    Returns:
+        bytes | None: JSON de sus reservas o None si no está en caché.
+    """
+    return _bodies.get(id_user)
+
+
+def version(id_user: int) -> tuple:
+    """
+    Versión actual de la lista de un cliente; se lee antes de consultar la base.
+
+    Args:
+        id_user (int): ID del cliente.
+
+    Returns:
+        tuple[int, int]: Vaciados completos e invalidaciones del cliente.
+    """
+    count = _versions.get(id_user, 0)   # antes que la generación: puede descartar el contador
+    return _generation, count
+
+
+def put(id_user: int, body: bytes, seen_version: tuple):
+    """
+    Guarda la lista de un cliente si no hubo escrituras desde ``seen_version``.
+
+    Args:
+        id_user (int): ID del cliente.
+        body (bytes): JSON de sus reservas.
+        seen_version (tuple): Valor de ``version()`` leído antes de la consulta.
+    """
+    with _lock:
+        if version(id_user) == seen_version:
+            _bodies.set(id_user, body)
+
+
+def invalidate(id_user: Optional[int]):
+    """
+    Descarta la lista de un cliente tras una escritura sobre sus reservas.
+
+    Args:
+        id_user (int | None): ID del cliente; si es None no hace nada.
+    """
+    if id_user is None:
+        return
+    with _lock:
+        _versions.set(id_user, _versions.get(id_user, 0) + 1)
+        _bodies.pop(id_user)
+
+
+def clear():
+    """Vacía la caché (cambios que afectan a las listas de todos los clientes)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _bodies.clear()
+
+
+def stats() -> dict:
+    """
+    Estadísticas de la caché.
+
+    Returns:
+        dict: Tamaño, aciertos y fallos.
+    """
+    return _bodies.stats()
@@ -1,10 +1,420 @@
 # backend/app/core/reservation_logic.py
+import base64
 import logging
+from datetime import datetime, timedelta
+from ..config import settings
 from ..database import get_conn
+from . import reference_data, reservation_cache
+
+DATETIME_FIELDS = ('start_datetime', 'end_datetime', 'created_at')
+
+
+class ReservationConflictError(ValueError):
+    """Se lanza cuando el horario pedido se solapa con un bloque ocupado."""
+
+# Consultas compartidas con la versión asíncrona (async_reservation_logic)
+SQL_ACTIVE_SERVICE = "SELECT name, duration_minutes, price FROM service WHERE id_service = %s AND state = TRUE"
+SQL_INSERT_RESERVATION = """INSERT INTO reservation 
+    (id_user, id_service, id_reservation_status, start_datetime, end_datetime, total_price, payment_method, state)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, TRUE)"""
+SQL_INSERT_BLOCK = """INSERT INTO calendar_block 
+    (id_reservation, title, start_datetime, end_datetime, color, type, state)
+    VALUES (%s, %s, %s, %s, '#b3ffb3', 'reservation', TRUE)"""
+# Bloques que ocupan el calendario en [inicio, fin): manuales/mantenimiento
+# activos y los de reservas vigentes (no eliminadas ni canceladas).
+# Parámetros: blocks_in_range_params(inicio, fin). Ningún bloque dura más de
+# MAX_BLOCK_MINUTES, así que end_datetime también se acota por arriba y el
+# recorrido de idx_block_window_cover no llega al final del calendario.
+ACTIVE_BLOCKS_IN_RANGE = """
+    FROM calendar_block b
+    LEFT JOIN reservation r ON r.id_reservation = b.id_reservation
+    WHERE b.end_datetime > %s
+      AND b.end_datetime <= %s
+      AND b.start_datetime < %s
+      AND b.state = TRUE
+      AND (b.id_reservation IS NULL OR (r.state = TRUE AND r.id_reservation_status <> %s))
+"""
+SQL_OVERLAPPING_BLOCK = "SELECT b.id_block" + ACTIVE_BLOCKS_IN_RANGE + "LIMIT 1"
+# Una fila por día: las reservas que tocan el mismo día se serializan con
+# SELECT ... FOR UPDATE sobre ella; días distintos no compiten.
+SQL_ENSURE_DAY_LOCK = "INSERT IGNORE INTO calendar_day_lock (day) VALUES (%s)"
+# Igualdad sobre la clave primaria (IN, no BETWEEN): bloquea solo esas filas,
+# sin next-key locks sobre el día siguiente.
+SQL_LOCK_DAYS = "SELECT day FROM calendar_day_lock WHERE day IN ({}) ORDER BY day FOR UPDATE"
+SQL_USER_RESERVATIONS = """
+    SELECT 
+        r.id_reservation,
+        r.id_user,
+        r.id_service,
+        r.id_reservation_status,
+        r.start_datetime,
+        r.end_datetime,
+        r.created_at,
+        r.total_price,
+        r.payment_method,
+        r.state,
+        s.name as service_name,
+        s.description as service_description,
+        s.duration_minutes
+    FROM reservation r
+    INNER JOIN service s ON r.id_service = s.id_service
+    WHERE r.id_user = %s AND r.state = TRUE
+    ORDER BY r.start_datetime DESC
+"""
+SQL_ALL_RESERVATIONS = """
+    SELECT 
+        r.id_reservation,
+        r.id_user,
+        r.id_service,
+        r.id_reservation_status,
+        r.start_datetime,
+        r.end_datetime,
+        r.created_at,
+        r.total_price,
+        r.payment_method,
+        r.state,
+        s.name as service_name,
+        up.first_name,
+        up.last_name,
+        ua.email
+    FROM reservation r
+    INNER JOIN service s ON r.id_service = s.id_service
+    INNER JOIN user_account ua ON r.id_user = ua.id_user
+    INNER JOIN user_profile up ON r.id_user = up.id_user
+    WHERE r.state = TRUE
+"""
+# Orden estable para la paginación por clave (keyset) sobre (start_datetime, id_reservation)
+RESERVATION_LISTING_ORDER = " ORDER BY r.start_datetime DESC, r.id_reservation DESC"
+RESERVATION_KEYSET = "(r.start_datetime < %s OR (r.start_datetime = %s AND r.id_reservation < %s))"
+# Filas por bloque en la exportación en streaming
+EXPORT_BATCH_SIZE = 500
+# Sincronización incremental (GET /reservations/changes): solo se entregan filas
+# modificadas hace al menos estos segundos, para que una escritura aún sin
+# confirmar con un updated_at anterior no quede detrás del token.
+CHANGES_SETTLE_SECONDS = 2
+SQL_SYNC_START = f"SELECT NOW(6) - INTERVAL {CHANGES_SETTLE_SECONDS} SECOND AS updated_at"
+# Filas insertadas, modificadas o borradas (state = FALSE) después de la
+# posición (updated_at, id_reservation) del token, en ese orden.
+SQL_RESERVATION_CHANGES = f"""
+    SELECT 
+        r.id_reservation,
+        r.id_user,
+        r.id_service,
+        r.id_reservation_status,
+        r.start_datetime,
+        r.end_datetime,
+        r.created_at,
+        r.updated_at,
+        r.total_price,
+        r.payment_method,
+        r.state,
+        s.name as service_name,
+        up.first_name,
+        up.last_name,
+        ua.email
+    FROM reservation r
+    INNER JOIN service s ON r.id_service = s.id_service
+    INNER JOIN user_account ua ON r.id_user = ua.id_user
+    INNER JOIN user_profile up ON r.id_user = up.id_user
+    WHERE r.updated_at >= %s
+      AND (r.updated_at > %s OR r.id_reservation > %s)
+      AND r.updated_at < NOW(6) - INTERVAL {CHANGES_SETTLE_SECONDS} SECOND
+    ORDER BY r.updated_at, r.id_reservation
+    LIMIT %s
+"""
+# Filtros admitidos por el listado de administración: nombre -> condición SQL
+RESERVATION_FILTERS = {
+    "date_from": "r.start_datetime >= %s",
+    "date_to": "r.start_datetime < %s + INTERVAL 1 DAY",
+    "id_reservation_status": "r.id_reservation_status = %s",
+    "id_service": "r.id_service = %s",
+    "id_user": "r.id_user = %s",
+}
+SQL_RESERVATION_BY_ID = """
+    SELECT 
+        r.id_reservation,
+        r.id_user,
+        r.id_service,
+        r.id_reservation_status,
+        r.start_datetime,
+        r.end_datetime,
+        r.created_at,
+        r.total_price,
+        r.payment_method,
+        r.state,
+        s.name as service_name
+    FROM reservation r
+    INNER JOIN service s ON r.id_service = s.id_service
+    WHERE r.id_reservation = %s AND r.state = TRUE
+"""
+SQL_UPDATE_STATUS = """
+    UPDATE reservation
+    SET id_reservation_status = %s
+    WHERE id_reservation = %s AND state = TRUE
+"""
+SQL_RESERVATION_OWNER = "SELECT id_user FROM reservation WHERE id_reservation = %s AND state = TRUE"
+SQL_RESERVATION_WINDOW = """
+    SELECT id_user, id_reservation_status, start_datetime, end_datetime
+    FROM reservation
+    WHERE id_reservation = %s AND state = TRUE
+"""
+SQL_CANCEL_RESERVATION = """
+    UPDATE reservation
+    SET id_reservation_status = %s
+    WHERE id_reservation = %s
+"""
+SQL_DELETE_RESERVATION = "UPDATE reservation SET state = FALSE WHERE id_reservation = %s"
+
+def format_datetimes(reservation: dict) -> dict:
+    """
+    Convierte los campos datetime de una reserva a texto 'YYYY-MM-DD HH:MM:SS'.
+
+    Args:
+        reservation (dict): Fila de reserva obtenida de la base de datos.
+
+    Returns:
+        dict: La misma fila con las fechas formateadas.
+    """
+    for field in DATETIME_FIELDS:
+        if reservation.get(field):
+            reservation[field] = reservation[field].strftime('%Y-%m-%d %H:%M:%S')
+    return reservation
+
+def present(reservation: dict) -> dict:
+    """
+    Prepara una fila de reserva para la respuesta: ``status_name`` resuelto
+    con ``reference_data`` (las consultas no hacen JOIN con
+    ``reservation_status``) y ``state`` como booleano. Las fechas se quedan
+    como ``datetime``; ``ORJSONResponse`` las emite en ISO 8601.
+
+    Args:
+        reservation (dict): Fila de reserva obtenida de la base de datos.
+
+    Returns:
+        dict: La misma fila.
+    """
+    reservation["state"] = bool(reservation["state"])
+    return reference_data.with_status_name(reservation)
+
+def encode_cursor(reservation: dict) -> str:
+    """
+    Codifica la posición de una fila del listado como cursor opaco.
+
+    Args:
+        reservation (dict): Fila con 'start_datetime' (datetime) e 'id_reservation'.
+
+    Returns:
+        str: Cursor en base64 URL-safe.
+    """
+    raw = f"{reservation['start_datetime']:%Y-%m-%dT%H:%M:%S}|{reservation['id_reservation']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decodifica un cursor generado por ``encode_cursor``.
+
+    Args:
+        cursor (str): Cursor recibido del cliente.
+
+    Returns:
+        tuple[datetime, int]: ``start_datetime`` e ``id_reservation`` de la última fila vista.
+
+    Raises:
+        ValueError: Si el cursor no es válido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start, id_reservation = raw.split("|")
+        return datetime.fromisoformat(start), int(id_reservation)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def encode_sync_token(updated_at: datetime, id_reservation: int) -> str:
+    """
+    Codifica la posición de sincronización como token opaco.
+
+    Args:
+        updated_at (datetime): ``updated_at`` de la última fila entregada.
+        id_reservation (int): ID de esa fila (0 para el token inicial).
+
+    Returns:
+        str: Token en base64 URL-safe.
+    """
+    raw = f"{updated_at:%Y-%m-%dT%H:%M:%S.%f}|{id_reservation}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_sync_token(token: str) -> tuple:
+    """
+    Decodifica un token generado por ``encode_sync_token``.
+
+    Args:
+        token (str): Token recibido del cliente.
+
+    Returns:
+        tuple[datetime, int]: ``updated_at`` e ``id_reservation`` de la posición.
+
+    Raises:
+        ValueError: Si el token no es válido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        updated_at, id_reservation = raw.split("|")
+        return datetime.fromisoformat(updated_at), int(id_reservation)
+    except Exception:
+        raise ValueError("Invalid sync token")
+
+def build_listing_query(filters: dict = None, cursor: str = None, limit: int = None) -> tuple:
+    """
+    Construye la consulta del listado de reservas con filtros y paginación por clave.
+
+    Args:
+        filters (dict | None): Valores de ``RESERVATION_FILTERS``; los None se ignoran.
+        cursor (str | None): Cursor de la página anterior.
+        limit (int | None): Filas a devolver; si es None no se limita.
+
+    Returns:
+        tuple[str, list]: Consulta SQL y sus parámetros.
+
+    Raises:
+        ValueError: Si el cursor no es válido.
+    """
+    sql = SQL_ALL_RESERVATIONS
+    params = []
+    for name, value in (filters or {}).items():
+        if value is not None:
+            sql += " AND " + RESERVATION_FILTERS[name]
+            params.append(value)
+    if cursor:
+        start, id_reservation = decode_cursor(cursor)
+        sql += " AND " + RESERVATION_KEYSET
+        params += [start, start, id_reservation]
+    sql += RESERVATION_LISTING_ORDER
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+def build_page(rows: list, limit: int) -> dict:
+    """
+    Arma una página del listado a partir de ``limit + 1`` filas leídas.
+
+    Args:
+        rows (list[dict]): Filas en el orden del listado (hasta ``limit + 1``).
+        limit (int): Tamaño de página.
+
+    Returns:
+        dict: ``{"items": [...], "next_cursor": str | None}``.
+    """
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return {
+        "items": [present(row) for row in rows[:limit]],
+        "next_cursor": next_cursor
+    }
+
+def parse_booking_window(reservation_data: dict):
+    """
+    Valida y convierte el horario pedido en una reserva.
+
+    Args:
+        reservation_data (dict): Datos de la reserva con 'start_datetime' y 'end_datetime'.
+
+    Returns:
+        tuple[datetime, datetime]: Inicio y fin de la reserva.
+
+    Raises:
+        ValueError: Si las fechas no son válidas, el fin no es posterior al
+            inicio o la reserva dura más de ``MAX_BLOCK_MINUTES``.
+    """
+    try:
+        start = datetime.fromisoformat(reservation_data["start_datetime"])
+        end = datetime.fromisoformat(reservation_data["end_datetime"])
+    except (TypeError, ValueError):
+        raise ValueError("Invalid datetime format (expected YYYY-MM-DD HH:MM:SS)")
+    if end <= start:
+        raise ValueError("end_datetime must be after start_datetime")
+    if end - start > timedelta(minutes=settings.MAX_BLOCK_MINUTES):
+        raise ValueError(f"Reservation too long (max {settings.MAX_BLOCK_MINUTES} minutes)")
+    return start, end
+
+def blocks_in_range_params(start: datetime, end: datetime) -> tuple:
+    """
+    Parámetros de ``ACTIVE_BLOCKS_IN_RANGE`` para el rango [start, end).
+
+    Args:
+        start (datetime): Inicio del rango.
+        end (datetime): Fin del rango (exclusivo).
+
+    Returns:
+        tuple: Inicio, cota de ``end_datetime``, fin e id del estado Cancelado.
+    """
+    return (
+        start,
+        end + timedelta(minutes=settings.MAX_BLOCK_MINUTES),
+        end,
+        reference_data.status_id(reference_data.STATUS_CANCELLED)
+    )
+
+def lock_days_query(days: list) -> str:
+    """
+    Construye la consulta que bloquea las filas de ``calendar_day_lock`` de ``days``.
+
+    Args:
+        days (list[date]): Días a bloquear.
+
+    Returns:
+        str: Consulta ``SELECT ... FOR UPDATE`` con un marcador por día.
+    """
+    return SQL_LOCK_DAYS.format(", ".join(["%s"] * len(days)))
+
+def booking_days(start: datetime, end: datetime) -> list:
+    """
+    Devuelve los días de calendario que toca el intervalo [start, end).
+
+    Args:
+        start (datetime): Inicio.
+        end (datetime): Fin (exclusivo).
+
+    Returns:
+        list[date]: Días en orden ascendente (orden de bloqueo, evita interbloqueos).
+    """
+    first = start.date()
+    last = (end - timedelta(microseconds=1)).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+def lock_window(conn, cur, start: datetime, end: datetime):
+    """
+    Abre una transacción con los días de [start, end) bloqueados y comprueba
+    que el horario siga libre. El llamador hace commit o rollback.
+
+    Las filas de cerrojo se crean antes, en autocommit, para que la lectura de
+    bloques tome su instantánea tras obtener los cerrojos. La conexión está en
+    autocommit: sin transacción explícita el FOR UPDATE se liberaría al
+    terminar la sentencia.
+
+    Args:
+        conn (MySQLConnection): Conexión del pool.
+        cur (MySQLCursor): Cursor de ``conn``.
+        start (datetime): Inicio del horario.
+        end (datetime): Fin del horario (exclusivo).
+
+    Raises:
+        ReservationConflictError: Si el horario ya está ocupado.
+    """
+    days = booking_days(start, end)
+    cur.executemany(SQL_ENSURE_DAY_LOCK, [(day,) for day in days])
+    conn.start_transaction()
+    cur.execute(lock_days_query(days), days)
+    cur.fetchall()
+    cur.execute(SQL_OVERLAPPING_BLOCK, blocks_in_range_params(start, end))
+    if cur.fetchone():
+        raise ReservationConflictError("The selected time slot is no longer available")
 
 def create_reservation(id_user: int, reservation_data: dict):
     """
     Crea una nueva reserva y bloquea el horario en el calendario.
+
+    La comprobación de solapamiento y los dos INSERT van en una transacción
+    serializada por los cerrojos de los días que toca la reserva.
     
     Args:
         id_user (int): ID del usuario que hace la reserva.
@@ -12,53 +422,61 @@ def create_reservation(id_user: int, reservation_data: dict):
     
     Returns:
         int: ID de la nueva reserva.
+
+    Raises:
+        ValueError: Si las fechas no son válidas o el servicio no existe o está inactivo.
+        ReservationConflictError: Si el horario ya está ocupado.
     """
+    start, end = parse_booking_window(reservation_data)
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
 
             # 1️⃣ Validar servicio activo y obtener duración / precio
-            cur.execute(
-                "SELECT name, duration_minutes, price FROM service WHERE id_service = %s AND state = TRUE",
-                (reservation_data["id_service"],)
-            )
+            cur.execute(SQL_ACTIVE_SERVICE, (reservation_data["id_service"],))
             service = cur.fetchone()
             if not service:
                 raise ValueError("Service not found or inactive")
 
             total_price = service["price"]
 
-            # 2️⃣ Crear reserva
-            cur.execute(
-                """INSERT INTO reservation 
-                (id_user, id_service, id_reservation_status, start_datetime, end_datetime, total_price, payment_method, state)
-                VALUES (%s, %s, 1, %s, %s, %s, %s, TRUE)""",
-                (
-                    id_user,
-                    reservation_data["id_service"],
-                    reservation_data["start_datetime"],
-                    reservation_data["end_datetime"],
-                    total_price,
-                    reservation_data["payment_method"]
+            try:
+                # 2️⃣ Bloquear los días y comprobar solapamiento
+                lock_window(conn, cur, start, end)
+
+                # 3️⃣ Crear reserva
+                cur.execute(
+                    SQL_INSERT_RESERVATION,
+                    (
+                        id_user,
+                        reservation_data["id_service"],
+                        reference_data.status_id(reference_data.STATUS_PENDING),
+                        start,
+                        end,
+                        total_price,
+                        reservation_data["payment_method"]
+                    )
                 )
-            )
-            new_id = cur.lastrowid
-
-            # 3️⃣ Crear bloque en calendario
-            cur.execute(
-                """INSERT INTO calendar_block 
-                (id_reservation, title, start_datetime, end_datetime, color, type, state)
-                VALUES (%s, %s, %s, %s, '#b3ffb3', 'reservation', TRUE)""",
-                (
-                    new_id,
-                    f"Reserva: {service['name']}",
-                    reservation_data["start_datetime"],
-                    reservation_data["end_datetime"]
+                new_id = cur.lastrowid
+
+                # 4️⃣ Crear bloque en calendario
+                cur.execute(
+                    SQL_INSERT_BLOCK,
+                    (
+                        new_id,
+                        f"Reserva: {service['name']}",
+                        start,
+                        end
+                    )
                 )
-            )
 
-            conn.commit()
-            cur.close()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+            reservation_cache.invalidate(id_user)
             return new_id
 
     except ValueError:
@@ -80,87 +498,42 @@ def get_user_reservations(id_user: int):
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute("""
-                SELECT 
-                    r.id_reservation,
-                    r.id_user,
-                    r.id_service,
-                    r.id_reservation_status,
-                    r.start_datetime,
-                    r.end_datetime,
-                    r.created_at,
-                    r.total_price,
-                    r.payment_method,
-                    r.state,
-                    s.name as service_name,
-                    s.description as service_description,
-                    s.duration_minutes,
-                    rs.name as status_name
-                FROM reservation r
-                INNER JOIN service s ON r.id_service = s.id_service
-                INNER JOIN reservation_status rs ON r.id_reservation_status = rs.id_reservation_status
-                WHERE r.id_user = %s AND r.state = TRUE
-                ORDER BY r.start_datetime DESC
-            """, (id_user,))
+            cur.execute(SQL_USER_RESERVATIONS, (id_user,))
             reservations = cur.fetchall()
             cur.close()
             
-            # Convertir datetime objects a strings
+            # Resolver el nombre del estado
             for reservation in reservations:
-                for field in ['start_datetime', 'end_datetime', 'created_at']:
-                    if reservation.get(field):
-                        reservation[field] = reservation[field].strftime('%Y-%m-%d %H:%M:%S')
+                present(reservation)
             
             return reservations if reservations else []
     except Exception as e:
         logging.error(f"Error al obtener reservas del usuario {id_user}: {str(e)}")
         raise
 
-def get_all_reservations():
+def get_all_reservations(filters: dict = None, cursor: str = None, limit: int = 50):
     """
-    Obtiene todas las reservas del sistema (para administradores).
+    Obtiene una página de las reservas del sistema (para administradores).
+    
+    Args:
+        filters (dict | None): Filtros de ``RESERVATION_FILTERS``.
+        cursor (str | None): Cursor devuelto por la página anterior.
+        limit (int): Tamaño de página.
     
     Returns:
-        list: Lista de todas las reservas con información del servicio, usuario y estado.
+        dict: Reservas de la página (con servicio, usuario y estado) y cursor de la siguiente.
+
+    Raises:
+        ValueError: Si el cursor no es válido.
     """
+    sql, params = build_listing_query(filters, cursor, limit + 1)
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute("""
-                SELECT 
-                    r.id_reservation,
-                    r.id_user,
-                    r.id_service,
-                    r.id_reservation_status,
-                    r.start_datetime,
-                    r.end_datetime,
-                    r.created_at,
-                    r.total_price,
-                    r.payment_method,
-                    r.state,
-                    s.name as service_name,
-                    rs.name as status_name,
-                    up.first_name,
-                    up.last_name,
-                    ua.email
-                FROM reservation r
-                INNER JOIN service s ON r.id_service = s.id_service
-                INNER JOIN reservation_status rs ON r.id_reservation_status = rs.id_reservation_status
-                INNER JOIN user_account ua ON r.id_user = ua.id_user
-                INNER JOIN user_profile up ON r.id_user = up.id_user
-                WHERE r.state = TRUE
-                ORDER BY r.start_datetime DESC
-            """)
+            cur.execute(sql, params)
             reservations = cur.fetchall()
             cur.close()
-            
-            # Convertir datetime objects a strings
-            for reservation in reservations:
-                for field in ['start_datetime', 'end_datetime', 'created_at']:
-                    if reservation.get(field):
-                        reservation[field] = reservation[field].strftime('%Y-%m-%d %H:%M:%S')
-            
-            return reservations if reservations else []
+            return build_page(reservations, limit)
     except Exception as e:
         logging.error(f"Error al obtener todas las reservas: {str(e)}")
         raise
@@ -178,45 +551,44 @@ def get_reservation_by_id(id_reservation: int):
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute("""
-                SELECT 
-                    r.id_reservation,
-                    r.id_user,
-                    r.id_service,
-                    r.id_reservation_status,
-                    r.start_datetime,
-                    r.end_datetime,
-                    r.created_at,
-                    r.total_price,
-                    r.payment_method,
-                    r.state,
-                    s.name as service_name,
-                    rs.name as status_name
-                FROM reservation r
-                INNER JOIN service s ON r.id_service = s.id_service
-                INNER JOIN reservation_status rs ON r.id_reservation_status = rs.id_reservation_status
-                WHERE r.id_reservation = %s AND r.state = TRUE
-            """, (id_reservation,))
+            cur.execute(SQL_RESERVATION_BY_ID, (id_reservation,))
             result = cur.fetchone()
             cur.close()
             
-            # Convertir datetime objects a strings
+            # Resolver el nombre del estado
             if result:
-                if result['start_datetime']:
-                    result['start_datetime'] = result['start_datetime'].strftime('%Y-%m-%d %H:%M:%S')
-                if result['end_datetime']:
-                    result['end_datetime'] = result['end_datetime'].strftime('%Y-%m-%d %H:%M:%S')
-                if result['created_at']:
-                    result['created_at'] = result['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+                present(result)
             
             return result
     except Exception as e:
         logging.error(f"Error al obtener reserva con id {id_reservation}: {str(e)}")
         raise
 
+def reactivates(reservation: dict, id_reservation_status: int) -> bool:
+    """
+    Indica si el cambio de estado saca una reserva de Cancelado (y vuelve a ocupar su horario).
+
+    Args:
+        reservation (dict | None): Fila de ``SQL_RESERVATION_WINDOW``.
+        id_reservation_status (int): Nuevo ID del estado.
+
+    Returns:
+        bool: True si hay que bloquear los días y comprobar solapamiento.
+    """
+    cancelled = reference_data.status_id(reference_data.STATUS_CANCELLED)
+    return (
+        reservation is not None
+        and reservation["id_reservation_status"] == cancelled
+        and id_reservation_status != cancelled
+    )
+
 def update_reservation_status(id_reservation: int, id_reservation_status: int):
     """
     Actualiza el estado de una reserva.
+
+    Reactivar una reserva cancelada vuelve a ocupar su horario, así que pasa
+    por los mismos cerrojos y la misma comprobación de solapamiento que al
+    reservar.
     
     Args:
         id_reservation (int): ID de la reserva.
@@ -224,18 +596,31 @@ def update_reservation_status(id_reservation: int, id_reservation_status: int):
     
     Returns:
         bool: True si la actualización fue exitosa.
+
+    Raises:
+        ValueError: Si el estado no existe.
+        ReservationConflictError: Si se reactiva y su horario ya está ocupado.
     """
+    reference_data.require_status(id_reservation_status)
     try:
         with get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                UPDATE reservation
-                SET id_reservation_status = %s
-                WHERE id_reservation = %s AND state = TRUE
-            """, (id_reservation_status, id_reservation))
-            conn.commit()
-            cur.close()
+            cur = conn.cursor(dictionary=True)
+            try:
+                cur.execute(SQL_RESERVATION_WINDOW, (id_reservation,))
+                reservation = cur.fetchone()
+                if reactivates(reservation, id_reservation_status):
+                    lock_window(conn, cur, reservation["start_datetime"], reservation["end_datetime"])
+                cur.execute(SQL_UPDATE_STATUS, (id_reservation_status, id_reservation))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+            reservation_cache.invalidate(reservation["id_user"] if reservation else None)
             return True
+    except ValueError:
+        raise
     except Exception as e:
         logging.error(f"Error al actualizar estado de reserva {id_reservation}: {str(e)}")
         raise
@@ -256,23 +641,17 @@ def cancel_reservation(id_reservation: int, id_user: int):
             cur = conn.cursor(dictionary=True)
             
             # Verificar que la reserva pertenece al usuario
-            cur.execute(
-                "SELECT id_user FROM reservation WHERE id_reservation = %s AND state = TRUE",
-                (id_reservation,)
-            )
+            cur.execute(SQL_RESERVATION_OWNER, (id_reservation,))
             reservation = cur.fetchone()
             
             if not reservation or reservation["id_user"] != id_user:
                 raise ValueError("Reservation not found or unauthorized")
             
-            # Cambiar estado a Cancelado (id_reservation_status = 3)
-            cur.execute("""
-                UPDATE reservation
-                SET id_reservation_status = 3
-                WHERE id_reservation = %s
-            """, (id_reservation,))
+            # Cambiar estado a Cancelado
+            cur.execute(SQL_CANCEL_RESERVATION, (reference_data.status_id(reference_data.STATUS_CANCELLED), id_reservation))
             conn.commit()
             cur.close()
+            reservation_cache.invalidate(id_user)
             return True
     except ValueError:
         raise
@@ -292,13 +671,13 @@ def delete_reservation(id_reservation: int):
     """
     try:
         with get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "UPDATE reservation SET state = FALSE WHERE id_reservation = %s",
-                (id_reservation,)
-            )
+            cur = conn.cursor(dictionary=True)
+            cur.execute(SQL_RESERVATION_OWNER, (id_reservation,))
+            owner = cur.fetchone()
+            cur.execute(SQL_DELETE_RESERVATION, (id_reservation,))
             conn.commit()
             cur.close()
+            reservation_cache.invalidate(owner["id_user"] if owner else None)
             return True
     except Exception as e:
         logging.error(f"Error al eliminar reserva {id_reservation}: {str(e)}")
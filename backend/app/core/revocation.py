@@ -0,0 +1,130 @@
+# backend/app/core/revocation.py
+"""
+Revocación de Tokens
+====================
+Mantiene en memoria el ``token_version`` y el ``state`` de cada cuenta para
+verificar los JWT sin consultar la base de datos.
+
+El mapa se carga completo al arrancar y luego se refresca de forma
+incremental leyendo solo las filas de ``user_account`` cuyo ``updated_at``
+cambió desde la última lectura. Así un ``logout-all`` o una desactivación
+hecha en cualquier worker revoca los tokens en pocos segundos.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Optional
+import aiomysql
+from ..async_database import get_async_conn
+from ..config import settings
+
+# Margen para no perder filas confirmadas con un updated_at anterior a la marca
+_OVERLAP = "INTERVAL 5 SECOND"
+
+SQL_ALL_TOKEN_STATES = """
+    SELECT id_user, token_version, state, updated_at FROM user_account
+"""
+SQL_CHANGED_TOKEN_STATES = f"""
+    SELECT id_user, token_version, state, updated_at FROM user_account
+    WHERE updated_at >= %s - {_OVERLAP}
+"""
+
+VALID = "valid"
+REVOKED = "revoked"
+UNKNOWN = "unknown"
+
+_versions = {}          # id_user -> (token_version, state)
+_watermark = None       # mayor updated_at leído
+_loaded = False
+_lock = threading.Lock()
+_task: Optional[asyncio.Task] = None
+
+
+async def refresh():
+    """
+    Aplica al mapa en memoria los cambios de ``user_account`` desde la última lectura.
+
+    La primera llamada carga todas las cuentas.
+    """
+    global _watermark, _loaded
+    async with get_async_conn() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cur:
+            if _watermark is None:
+                await cur.execute(SQL_ALL_TOKEN_STATES)
+            else:
+                await cur.execute(SQL_CHANGED_TOKEN_STATES, (_watermark,))
+            rows = await cur.fetchall()
+
+    with _lock:
+        for row in rows:
+            _versions[row["id_user"]] = (row["token_version"], bool(row["state"]))
+            if _watermark is None or row["updated_at"] > _watermark:
+                _watermark = row["updated_at"]
+        _loaded = True
+
+
+def check(user_id: int, token_version: int) -> str:
+    """
+    Comprueba si un token sigue vigente según el mapa en memoria.
+
+    Args:
+        user_id (int): Claim ``uid`` del token.
+        token_version (int): Claim ``ver`` del token.
+
+    Returns:
+        str: ``VALID``, ``REVOKED`` o ``UNKNOWN`` si la cuenta aún no está en el mapa.
+    """
+    if not _loaded:
+        return UNKNOWN
+    entry = _versions.get(user_id)
+    if entry is None:
+        return UNKNOWN
+    version, active = entry
+    if not active or version != token_version:
+        return REVOKED
+    return VALID
+
+
+def forget(user_id: int):
+    """
+    Descarta el estado local de una cuenta tras modificarla en este proceso,
+    para que se verifique contra la base hasta el siguiente refresco.
+
+    Args:
+        user_id (int): ID del usuario.
+    """
+    with _lock:
+        _versions.pop(user_id, None)
+
+
+async def _refresh_loop():
+    while True:
+        try:
+            await refresh()
+        except Exception as e:
+            logging.error(f"Error al refrescar el estado de revocación: {str(e)}")
+        await asyncio.sleep(settings.REVOCATION_REFRESH_SECONDS)
+
+
+def start_refresher():
+    """
+    Lanza la tarea en segundo plano que refresca el mapa periódicamente.
+    """
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_refresher():
+    """
+    Detiene la tarea de refresco.
+    """
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,63 @@
+# backend/app/core/serialization.py
+"""
+Serialización Rápida de Respuestas
+==================================
+``ORJSONResponse`` codifica con orjson las filas tal como las devuelve el
+driver: ``datetime`` sale directamente en ISO 8601 (``YYYY-MM-DDTHH:MM:SS``)
+y ``Decimal`` como número, sin el bucle de ``strftime`` previo.
+
+Los listados construidos a partir de filas de la base (datos de confianza)
+devuelven una ``ORJSONResponse`` desde la ruta: FastAPI no vuelve a validar
+una ``Response`` con el ``response_model``, que se mantiene solo para la
+documentación OpenAPI. Es además la clase de respuesta por defecto de la
+aplicación, así que el resto de rutas también se codifica con orjson.
+"""
+
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Codifica un valor con orjson (admite ``datetime``, ``Decimal`` y claves no texto).
+
+    Args:
+        content (Any): Valor a codificar.
+
+    Returns:
+        bytes: JSON en UTF-8.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Respuesta JSON codificada con orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def as_bool(rows: list, *fields: str) -> list:
+    """
+    Convierte a ``bool`` columnas BOOLEAN, que el driver devuelve como 0/1.
+
+    Args:
+        rows (list[dict]): Filas de la base; se modifican en el sitio.
+        *fields (str): Columnas a convertir.
+
+    Returns:
+        list[dict]: Las mismas filas.
+    """
+    for row in rows:
+        for field in fields:
+            if row.get(field) is not None:
+                row[field] = bool(row[field])
+    return rows
@@ -0,0 +1,128 @@
+# backend/app/core/service_catalog.py
+"""
+Catálogo de Servicios en Memoria
+================================
+Instantánea del catálogo de servicios ya serializada a JSON, con su ETag,
+para que ``GET /services/`` y ``GET /services/{id}`` no consulten la base.
+
+Cada escritura (CRUD de servicios e importación Excel) llama a
+``invalidate()``, que incrementa la versión del catálogo; la siguiente
+lectura reconstruye la instantánea una sola vez. También vacía
+``reservation_cache``, cuyas listas incluyen nombre y duración del servicio.
+
+La instantánea es local al proceso: una escritura hecha en otro worker no
+la invalida aquí, así que se relee como mucho cada ``SERVICE_CATALOG_TTL``
+segundos. El ETag se calcula sobre el JSON, así que coincide entre workers
+que sirven el mismo catálogo.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+import aiomysql
+from pydantic import TypeAdapter
+from ..async_database import get_async_conn, RequestConnection
+from ..config import settings
+from ..models import ServiceOut
+from .http_cache import make_etag
+from . import reservation_cache, service_logic
+
+_services_adapter = TypeAdapter(list[ServiceOut])
+
+_version = 0                # se incrementa en cada escritura
+_snapshot = None            # CatalogSnapshot de la versión vigente
+_lock = threading.Lock()
+_rebuild_lock = asyncio.Lock()
+
+
+class CatalogSnapshot:
+    """
+    Catálogo serializado correspondiente a una versión.
+
+    Attributes:
+        version (int): Versión del catálogo con la que se construyó.
+        expires_at (float): Instante (``time.monotonic``) a partir del cual se relee.
+        body (bytes): JSON de la lista completa de servicios.
+        etag (str): ETag de ``body``.
+        items (dict): ``id_service`` -> ``(body, etag)`` de cada servicio.
+        services (dict): ``id_service`` -> ``ServiceOut`` de cada servicio.
+    """
+
+    __slots__ = ("version", "expires_at", "body", "etag", "items", "services")
+
+    def __init__(self, version: int, services: list):
+        self.version = version
+        self.expires_at = time.monotonic() + settings.SERVICE_CATALOG_TTL
+        self.body = _services_adapter.dump_json(services)
+        self.etag = make_etag(self.body)
+        self.items = {}
+        self.services = {service.id_service: service for service in services}
+        for service in services:
+            item_body = service.model_dump_json().encode()
+            self.items[service.id_service] = (item_body, make_etag(item_body))
+
+
+def invalidate():
+    """
+    Marca el catálogo como obsoleto tras una escritura en ``service``.
+
+    Es seguro llamarla desde hilos (lógica síncrona e importación Excel).
+    """
+    global _version
+    with _lock:
+        _version += 1
+    reservation_cache.clear()
+
+
+def _is_current(snapshot: Optional[CatalogSnapshot]) -> bool:
+    return (
+        snapshot is not None
+        and snapshot.version == _version
+        and snapshot.expires_at > time.monotonic()
+    )
+
+
+def version() -> int:
+    """
+    Devuelve la versión actual del catálogo.
+
+    Returns:
+        int: Versión monotónicamente creciente.
+    """
+    return _version
+
+
+async def get_snapshot(db: Optional[RequestConnection] = None) -> CatalogSnapshot:
+    """
+    Devuelve la instantánea vigente, reconstruyéndola si hubo escrituras en
+    este proceso o si ha caducado.
+
+    Args:
+        db (RequestConnection | None): Conexión de la petición; si es None se usa una del pool.
+
+    Returns:
+        CatalogSnapshot: Catálogo serializado.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if _is_current(snapshot):
+        return snapshot
+
+    async with _rebuild_lock:
+        snapshot = _snapshot
+        if _is_current(snapshot):
+            return snapshot
+
+        target = _version
+        async with get_async_conn(db) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(service_logic.SQL_ALL_SERVICES)
+                rows = await cur.fetchall()
+        snapshot = CatalogSnapshot(target, _services_adapter.validate_python(rows))
+
+        # Si hubo otra escritura mientras se leía, no se publica como vigente
+        with _lock:
+            if target == _version:
+                _snapshot = snapshot
+        return snapshot
@@ -8,6 +8,17 @@ Incluye manejo de errores y registro de logs para rastrear fallos operativos.
 
 import logging
 from ..database import get_conn
+from . import service_catalog
+
+# Consultas compartidas con la versión asíncrona (async_service_logic)
+SQL_ALL_SERVICES = "SELECT * FROM service"
+SQL_SERVICE_BY_ID = "SELECT * FROM service WHERE id_service = %s"
+SQL_INSERT_SERVICE = """INSERT INTO service (name, description, duration_minutes, price, state)
+                        VALUES (%s, %s, %s, %s, %s)"""
+SQL_UPDATE_SERVICE = """UPDATE service
+                        SET name=%s, description=%s, duration_minutes=%s, price=%s, state=%s
+                        WHERE id_service=%s"""
+SQL_DELETE_SERVICE = "DELETE FROM service WHERE id_service = %s"
 
 def get_all_services():
     """
@@ -19,7 +30,7 @@ def get_all_services():
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute("SELECT * FROM service")
+            cur.execute(SQL_ALL_SERVICES)
             rows = cur.fetchall()
             cur.close()
             return rows
@@ -41,7 +52,7 @@ def get_service_by_id(id_service: int):
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute("SELECT * FROM service WHERE id_service = %s", (id_service,))
+            cur.execute(SQL_SERVICE_BY_ID, (id_service,))
             row = cur.fetchone()
             cur.close()
             return row
@@ -65,14 +76,14 @@ def create_service(data: dict):
         with get_conn() as conn:
             cur = conn.cursor()
             cur.execute(
-                """INSERT INTO service (name, description, duration_minutes, price, state)
-                   VALUES (%s, %s, %s, %s, %s)""",
+                SQL_INSERT_SERVICE,
                 (data["name"], data.get("description"), data["duration_minutes"], data["price"], data["state"])
             )
             conn.commit()
             new_id = cur.lastrowid
             cur.close()
-            return new_id
+        service_catalog.invalidate()
+        return new_id
     except Exception as e:
         logging.error(f"Error al crear servicio: {str(e)}")
         raise
@@ -90,13 +101,12 @@ def update_service(id_service: int, data: dict):
         with get_conn() as conn:
             cur = conn.cursor()
             cur.execute(
-                """UPDATE service
-                   SET name=%s, description=%s, duration_minutes=%s, price=%s, state=%s
-                   WHERE id_service=%s""",
+                SQL_UPDATE_SERVICE,
                 (data["name"], data.get("description"), data["duration_minutes"], data["price"], data["state"], id_service)
             )
             conn.commit()
             cur.close()
+        service_catalog.invalidate()
     except Exception as e:
         logging.error(f"Error al actualizar servicio con id {id_service}: {str(e)}")
         raise
@@ -112,9 +122,10 @@ def delete_service(id_service: int):
     try:
         with get_conn() as conn:
             cur = conn.cursor()
-            cur.execute("DELETE FROM service WHERE id_service = %s", (id_service,))
+            cur.execute(SQL_DELETE_SERVICE, (id_service,))
             conn.commit()
             cur.close()
+        service_catalog.invalidate()
     except Exception as e:
         logging.error(f"Error al eliminar servicio con id {id_service}: {str(e)}")
         raise
\ No newline at end of file
@@ -12,6 +12,47 @@ from typing import Optional
 from ..database import get_conn
 from ..security import get_password_hash, verify_password
 from ..models import UserCreate
+from . import principal_cache, revocation
+
+# Consultas compartidas con la versión asíncrona (async_user_logic)
+SQL_USER_BY_EMAIL = """
+    SELECT ua.id_user, ua.email, ua.password, ua.id_role, ua.state, ua.token_version,
+           up.first_name, up.last_name, up.phone
+    FROM user_account ua
+    LEFT JOIN user_profile up ON ua.id_user = up.id_user
+    WHERE ua.email = %s
+"""
+SQL_INSERT_ACCOUNT = "INSERT INTO user_account (email, password, id_role) VALUES (%s, %s, %s)"
+SQL_INSERT_PROFILE = "INSERT INTO user_profile (id_user, first_name, last_name, phone) VALUES (%s, %s, %s, %s)"
+SQL_ALL_USERS = """
+    SELECT ua.id_user, ua.email, ua.id_role, ua.state,
+           up.first_name, up.last_name, up.phone
+    FROM user_account ua
+    LEFT JOIN user_profile up ON ua.id_user = up.id_user
+    ORDER BY ua.id_user DESC
+"""
+SQL_USER_BY_ID = """
+    SELECT ua.id_user, ua.email, ua.id_role, ua.state,
+           up.first_name, up.last_name, up.phone
+    FROM user_account ua
+    LEFT JOIN user_profile up ON ua.id_user = up.id_user
+    WHERE ua.id_user = %s
+"""
+SQL_UPDATE_PROFILE = """
+    UPDATE user_profile 
+    SET first_name = %s, last_name = %s, phone = %s
+    WHERE id_user = %s
+"""
+# Cambiar email o rol invalida los tokens emitidos con los claims anteriores
+SQL_UPDATE_EMAIL = "UPDATE user_account SET email = %s, token_version = token_version + 1 WHERE id_user = %s"
+SQL_UPDATE_ROLE = "UPDATE user_account SET id_role = %s, token_version = token_version + 1 WHERE id_user = %s"
+SQL_SET_STATE = "UPDATE user_account SET state = %s WHERE id_user = %s"
+SQL_UPDATE_PASSWORD = "UPDATE user_account SET password = %s WHERE id_user = %s"
+SQL_SET_LOGGED_IN = "UPDATE user_account SET is_logged_in = %s WHERE id_user = %s"
+SQL_REVOKE_TOKENS = """
+    UPDATE user_account SET token_version = token_version + 1, is_logged_in = FALSE
+    WHERE id_user = %s
+"""
 
 def get_user_by_email(email: str) -> Optional[dict]:
     """
@@ -26,16 +67,7 @@ def get_user_by_email(email: str) -> Optional[dict]:
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute(
-                """
-                SELECT ua.id_user, ua.email, ua.password, ua.id_role, ua.state,
-                       up.first_name, up.last_name, up.phone
-                FROM user_account ua
-                LEFT JOIN user_profile up ON ua.id_user = up.id_user
-                WHERE ua.email = %s
-                """,
-                (email,)
-            )
+            cur.execute(SQL_USER_BY_EMAIL, (email,))
             row = cur.fetchone()
             cur.close()
             return row
@@ -60,15 +92,12 @@ def create_user(user_data: UserCreate) -> dict:
             cur = conn.cursor()
 
             # Inserta el registro principal del usuario
-            cur.execute(
-                "INSERT INTO user_account (email, password, id_role) VALUES (%s, %s, %s)",
-                (user_data.email, hashed, user_data.id_role)
-            )
+            cur.execute(SQL_INSERT_ACCOUNT, (user_data.email, hashed, user_data.id_role))
             id_user = cur.lastrowid
 
             # Inserta los datos del perfil asociado
             cur.execute(
-                "INSERT INTO user_profile (id_user, first_name, last_name, phone) VALUES (%s, %s, %s, %s)",
+                SQL_INSERT_PROFILE,
                 (id_user, user_data.first_name, user_data.last_name, user_data.phone)
             )
 
@@ -123,15 +152,7 @@ def get_all_users() -> list:
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute(
-                """
-                SELECT ua.id_user, ua.email, ua.id_role, ua.state,
-                       up.first_name, up.last_name, up.phone
-                FROM user_account ua
-                LEFT JOIN user_profile up ON ua.id_user = up.id_user
-                ORDER BY ua.id_user DESC
-                """
-            )
+            cur.execute(SQL_ALL_USERS)
             users = cur.fetchall()
             cur.close()
             return users
@@ -153,16 +174,7 @@ def get_user_by_id(user_id: int) -> Optional[dict]:
     try:
         with get_conn() as conn:
             cur = conn.cursor(dictionary=True)
-            cur.execute(
-                """
-                SELECT ua.id_user, ua.email, ua.id_role, ua.state,
-                       up.first_name, up.last_name, up.phone
-                FROM user_account ua
-                LEFT JOIN user_profile up ON ua.id_user = up.id_user
-                WHERE ua.id_user = %s
-                """,
-                (user_id,)
-            )
+            cur.execute(SQL_USER_BY_ID, (user_id,))
             row = cur.fetchone()
             cur.close()
             return row
@@ -188,32 +200,24 @@ def update_user(user_id: int, user_data: dict) -> dict:
 
             # Actualizar datos del perfil
             cur.execute(
-                """
-                UPDATE user_profile 
-                SET first_name = %s, last_name = %s, phone = %s
-                WHERE id_user = %s
-                """,
+                SQL_UPDATE_PROFILE,
                 (user_data.get('first_name'), user_data.get('last_name'), 
                  user_data.get('phone'), user_id)
             )
 
             # Actualizar email si se proporciona
             if 'email' in user_data:
-                cur.execute(
-                    "UPDATE user_account SET email = %s WHERE id_user = %s",
-                    (user_data['email'], user_id)
-                )
+                cur.execute(SQL_UPDATE_EMAIL, (user_data['email'], user_id))
 
             # Actualizar rol si se proporciona
             if 'id_role' in user_data:
-                cur.execute(
-                    "UPDATE user_account SET id_role = %s WHERE id_user = %s",
-                    (user_data['id_role'], user_id)
-                )
+                cur.execute(SQL_UPDATE_ROLE, (user_data['id_role'], user_id))
 
             conn.commit()
             cur.close()
 
+        principal_cache.invalidate_principal(user_id=user_id)
+        revocation.forget(user_id)
         # Obtener datos actualizados
         return get_user_by_id(user_id)
     except Exception as e:
@@ -234,12 +238,11 @@ def deactivate_user(user_id: int) -> bool:
     try:
         with get_conn() as conn:
             cur = conn.cursor()
-            cur.execute(
-                "UPDATE user_account SET state = FALSE WHERE id_user = %s",
-                (user_id,)
-            )
+            cur.execute(SQL_SET_STATE, (False, user_id))
             conn.commit()
             cur.close()
+            principal_cache.invalidate_principal(user_id=user_id)
+            revocation.forget(user_id)
             return True
     except Exception as e:
         logging.error(f"Error al desactivar usuario ({user_id}): {str(e)}")
@@ -259,12 +262,11 @@ def activate_user(user_id: int) -> bool:
     try:
         with get_conn() as conn:
             cur = conn.cursor()
-            cur.execute(
-                "UPDATE user_account SET state = TRUE WHERE id_user = %s",
-                (user_id,)
-            )
+            cur.execute(SQL_SET_STATE, (True, user_id))
             conn.commit()
             cur.close()
+            principal_cache.invalidate_principal(user_id=user_id)
+            revocation.forget(user_id)
             return True
     except Exception as e:
         logging.error(f"Error al reactivar usuario ({user_id}): {str(e)}")
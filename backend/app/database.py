@@ -1,34 +1,257 @@
 # backend/app/database.py
-from mysql.connector import pooling
+"""
+Módulo de Base de Datos
+=======================
+Pool de conexiones a MySQL acotado y observable.
+
+El pool mantiene hasta ``DB_POOL_SIZE`` conexiones permanentes y permite
+``DB_POOL_MAX_OVERFLOW`` conexiones extra en picos. Cuando todas están en uso,
+las peticiones esperan en una cola FIFO hasta ``DB_POOL_TIMEOUT`` segundos
+en lugar de fallar de inmediato.
+"""
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+import mysql.connector
+from mysql.connector import errors as mysql_errors
 from .config import settings
 
+# Límites superiores (ms) de los buckets del histograma de latencia de checkout
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
 _pool = None
+_pool_lock = threading.Lock()
+
+
+class PoolTimeoutError(TimeoutError):
+    """Se lanza cuando no se obtiene una conexión dentro del tiempo de espera."""
+
+
+class _Waiter:
+    """Petición en cola esperando a que otra libere una conexión."""
+    __slots__ = ("event", "conn", "may_create")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+        self.may_create = False
+
+
+class BoundedPool:
+    """
+    Pool de conexiones con cola de espera FIFO, tiempo límite y reciclado.
+
+    Las conexiones liberadas se entregan directamente al primer hilo en
+    espera, por lo que el orden de llegada se respeta incluso bajo presión.
+
+    Args:
+        size (int): Conexiones permanentes.
+        max_overflow (int): Conexiones extra temporales.
+        timeout (float): Segundos de espera máximos en ``acquire``.
+        recycle (int): Segundos de vida de una conexión antes de reemplazarla.
+        **connect_kwargs: Parámetros de ``mysql.connector.connect``.
+    """
+
+    def __init__(self, size: int, max_overflow: int, timeout: float, recycle: int, **connect_kwargs):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self._connect_kwargs = connect_kwargs
+        self._lock = threading.Lock()
+        self._idle = deque()          # (conn, created_at)
+        self._waiters = deque()       # _Waiter en orden de llegada
+        self._created_at = {}         # id(conn) -> created_at
+        self._total = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self._connect_kwargs)
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn) -> bool:
+        created = self._created_at.get(id(conn), 0)
+        return self.recycle > 0 and time.monotonic() - created > self.recycle
+
+    def _record_latency(self, started: float):
+        elapsed_ms = (time.monotonic() - started) * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self._latency_counts[i] += 1
+                break
+        else:
+            self._latency_counts[-1] += 1
+        self._checkouts += 1
+
+    def acquire(self):
+        """
+        Obtiene una conexión, esperando en cola si el pool está agotado.
+
+        Returns:
+            MySQLConnection: Conexión lista para usarse.
+
+        Raises:
+            PoolTimeoutError: Si no hay conexión disponible dentro del tiempo límite.
+        """
+        started = time.monotonic()
+        conn = None
+        create = False
+        waiter = None
+        with self._lock:
+            if self._idle and not self._waiters:
+                conn = self._idle.pop()
+                self._in_use += 1
+            elif self._total < self.size + self.max_overflow and not self._waiters:
+                self._total += 1
+                self._in_use += 1
+                create = True
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            waiter.event.wait(self.timeout)
+            with self._lock:
+                if waiter.conn is None and not waiter.may_create:
+                    self._waiters.remove(waiter)
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No se obtuvo una conexión en {self.timeout}s "
+                        f"({self._in_use} en uso, {len(self._waiters)} en espera)"
+                    )
+            conn = waiter.conn
+            create = waiter.may_create
+
+        if conn is not None and self._expired(conn):
+            self._discard(conn)
+            conn = None
+            create = True
+
+        if create:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._total -= 1
+                    self._in_use -= 1
+                raise
+
+        with self._lock:
+            self._record_latency(started)
+        return conn
+
+    def release(self, conn, discard: bool = False):
+        """
+        Devuelve una conexión al pool o la entrega al primer hilo en espera.
+
+        Args:
+            conn (MySQLConnection): Conexión obtenida con ``acquire``.
+            discard (bool): Si es True la conexión se cierra en lugar de reutilizarse.
+        """
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._lock:
+            self._in_use -= 1
+            if discard or self._expired(conn):
+                self._discard(conn)
+                if self._waiters:
+                    waiter = self._waiters.popleft()
+                    waiter.may_create = True
+                    self._in_use += 1
+                    waiter.event.set()
+                else:
+                    self._total -= 1
+            elif self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.conn = conn
+                self._in_use += 1
+                waiter.event.set()
+            elif self._total > self.size:
+                self._discard(conn)
+                self._total -= 1
+            else:
+                self._idle.append(conn)
+
+    def stats(self) -> dict:
+        """
+        Devuelve una instantánea del estado del pool.
+
+        Returns:
+            dict: Conexiones en uso, ociosas, en espera, timeouts e histograma de latencia.
+        """
+        with self._lock:
+            histogram = {
+                f"le_{bound}ms": count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self._latency_counts)
+            }
+            histogram["gt_{}ms".format(LATENCY_BUCKETS_MS[-1])] = self._latency_counts[-1]
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "total": self._total,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": len(self._waiters),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "checkout_latency": histogram,
+            }
+
 
 def init_pool():
     """
     Inicializa el pool de conexiones a MySQL.
 
     Returns:
-        MySQLConnectionPool: Pool de conexiones a MySQL.
+        BoundedPool: Pool de conexiones a MySQL.
     """
     global _pool
     if _pool is None:
-        try:
-            _pool = pooling.MySQLConnectionPool(
-                pool_name="fastapi_pool",
-                pool_size=5,
-                host=settings.MYSQL_HOST,
-                port=settings.MYSQL_PORT,
-                user=settings.MYSQL_USER,
-                password=settings.MYSQL_PASSWORD,
-                database=settings.MYSQL_DATABASE,
-                autocommit=True
-            )
-        except Exception as e:
-            raise Exception(f"Error al inicializar el pool de conexiones: {str(e)}")
+        with _pool_lock:
+            if _pool is None:
+                try:
+                    _pool = BoundedPool(
+                        size=settings.DB_POOL_SIZE,
+                        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+                        timeout=settings.DB_POOL_TIMEOUT,
+                        recycle=settings.DB_POOL_RECYCLE,
+                        host=settings.MYSQL_HOST,
+                        port=settings.MYSQL_PORT,
+                        user=settings.MYSQL_USER,
+                        password=settings.MYSQL_PASSWORD,
+                        database=settings.MYSQL_DATABASE,
+                        autocommit=True
+                    )
+                except Exception as e:
+                    raise Exception(f"Error al inicializar el pool de conexiones: {str(e)}")
     return _pool
 
+def get_pool_stats() -> dict:
+    """
+    Obtiene las estadísticas en vivo del pool de conexiones.
+
+    Returns:
+        dict: Estadísticas del pool.
+    """
+    return init_pool().stats()
+
 @contextmanager
 def get_conn():
     """
@@ -38,20 +261,28 @@ def get_conn():
         MySQLConnection: Una conexión a MySQL del pool.
 
     Raises:
+        PoolTimeoutError: Si el pool está agotado durante más de DB_POOL_TIMEOUT.
         Exception: Si hay un error al obtener la conexión.
     """
     pool = init_pool()
     try:
-        conn = pool.get_connection()
-        yield conn
+        conn = pool.acquire()
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise Exception(f"Error al obtener la conexión: {str(e)}")
+
+    discard = False
+    try:
+        yield conn
+    except (mysql_errors.InterfaceError, mysql_errors.OperationalError):
+        discard = True
+        raise
     finally:
-        if 'conn' in locals():
-            conn.close()
+        pool.release(conn, discard=discard)
 
 # Inicializar el pool al importar el módulo
 try:
     init_pool()
 except Exception as e:
-    print(f"Error al inicializar el pool: {str(e)}")
\ No newline at end of file
+    print(f"Error al inicializar el pool: {str(e)}")
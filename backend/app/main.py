@@ -1,9 +1,15 @@
 # backend/app/main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
-from app.rutas import auth, service, upload_excel, users, reservation 
-from app.database import init_pool, get_conn
+from app.rutas import auth, service, upload_excel, users, reservation, export
+from app.database import init_pool, get_conn, get_pool_stats, PoolTimeoutError
+from app.async_database import init_async_pool, close_async_pool, RequestConnectionMiddleware
+from app.core.principal_cache import principal_cache_stats
+from app.core import revocation, password_hashing, import_jobs, reference_data, reservation_cache
+from app.core.serialization import ORJSONResponse
+from app.security import get_current_user, reference_data_ready
 from mysql.connector import Error as MySQLError
 import logging
 
@@ -11,11 +17,13 @@ app = FastAPI(
     title="Proyecto Reservas",
     version="1.0",
     description="Backend para la gestión de usuarios, servicios y reservas de un Centro de Belleza",
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {"name": "Auth", "description": "Registro y autenticación de usuarios"},
         {"name": "Services", "description": "Gestión de servicios (solo admin)"},
         {"name": "Users", "description": "Gestión de usuarios (solo admin)"},
-        {"name": "Reservations", "description": "Gestión de reservas"}
+        {"name": "Reservations", "description": "Gestión de reservas"},
+        {"name": "Export", "description": "Exportación de tablas a CSV/Excel (solo admin)"}
     ]
 )
 
@@ -58,22 +66,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Incluir routers
-app.include_router(auth.router)
-app.include_router(service.router)
-app.include_router(upload_excel.router)
-app.include_router(users.router)
-app.include_router(reservation.router)
+# Una conexión por petición, obtenida solo si se usa y liberada al terminar
+app.add_middleware(RequestConnectionMiddleware)
+
+# Incluir routers (todos usan estados o roles del registro de datos de referencia)
+for router in (auth.router, service.router, upload_excel.router, users.router, reservation.router, export.router):
+    app.include_router(router, dependencies=[Depends(reference_data_ready)])
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """
+    Responde 503 cuando el pool de conexiones está saturado, para que el
+    cliente reintente en lugar de recibir un error 500 genérico.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Servicio saturado: {str(exc)}"},
+        headers={"Retry-After": "1"}
+    )
 
 @app.on_event("startup")
 async def startup():
     """
-    Inicializa el pool de conexiones a la base de datos al iniciar la aplicación.
+    Inicializa los pools de conexiones (síncrono y asíncrono), carga los
+    datos de referencia (estados y roles) y lanza el refresco del mapa de
+    revocación de tokens al iniciar la aplicación.
+
+    Si los datos de referencia no se pueden cargar, la primera petición
+    vuelve a intentarlo (``reference_data_ready``).
     """
     try:
         init_pool()
+        await init_async_pool()
     except Exception as e:
         logging.error(f"Error al inicializar el pool de conexiones: {str(e)}")
+    try:
+        await reference_data.load()
+    except Exception:
+        # load() ya registra la causa
+        logging.warning("Datos de referencia no cargados; se reintentará en la primera petición")
+    revocation.start_refresher()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Detiene el refresco de revocaciones, los pools de hash de contraseñas e
+    importación Excel y cierra el pool asíncrono al detener la aplicación.
+    """
+    await revocation.stop_refresher()
+    password_hashing.shutdown()
+    import_jobs.shutdown()
+    await close_async_pool()
 
 @app.get("/")
 async def ping():
@@ -88,25 +131,74 @@ async def ping():
 @app.get("/health")
 async def health_check():
     """
-    Realiza una verificación de salud de la API y la conexión a la base de datos.
+    Realiza una verificación de salud de la API, la conexión a la base de datos
+    y los datos de referencia (que intenta cargar si aún no lo están).
 
     Returns:
-        dict: Estado de salud de la API y la base de datos.
+        dict: Estado de salud de la API, la base de datos y los datos de referencia.
 
     Raises:
-        HTTPException: Si hay un problema con la conexión a la base de datos.
+        HTTPException: Si hay un problema con la conexión a la base de datos o
+            los datos de referencia no se pueden cargar.
     """
     try:
         with get_conn() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT 1")
             cursor.fetchone()
-        return {
-            "status": "healthy",
-            "api": "running",
-            "database": "connected"
-        }
     except MySQLError as e:
         raise HTTPException(status_code=500, detail=f"Database connection error: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    try:
+        await reference_data.ensure_loaded()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Reference data not loaded: {str(e)}")
+    return {
+        "status": "healthy",
+        "api": "running",
+        "database": "connected",
+        "reference_data": "loaded"
+    }
+
+@app.get("/health/pool")
+async def pool_stats():
+    """
+    Expone las estadísticas en vivo del pool de conexiones y de las cachés de principales y reservas.
+
+    Returns:
+        dict: Conexiones en uso, ociosas, en espera, timeouts e histograma de latencia.
+    """
+    stats = get_pool_stats()
+    stats["principal_cache"] = principal_cache_stats()
+    stats["reservation_cache"] = reservation_cache.stats()
+    stats["password_hash_pending"] = password_hashing.pending()
+    return stats
+
+@app.post("/admin/reference-data/reload")
+async def reload_reference_data(user: dict = Depends(get_current_user)):
+    """
+    Recarga los estados de reserva y los roles tras modificar esas tablas.
+
+    No depende de ``require_admin``: el rol de administrador se comprueba con
+    el registro, así que primero se asegura que esté cargado.
+
+    Args:
+        user (dict): Usuario autenticado.
+
+    Returns:
+        dict: Estados y roles cargados (id -> nombre).
+
+    Raises:
+        HTTPException: 403 si no es administrador, 503 si no se pueden leer las tablas.
+    """
+    try:
+        await reference_data.ensure_loaded()
+        if not reference_data.is_admin(user["id_role"]):
+            raise HTTPException(status_code=403, detail="Not authorized")
+        data = await reference_data.load()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Reference data not available: {str(e)}", headers={"Retry-After": "1"})
+    return {"statuses": data.statuses, "roles": data.roles}
@@ -0,0 +1,144 @@
+# backend/app/migrations/__init__.py
+"""
+Migraciones de Esquema
+======================
+Aplica en orden los archivos ``sql/V<NNN>__<nombre>.sql`` que aún no figuran
+en la tabla ``schema_migrations``. ``database/init.sql`` crea las bases nuevas
+ya al día (y registra sus versiones); las migraciones llevan a esa misma
+forma las bases creadas antes.
+
+Las sentencias DDL de MySQL confirman solas, así que cada archivo se aplica
+sentencia a sentencia y solo se registra al terminar. Las que fallan porque
+el objeto ya existe (o ya no existe, en un ``DROP``) se omiten, para que una
+migración a medias se pueda relanzar. Un ``GET_LOCK`` evita que dos procesos
+migren a la vez.
+
+Uso (desde backend/):
+    python -m app.migrations               # aplica las pendientes
+    python -m app.migrations status        # versiones aplicadas y pendientes
+    python -m app.migrations check-plans   # EXPLAIN de las consultas calientes
+"""
+
+import logging
+import os
+import re
+from mysql.connector import errorcode, errors as mysql_errors
+from ..database import get_conn
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), "sql")
+FILE_PATTERN = re.compile(r"^V(\d+)__(\w+)\.sql$")
+LOCK_NAME = "schema_migrations"
+LOCK_TIMEOUT = 60
+
+# Errores que indican que la sentencia ya se aplicó antes
+ALREADY_APPLIED = {
+    errorcode.ER_TABLE_EXISTS_ERROR,       # 1050
+    errorcode.ER_DUP_FIELDNAME,            # 1060
+    errorcode.ER_DUP_KEYNAME,              # 1061
+    errorcode.ER_CANT_DROP_FIELD_OR_KEY,   # 1091
+}
+
+SQL_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+SQL_APPLIED = "SELECT version, name, applied_at FROM schema_migrations ORDER BY version"
+SQL_RECORD = "INSERT IGNORE INTO schema_migrations (version, name) VALUES (%s, %s)"
+
+
+def available() -> list:
+    """
+    Lista las migraciones del directorio ``sql``.
+
+    Returns:
+        list[tuple[int, str, str]]: (versión, nombre, ruta) ordenadas por versión.
+    """
+    found = []
+    for filename in os.listdir(SQL_DIR):
+        match = FILE_PATTERN.match(filename)
+        if match:
+            found.append((int(match.group(1)), match.group(2), os.path.join(SQL_DIR, filename)))
+    return sorted(found)
+
+
+def split_statements(script: str) -> list:
+    """
+    Separa un archivo SQL en sentencias (terminadas en ``;``), sin comentarios ``--``.
+
+    Args:
+        script (str): Contenido del archivo.
+
+    Returns:
+        list[str]: Sentencias sin el ``;`` final.
+    """
+    lines = [line for line in script.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def _applied(cur) -> dict:
+    cur.execute(SQL_CREATE_TABLE)
+    cur.execute(SQL_APPLIED)
+    return {row[0]: (row[1], row[2]) for row in cur.fetchall()}
+
+
+def status() -> list:
+    """
+    Estado de cada migración disponible.
+
+    Returns:
+        list[tuple[int, str, datetime | None]]: (versión, nombre, fecha de aplicación o None).
+    """
+    with get_conn() as conn:
+        cur = conn.cursor()
+        try:
+            applied = _applied(cur)
+        finally:
+            cur.close()
+    return [(version, name, applied.get(version, (None, None))[1]) for version, name, _ in available()]
+
+
+def migrate() -> list:
+    """
+    Aplica las migraciones pendientes en orden.
+
+    Returns:
+        list[str]: Nombres (``V<NNN>__<nombre>``) de las migraciones aplicadas.
+
+    Raises:
+        TimeoutError: Si otro proceso mantiene el bloqueo de migración más de ``LOCK_TIMEOUT`` segundos.
+        mysql.connector.Error: Si una sentencia falla por otro motivo; la migración queda sin registrar.
+    """
+    done = []
+    with get_conn() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT))
+            if cur.fetchone()[0] != 1:
+                raise TimeoutError("Otro proceso está aplicando migraciones")
+            try:
+                applied = _applied(cur)
+                for version, name, path in available():
+                    if version in applied:
+                        continue
+                    with open(path, encoding="utf-8") as f:
+                        statements = split_statements(f.read())
+                    for statement in statements:
+                        try:
+                            cur.execute(statement)
+                        except mysql_errors.Error as e:
+                            if e.errno not in ALREADY_APPLIED:
+                                logging.error(f"Error al aplicar la migración V{version:03d}__{name}: {str(e)}")
+                                raise
+                            logging.info(f"V{version:03d}__{name}: omitida ({e.msg})")
+                    cur.execute(SQL_RECORD, (version, name))
+                    conn.commit()
+                    done.append(f"V{version:03d}__{name}")
+            finally:
+                cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                cur.fetchone()
+        finally:
+            cur.close()
+    return done
@@ -0,0 +1,31 @@
+# backend/app/migrations/__main__.py
+"""
+CLI de migraciones: ``python -m app.migrations [migrate|status|check-plans]``.
+"""
+
+import argparse
+import logging
+from . import migrate, status
+from .plans import check_plans
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    parser.add_argument("command", nargs="?", default="migrate", choices=["migrate", "status", "check-plans"])
+    command = parser.parse_args().command
+    logging.basicConfig(level=logging.INFO)
+
+    if command == "status":
+        for version, name, applied_at in status():
+            print(f"V{version:03d}__{name:40s} {applied_at or 'pendiente'}")
+    elif command == "check-plans":
+        failures = check_plans()
+        if failures:
+            raise SystemExit(f"{failures} consulta(s) con planes degradados")
+    else:
+        done = migrate()
+        print("\n".join(done) if done else "Sin migraciones pendientes")
+
+
+if __name__ == "__main__":
+    main()
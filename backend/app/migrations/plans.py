@@ -0,0 +1,100 @@
+# backend/app/migrations/plans.py
+"""
+Comprobación de Planes de Consulta
+==================================
+Ejecuta ``EXPLAIN`` sobre las consultas calientes de reservas y calendario y
+falla si alguna vuelve a recorrer entera ``reservation`` o ``calendar_block``
+(``type = ALL``) o necesita ordenar aparte (``Using filesort``). Sirve para
+detectar que una migración o un cambio de consulta ha dejado de usar los
+índices de la V002.
+
+Uso (desde backend/, contra una base con datos representativos):
+    python -m app.migrations check-plans
+"""
+
+from datetime import datetime, timedelta
+from ..core import reference_data
+from ..core.availability import SQL_BUSY_BLOCKS
+from ..core.reservation_logic import (
+    SQL_OVERLAPPING_BLOCK, SQL_RESERVATION_BY_ID, SQL_RESERVATION_CHANGES, SQL_USER_RESERVATIONS,
+    blocks_in_range_params, build_listing_query, encode_cursor
+)
+from ..database import get_conn
+
+WATCHED_TABLES = {"reservation", "calendar_block"}
+
+
+def hot_queries() -> list:
+    """
+    Consultas calientes con parámetros de ejemplo.
+
+    Returns:
+        list[tuple[str, str, list]]: (etiqueta, SQL, parámetros).
+    """
+    now = datetime.now().replace(microsecond=0)
+    later = now + timedelta(days=14)
+    cursor = encode_cursor({"start_datetime": now, "id_reservation": 1000})
+    listing = [
+        ("listado", {}, None),
+        ("listado por estado", {"id_reservation_status": reference_data.status_id(reference_data.STATUS_PENDING)}, None),
+        ("listado por servicio", {"id_service": 1}, None),
+        ("listado por cliente", {"id_user": 1}, None),
+        ("listado página siguiente", {}, cursor),
+    ]
+    queries = [("reservas del cliente", SQL_USER_RESERVATIONS, [1])]
+    for label, filters, page in listing:
+        sql, params = build_listing_query(filters, page, 50)
+        queries.append((label, sql, params))
+    queries += [
+        ("solapamiento", SQL_OVERLAPPING_BLOCK, list(blocks_in_range_params(now, now + timedelta(hours=1)))),
+        ("disponibilidad", SQL_BUSY_BLOCKS, [now, now, *blocks_in_range_params(now, later)]),
+        ("reserva por id", SQL_RESERVATION_BY_ID, [1]),
+        ("cambios desde token", SQL_RESERVATION_CHANGES, [now, now, 1000, 501]),
+    ]
+    return queries
+
+
+def problems(plan: list) -> list:
+    """
+    Problemas de un plan de ``EXPLAIN``.
+
+    Args:
+        plan (list[dict]): Filas de ``EXPLAIN`` (una por tabla).
+
+    Returns:
+        list[str]: Descripción de cada problema; vacía si el plan es correcto.
+    """
+    found = []
+    for row in plan:
+        extra = row.get("Extra") or ""
+        if row.get("table") in WATCHED_TABLES and row.get("type") == "ALL":
+            found.append(f"recorrido completo de {row['table']}")
+        if "Using filesort" in extra:
+            found.append(f"filesort en {row.get('table')}")
+    return found
+
+
+def check_plans() -> int:
+    """
+    Revisa el plan de cada consulta caliente e imprime el resultado.
+
+    Returns:
+        int: Número de consultas con problemas.
+    """
+    failures = 0
+    reference_data.load_sync()
+    with get_conn() as conn:
+        cur = conn.cursor(dictionary=True)
+        try:
+            for label, sql, params in hot_queries():
+                cur.execute("EXPLAIN " + sql, params)
+                plan = cur.fetchall()
+                issues = problems(plan)
+                keys = ", ".join(f"{row['table']}:{row.get('key') or '-'}" for row in plan)
+                print(f"{'FALLO' if issues else 'ok':5s} {label:26s} {keys}")
+                for issue in issues:
+                    print(f"      - {issue}")
+                failures += bool(issues)
+        finally:
+            cur.close()
+    return failures
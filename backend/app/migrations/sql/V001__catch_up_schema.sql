@@ -0,0 +1,29 @@
+-- Cambios de esquema anteriores al gestor de migraciones, para bases creadas
+-- con una versión antigua de database/init.sql. En una base nueva todo esto
+-- ya existe y el gestor omite cada sentencia.
+
+ALTER TABLE user_account
+    ADD COLUMN token_version INT NOT NULL DEFAULT 0 COMMENT 'Se incrementa para revocar todos los tokens del usuario';
+
+ALTER TABLE user_account
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+
+CREATE INDEX idx_user_updated_at ON user_account (updated_at);
+
+CREATE INDEX idx_reservation_listing ON reservation (state, start_datetime, id_reservation);
+
+CREATE INDEX idx_block_window ON calendar_block (end_datetime, start_datetime);
+
+CREATE TABLE calendar_day_lock (
+    day DATE PRIMARY KEY
+);
+
+CREATE TABLE import_history (
+    id_import INT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL DEFAULT 'services' COMMENT 'services, users, reservations',
+    content_sha256 CHAR(64) NOT NULL,
+    filename VARCHAR(255) NOT NULL,
+    summary JSON NOT NULL COMMENT 'Resultado del archivo tal como lo devolvió la importación',
+    imported_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_import_content (kind, content_sha256)
+);
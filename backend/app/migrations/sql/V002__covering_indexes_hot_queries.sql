@@ -0,0 +1,18 @@
+-- Índices compuestos con la forma de las consultas calientes. Todas filtran
+-- state = TRUE y ordenan por start_datetime (y id_reservation, que InnoDB
+-- añade al final de cada índice secundario), así que ninguna necesita
+-- filesort. Los índices de una sola columna que quedan cubiertos se eliminan;
+-- los nuevos siguen empezando por la columna de cada clave foránea.
+
+-- Reservas de un cliente: WHERE id_user = ? AND state = TRUE ORDER BY start_datetime
+CREATE INDEX idx_reservation_user_state ON reservation (id_user, state, start_datetime);
+DROP INDEX idx_reservation_user ON reservation;
+
+-- Listado de administración filtrado por servicio o por estado
+CREATE INDEX idx_reservation_service_state ON reservation (id_service, state, start_datetime);
+DROP INDEX idx_reservation_service ON reservation;
+CREATE INDEX idx_reservation_status_state ON reservation (id_reservation_status, state, start_datetime);
+
+-- Solapamiento y disponibilidad: rango de fechas + state + id_reservation sin leer la fila
+CREATE INDEX idx_block_window_cover ON calendar_block (end_datetime, start_datetime, state, id_reservation);
+DROP INDEX idx_block_window ON calendar_block;
@@ -0,0 +1,9 @@
+-- Marca de última modificación de cada reserva, para GET /reservations/changes.
+-- ON UPDATE la mantiene MySQL en cada escritura (cambio de estado, cancelación,
+-- borrado lógico); las filas existentes quedan con la fecha de la migración.
+
+ALTER TABLE reservation
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+
+-- InnoDB añade id_reservation al final: sirve el orden (updated_at, id_reservation)
+CREATE INDEX idx_reservation_updated_at ON reservation (updated_at);
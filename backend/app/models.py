@@ -1,6 +1,7 @@
 # backend/app/models.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
+from .core import reference_data
 
 # Modelos de usuarios
 class UserCreate(BaseModel):
@@ -13,14 +14,14 @@ class UserCreate(BaseModel):
         first_name (str): Nombre del usuario.
         last_name (str): Apellido del usuario.
         phone (str): Número de teléfono del usuario.
-        id_role (int): ID del rol del usuario (por defecto 2, usuario normal).
+        id_role (int): ID del rol del usuario (por defecto el rol ``cliente`` de ``reference_data``).
     """
     email: EmailStr
     password: str
     first_name: str
     last_name: str
     phone: str
-    id_role: int = 2  # Por defecto, asumimos que es un usuario normal
+    id_role: int = Field(default_factory=lambda: reference_data.role_id(reference_data.CLIENT_ROLE))
 
 class UserLogin(BaseModel):
     """
@@ -137,6 +138,7 @@ class ReservationOut(BaseModel):
         start_datetime (str): Fecha y hora de inicio de la reserva.
         end_datetime (str): Fecha y hora de finalización de la reserva.
         created_at (str): Fecha de creación de la reserva.
+        updated_at (Optional[str]): Fecha de la última modificación (solo en ``/reservations/changes``).
         total_price (float): Precio total de la reserva.
         payment_method (str): Método de pago.
         state (bool): Estado de la reserva.
@@ -144,6 +146,9 @@ class ReservationOut(BaseModel):
         status_name (Optional[str]): Nombre del estado de la reserva.
         service_description (Optional[str]): Descripción del servicio.
         duration_minutes (Optional[int]): Duración del servicio en minutos.
+        first_name (Optional[str]): Nombre del cliente (listado de administración).
+        last_name (Optional[str]): Apellido del cliente (listado de administración).
+        email (Optional[str]): Email del cliente (listado de administración).
     """
     id_reservation: int
     id_user: int
@@ -152,10 +157,65 @@ class ReservationOut(BaseModel):
     start_datetime: str
     end_datetime: str
     created_at: str
+    updated_at: Optional[str] = None
     total_price: float
     payment_method: str
     state: bool
     service_name: Optional[str] = None
     status_name: Optional[str] = None
     service_description: Optional[str] = None
-    duration_minutes: Optional[int] = None
\ No newline at end of file
+    duration_minutes: Optional[int] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+
+# Modelos de disponibilidad
+class AvailabilityDay(BaseModel):
+    """
+    Huecos reservables de un día.
+
+    Attributes:
+        date (str): Fecha (formato: YYYY-MM-DD).
+        slots (list[str]): Horas de inicio disponibles (formato: HH:MM).
+    """
+    date: str
+    slots: list[str]
+
+class AvailabilityOut(BaseModel):
+    """
+    Modelo para la respuesta de disponibilidad de un servicio.
+
+    Attributes:
+        id_service (int): ID del servicio consultado.
+        duration_minutes (int): Duración del servicio en minutos.
+        slot_minutes (int): Granularidad de los huecos en minutos.
+        days (list[AvailabilityDay]): Huecos por día; solo se incluyen días con algún hueco.
+    """
+    id_service: int
+    duration_minutes: int
+    slot_minutes: int
+    days: list[AvailabilityDay]
+
+class ReservationPage(BaseModel):
+    """
+    Página del listado de reservas.
+
+    Attributes:
+        items (list[ReservationOut]): Reservas de la página.
+        next_cursor (Optional[str]): Cursor para pedir la página siguiente; None si es la última.
+    """
+    items: list[ReservationOut]
+    next_cursor: Optional[str] = None
+
+class ReservationChanges(BaseModel):
+    """
+    Cambios del listado de reservas desde un token de sincronización.
+
+    Attributes:
+        items (list[ReservationOut]): Reservas insertadas, modificadas o borradas (``state`` false), en orden de modificación.
+        next_token (str): Token para la siguiente llamada.
+        has_more (bool): True si quedan cambios por pedir con ``next_token``.
+    """
+    items: list[ReservationOut]
+    next_token: str
+    has_more: bool
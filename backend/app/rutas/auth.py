@@ -1,20 +1,24 @@
 #backend/app/rutas/auth.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from datetime import timedelta
-from ..core import user_logic
-from ..security import create_access_token
+from ..core import async_user_logic
+from ..core.password_hashing import HashingSaturatedError
+from ..async_database import RequestConnection, get_db
+from ..security import create_access_token, build_token_claims, get_current_user
+from ..database import PoolTimeoutError
 from ..config import settings
 from ..models import UserCreate, UserOut, UserLogin
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/register", response_model=UserOut)
-def register(data: UserCreate):
+async def register(data: UserCreate, db: RequestConnection = Depends(get_db)):
     """
     Crea un nuevo usuario si el email no existe.
     
     Args:
         data (UserCreate): Datos del usuario a crear.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         UserOut: Datos del usuario creado.
@@ -23,21 +27,28 @@ def register(data: UserCreate):
         HTTPException: Si el email ya está registrado.
     """
     try:
-        user = user_logic.get_user_by_email(data.email)
+        user = await async_user_logic.get_user_by_email(data.email, db=db)
         if user:
             raise HTTPException(status_code=400, detail="Email already registered")
-        new_user = user_logic.create_user(data)
+        new_user = await async_user_logic.create_user(data, db=db)
         return UserOut(**new_user)
+    except HTTPException:
+        raise
+    except HashingSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except PoolTimeoutError:
+        raise  # 503 con Retry-After en main.pool_timeout_handler
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating user: {str(e)}")
 
 @router.post("/login")
-def login(data: UserLogin):
+async def login(data: UserLogin, db: RequestConnection = Depends(get_db)):
     """
     Autentica usuario y genera token JWT.
     
     Args:
         data (UserLogin): Credenciales del usuario.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Token de acceso y tipo.
@@ -46,13 +57,62 @@ def login(data: UserLogin):
         HTTPException: Si las credenciales son inválidas.
     """
     try:
-        user = user_logic.authenticate_user(data.email, data.password)
+        user = await async_user_logic.authenticate_user(data.email, data.password, db=db)
         if not user:
             raise HTTPException(status_code=401, detail="Invalid credentials")
+        if not user["state"]:
+            raise HTTPException(status_code=401, detail="Inactive user")
         token = create_access_token(
-            {"sub": user["email"], "role": user["id_role"]},
+            build_token_claims(user),
             timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         )
+        await async_user_logic.set_logged_in(user["id_user"], True, db=db)
         return {"access_token": token, "token_type": "bearer"}
+    except HTTPException:
+        raise
+    except HashingSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except PoolTimeoutError:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Login error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Login error: {str(e)}")
+
+@router.post("/logout")
+async def logout(user: dict = Depends(get_current_user), db: RequestConnection = Depends(get_db)):
+    """
+    Marca la sesión del usuario como cerrada.
+    
+    Args:
+        user (dict): Usuario autenticado.
+        db (RequestConnection): Conexión de la petición.
+    
+    Returns:
+        dict: Mensaje de confirmación.
+    """
+    try:
+        await async_user_logic.set_logged_in(user["id_user"], False, db=db)
+        return {"msg": "Logged out"}
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Logout error: {str(e)}")
+
+@router.post("/logout-all")
+async def logout_all(user: dict = Depends(get_current_user), db: RequestConnection = Depends(get_db)):
+    """
+    Cierra la sesión en todos los dispositivos revocando todos los tokens del usuario.
+    
+    Args:
+        user (dict): Usuario autenticado.
+        db (RequestConnection): Conexión de la petición.
+    
+    Returns:
+        dict: Mensaje de confirmación.
+    """
+    try:
+        await async_user_logic.revoke_tokens(user["id_user"], db=db)
+        return {"msg": "All sessions revoked"}
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Logout error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,42 @@
+# backend/app/rutas/export.py
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from ..core import data_export
+from ..security import require_admin
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+@router.get("/{kind}.{fmt}", dependencies=[Depends(require_admin)])
+async def export_table(kind: str, fmt: str):
+    """
+    Descarga una tabla (solo para administradores) con las columnas del
+    importador, para poder editarla y volver a subirla.
+
+    Solo el CSV se envía en streaming, según se lee de la base. El Excel se
+    genera completo en un archivo temporal (modo ``write_only``) y después se
+    envía por trozos, así que tarda más en empezar cuanto mayor es la tabla.
+    
+    Args:
+        kind (str): ``services``, ``users`` o ``reservations``.
+        fmt (str): ``csv`` o ``xlsx``.
+    
+    Returns:
+        StreamingResponse: Archivo como adjunto.
+    
+    Raises:
+        HTTPException: Si el tipo o el formato no existen.
+    """
+    if kind not in data_export.EXPORTS or fmt not in ("csv", "xlsx"):
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    _, columns = data_export.EXPORTS[kind]
+    headers = {"Content-Disposition": f'attachment; filename="{kind}.{fmt}"'}
+    if fmt == "csv":
+        return StreamingResponse(
+            data_export.stream_csv(columns, data_export.iter_batches(kind)),
+            media_type="text/csv; charset=utf-8",
+            headers=headers
+        )
+
+    spool = await data_export.write_xlsx(columns, data_export.iter_batches(kind), kind)
+    return StreamingResponse(data_export.iter_file(spool), media_type=data_export.XLSX_MEDIA_TYPE, headers=headers)
\ No newline at end of file
@@ -1,127 +1,237 @@
 # backend/app/rutas/reservation.py
-from fastapi import APIRouter, HTTPException, Depends, Header
-from ..core import reservation_logic, user_logic
-from ..models import ReservationCreate, ReservationOut
-from jose import jwt, JWTError
-from ..config import settings
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import Response, StreamingResponse
+from ..core import async_reservation_logic, availability, reference_data
+from ..core.reservation_logic import ReservationConflictError
+from ..core.serialization import ORJSONResponse
+from ..models import ReservationCreate, ReservationOut, ReservationPage, ReservationChanges, AvailabilityOut
+from ..async_database import RequestConnection, get_db
+from ..security import get_current_user, require_admin
+from ..database import PoolTimeoutError
 
 router = APIRouter(prefix="/reservations", tags=["Reservations"])
 
-def get_current_user(authorization: str = Header(...)):
-    """
-    Obtiene el usuario actual desde el token JWT.
-    
-    Args:
-        authorization (str): Token de autorización.
-    
-    Returns:
-        dict: Datos del usuario autenticado.
-    
-    Raises:
-        HTTPException: Si el token es inválido.
-    """
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid token header")
-    token = authorization.split(" ")[1]
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        user = user_logic.get_user_by_email(email)
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
 
-def verify_admin_token(authorization: str = Header(...)):
+def reservation_filters(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    id_reservation_status: Optional[int] = None,
+    id_service: Optional[int] = None,
+    id_user: Optional[int] = None
+) -> dict:
     """
-    Verifica que el token pertenezca a un administrador.
-    
+    Dependencia con los filtros comunes del listado y la exportación de reservas.
+
     Args:
-        authorization (str): Token de autorización.
-    
+        date_from (Optional[date]): Solo reservas que empiezan desde este día (parámetro ``from``).
+        date_to (Optional[date]): Solo reservas que empiezan hasta este día inclusive (parámetro ``to``).
+        id_reservation_status (Optional[int]): Filtra por estado.
+        id_service (Optional[int]): Filtra por servicio.
+        id_user (Optional[int]): Filtra por cliente.
+
     Returns:
-        dict: Datos del usuario administrador.
-    
-    Raises:
-        HTTPException: Si el token es inválido o el usuario no es administrador.
+        dict: Filtros para ``reservation_logic.build_listing_query``.
     """
-    user = get_current_user(authorization)
-    if user["id_role"] != 1:  # solo admin (id_role=1)
-        raise HTTPException(status_code=403, detail="Not authorized")
-    return user
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "id_reservation_status": id_reservation_status,
+        "id_service": id_service,
+        "id_user": id_user,
+    }
 
 @router.post("/", response_model=dict)
-def create_reservation(data: ReservationCreate, user: dict = Depends(get_current_user)):
+async def create_reservation(data: ReservationCreate, user: dict = Depends(get_current_user), db: RequestConnection = Depends(get_db)):
     """
     Crea una nueva reserva con inicio y fin específicos.
     
     Args:
         data (ReservationCreate): Datos de la reserva.
         user (dict): Usuario autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación y ID de la nueva reserva.
     
     Raises:
-        HTTPException: Si hay un error al crear la reserva.
+        HTTPException: 409 si el horario ya está ocupado, 400 si los datos no son válidos.
     """
     try:
-        new_id = reservation_logic.create_reservation(user["id_user"], data.dict())
+        new_id = await async_reservation_logic.create_reservation(user["id_user"], data.dict(), db=db)
         return {"msg": "Reservation created successfully", "id_reservation": new_id}
+    except ReservationConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except PoolTimeoutError:
+        raise  # 503 con Retry-After en main.pool_timeout_handler
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating reservation: {str(e)}")
 
 @router.get("/my-reservations", response_model=list[ReservationOut])
-def get_my_reservations(user: dict = Depends(get_current_user)):
+async def get_my_reservations(user: dict = Depends(get_current_user), db: RequestConnection = Depends(get_db)):
     """
-    Obtiene todas las reservas del usuario autenticado.
+    Obtiene todas las reservas del usuario autenticado. La respuesta sale de
+    ``reservation_cache`` mientras no cambie ninguna reserva del usuario.
     
     Args:
         user (dict): Usuario autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
-        list[ReservationOut]: Lista de reservas del usuario.
+        list[ReservationOut]: Lista de reservas del usuario (filas de la base, sin revalidar).
     
     Raises:
         HTTPException: Si hay un error al obtener las reservas.
     """
     try:
-        reservations = reservation_logic.get_user_reservations(user["id_user"])
-        return reservations
+        body = await async_reservation_logic.get_user_reservations_json(user["id_user"], db=db)
+        return Response(content=body, media_type="application/json")
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting reservations: {str(e)}")
 
-@router.get("/", response_model=list[ReservationOut])
-def get_all_reservations(user: dict = Depends(verify_admin_token)):
+@router.get("/", response_model=ReservationPage)
+async def get_all_reservations(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    filters: dict = Depends(reservation_filters),
+    user: dict = Depends(require_admin),
+    db: RequestConnection = Depends(get_db)
+):
     """
-    Obtiene todas las reservas del sistema (solo para administradores).
+    Obtiene una página de las reservas del sistema (solo para administradores),
+    de la más reciente a la más antigua.
     
     Args:
+        cursor (Optional[str]): ``next_cursor`` de la página anterior.
+        limit (int): Tamaño de página (1-200).
+        filters (dict): Filtros de ``reservation_filters``.
         user (dict): Usuario administrador.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
-        list[ReservationOut]: Lista de todas las reservas.
+        ReservationPage: Reservas de la página y cursor de la siguiente (sin revalidar).
     
     Raises:
-        HTTPException: Si hay un error al obtener las reservas.
+        HTTPException: Si el cursor no es válido o hay un error al obtener las reservas.
     """
     try:
-        reservations = reservation_logic.get_all_reservations()
-        return reservations
+        page = await async_reservation_logic.get_all_reservations(filters, cursor, limit, db=db)
+        return ORJSONResponse(page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting reservations: {str(e)}")
 
+@router.get("/changes", response_model=ReservationChanges)
+async def get_reservation_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    user: dict = Depends(require_admin),
+    db: RequestConnection = Depends(get_db)
+):
+    """
+    Devuelve las reservas insertadas, modificadas o borradas desde ``since``
+    (solo para administradores), para actualizar un listado ya cargado sin
+    volver a descargarlo.
+
+    Sin ``since`` devuelve solo el token inicial; conviene pedirlo antes de
+    cargar el listado. Si ``has_more`` es true se vuelve a llamar enseguida
+    con ``next_token``.
+    
+    Args:
+        since (Optional[str]): ``next_token`` de la llamada anterior.
+        limit (int): Máximo de filas (1-1000).
+        user (dict): Usuario administrador.
+        db (RequestConnection): Conexión de la petición.
+    
+    Returns:
+        ReservationChanges: Reservas cambiadas (las borradas con ``state`` false) y token siguiente.
+    
+    Raises:
+        HTTPException: Si el token no es válido o hay un error al obtener los cambios.
+    """
+    try:
+        changes = await async_reservation_logic.get_reservation_changes(since, limit, db=db)
+        return ORJSONResponse(changes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting reservation changes: {str(e)}")
+
+@router.get("/export", dependencies=[Depends(require_admin)])
+async def export_reservations(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: dict = Depends(reservation_filters)
+):
+    """
+    Exporta las reservas (solo para administradores) en streaming, sin cargar
+    el resultado completo en memoria.
+    
+    Args:
+        format (str): ``ndjson`` (un objeto JSON por línea) o ``csv``.
+        filters (dict): Filtros de ``reservation_filters``.
+    
+    Returns:
+        StreamingResponse: Reservas de la más reciente a la más antigua.
+    """
+    return StreamingResponse(
+        async_reservation_logic.stream_reservations(format, filters),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="reservations.{format}"'}
+    )
+
+@router.get("/availability", response_model=AvailabilityOut)
+async def get_availability(
+    id_service: int,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    user: dict = Depends(get_current_user),
+    db: RequestConnection = Depends(get_db)
+):
+    """
+    Obtiene los horarios reservables de un servicio entre dos fechas (inclusive).
+    
+    Args:
+        id_service (int): ID del servicio.
+        date_from (date): Primer día (parámetro ``from``, formato YYYY-MM-DD).
+        date_to (date): Último día (parámetro ``to``, formato YYYY-MM-DD).
+        user (dict): Usuario autenticado.
+        db (RequestConnection): Conexión de la petición.
+    
+    Returns:
+        AvailabilityOut: Horas de inicio disponibles por día.
+    
+    Raises:
+        HTTPException: Si el rango o el servicio no son válidos o hay un error al calcularlos.
+    """
+    try:
+        return await availability.get_availability(id_service, date_from, date_to, db=db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting availability: {str(e)}")
+
 @router.get("/{id_reservation}", response_model=ReservationOut)
-def get_reservation(id_reservation: int, user: dict = Depends(get_current_user)):
+async def get_reservation(id_reservation: int, user: dict = Depends(get_current_user), db: RequestConnection = Depends(get_db)):
     """
     Obtiene una reserva por su ID.
     
     Args:
         id_reservation (int): ID de la reserva.
         user (dict): Usuario autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         ReservationOut: Datos de la reserva.
@@ -130,28 +240,31 @@ def get_reservation(id_reservation: int, user: dict = Depends(get_current_user))
         HTTPException: Si la reserva no se encuentra o no pertenece al usuario.
     """
     try:
-        reservation = reservation_logic.get_reservation_by_id(id_reservation)
+        reservation = await async_reservation_logic.get_reservation_by_id(id_reservation, db=db)
         if not reservation:
             raise HTTPException(status_code=404, detail="Reservation not found")
         
         # Verificar que la reserva pertenece al usuario (a menos que sea admin)
-        if user["id_role"] != 1 and reservation["id_user"] != user["id_user"]:
+        if not reference_data.is_admin(user["id_role"]) and reservation["id_user"] != user["id_user"]:
             raise HTTPException(status_code=403, detail="Not authorized to view this reservation")
         
-        return reservation
+        return ORJSONResponse(reservation)
     except HTTPException:
         raise
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting reservation: {str(e)}")
 
 @router.patch("/{id_reservation}/cancel")
-def cancel_reservation(id_reservation: int, user: dict = Depends(get_current_user)):
+async def cancel_reservation(id_reservation: int, user: dict = Depends(get_current_user), db: RequestConnection = Depends(get_db)):
     """
     Cancela una reserva del usuario autenticado.
     
     Args:
         id_reservation (int): ID de la reserva.
         user (dict): Usuario autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación.
@@ -160,18 +273,21 @@ def cancel_reservation(id_reservation: int, user: dict = Depends(get_current_use
         HTTPException: Si hay un error al cancelar la reserva.
     """
     try:
-        reservation_logic.cancel_reservation(id_reservation, user["id_user"])
+        await async_reservation_logic.cancel_reservation(id_reservation, user["id_user"], db=db)
         return {"msg": "Reservation cancelled successfully"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error cancelling reservation: {str(e)}")
 
 @router.patch("/{id_reservation}/status/{id_status}")
-def update_reservation_status(
+async def update_reservation_status(
     id_reservation: int, 
     id_status: int,
-    user: dict = Depends(verify_admin_token)
+    user: dict = Depends(require_admin),
+    db: RequestConnection = Depends(get_db)
 ):
     """
     Actualiza el estado de una reserva (solo para administradores).
@@ -180,27 +296,36 @@ def update_reservation_status(
         id_reservation (int): ID de la reserva.
         id_status (int): Nuevo ID del estado.
         user (dict): Usuario administrador.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación.
     
     Raises:
-        HTTPException: Si hay un error al actualizar el estado.
+        HTTPException: 409 si se reactiva una reserva cuyo horario ya está ocupado, 400 si el
+            estado no existe o 500 si hay un error al actualizar el estado.
     """
     try:
-        reservation_logic.update_reservation_status(id_reservation, id_status)
+        await async_reservation_logic.update_reservation_status(id_reservation, id_status, db=db)
         return {"msg": "Reservation status updated successfully"}
+    except ReservationConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating reservation status: {str(e)}")
 
 @router.delete("/{id_reservation}")
-def delete_reservation(id_reservation: int, user: dict = Depends(verify_admin_token)):
+async def delete_reservation(id_reservation: int, user: dict = Depends(require_admin), db: RequestConnection = Depends(get_db)):
     """
     Elimina lógicamente una reserva (solo para administradores).
     
     Args:
         id_reservation (int): ID de la reserva.
         user (dict): Usuario administrador.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación.
@@ -209,8 +334,10 @@ def delete_reservation(id_reservation: int, user: dict = Depends(verify_admin_to
         HTTPException: Si hay un error al eliminar la reserva.
     """
     try:
-        reservation_logic.delete_reservation(id_reservation)
+        await async_reservation_logic.delete_reservation(id_reservation, db=db)
         return {"msg": "Reservation deleted successfully"}
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting reservation: {str(e)}")
 
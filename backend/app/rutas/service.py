@@ -1,42 +1,24 @@
 #backend/app/rutas/service.py
-from fastapi import APIRouter, HTTPException, Depends, Header
-from ..core import service_logic, user_logic
+from fastapi import APIRouter, HTTPException, Depends, Request
+from ..core import async_service_logic, service_catalog
+from ..core.http_cache import conditional_response
 from ..models import ServiceBase, ServiceOut
-from jose import jwt, JWTError
-from ..config import settings
+from ..async_database import RequestConnection, get_db
+from ..security import require_admin
+from ..database import PoolTimeoutError
 
 router = APIRouter(prefix="/services", tags=["Services"])
 
-def verify_admin_token(authorization: str = Header(...)):
-    """
-    Verifica que el token pertenezca a un administrador.
-    
-    Args:
-        authorization (str): Token de autorización.
-    
-    Returns:
-        dict: Datos del usuario administrador.
-    
-    Raises:
-        HTTPException: Si el token es inválido o el usuario no es administrador.
-    """
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid token header")
-    token = authorization.split(" ")[1]
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        user = user_logic.get_user_by_email(email)
-        if not user or user["id_role"] != 1:  # solo admin (id_role=1)
-            raise HTTPException(status_code=403, detail="Not authorized")
-        return user
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
 @router.get("/", response_model=list[ServiceOut])
-def list_services():
+async def list_services(request: Request, db: RequestConnection = Depends(get_db)):
     """
-    Lista todos los servicios.
+    Lista todos los servicios desde el catálogo en memoria.
+
+    Responde ``304`` si ``If-None-Match`` coincide con el ETag del catálogo.
+
+    Args:
+        request (Request): Petición entrante.
+        db (RequestConnection): Conexión de la petición (solo si hay que reconstruir el catálogo).
     
     Returns:
         list[ServiceOut]: Lista de servicios.
@@ -45,17 +27,24 @@ def list_services():
         HTTPException: Si hay un error al obtener los servicios.
     """
     try:
-        return service_logic.get_all_services()
+        snapshot = await service_catalog.get_snapshot(db=db)
+        return conditional_response(request, snapshot.body, snapshot.etag)
+    except PoolTimeoutError:
+        raise  # 503 con Retry-After en main.pool_timeout_handler
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing services: {str(e)}")
 
 @router.get("/{id_service}", response_model=ServiceOut)
-def get_service(id_service: int):
+async def get_service(id_service: int, request: Request, db: RequestConnection = Depends(get_db)):
     """
-    Obtiene un servicio por su ID.
+    Obtiene un servicio por su ID desde el catálogo en memoria.
+
+    Responde ``304`` si ``If-None-Match`` coincide con el ETag del servicio.
     
     Args:
         id_service (int): ID del servicio.
+        request (Request): Petición entrante.
+        db (RequestConnection): Conexión de la petición (solo si hay que reconstruir el catálogo).
     
     Returns:
         ServiceOut: Datos del servicio.
@@ -64,20 +53,27 @@ def get_service(id_service: int):
         HTTPException: Si el servicio no se encuentra o hay un error.
     """
     try:
-        service = service_logic.get_service_by_id(id_service)
-        if not service:
+        snapshot = await service_catalog.get_snapshot(db=db)
+        item = snapshot.items.get(id_service)
+        if not item:
             raise HTTPException(status_code=404, detail="Service not found")
-        return service
+        body, etag = item
+        return conditional_response(request, body, etag)
+    except HTTPException:
+        raise
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting service: {str(e)}")
 
-@router.post("/", dependencies=[Depends(verify_admin_token)])
-def create_service(data: ServiceBase):
+@router.post("/", dependencies=[Depends(require_admin)])
+async def create_service(data: ServiceBase, db: RequestConnection = Depends(get_db)):
     """
     Crea un nuevo servicio.
     
     Args:
         data (ServiceBase): Datos del servicio a crear.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación y ID del nuevo servicio.
@@ -86,19 +82,22 @@ def create_service(data: ServiceBase):
         HTTPException: Si hay un error al crear el servicio.
     """
     try:
-        new_id = service_logic.create_service(data.dict())
+        new_id = await async_service_logic.create_service(data.dict(), db=db)
         return {"msg": "Service created", "id_service": new_id}
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating service: {str(e)}")
 
-@router.put("/{id_service}", dependencies=[Depends(verify_admin_token)])
-def update_service(id_service: int, data: ServiceBase):
+@router.put("/{id_service}", dependencies=[Depends(require_admin)])
+async def update_service(id_service: int, data: ServiceBase, db: RequestConnection = Depends(get_db)):
     """
     Actualiza un servicio existente.
     
     Args:
         id_service (int): ID del servicio a actualizar.
         data (ServiceBase): Nuevos datos del servicio.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación.
@@ -107,21 +106,24 @@ def update_service(id_service: int, data: ServiceBase):
         HTTPException: Si el servicio no se encuentra o hay un error al actualizarlo.
     """
     try:
-        existing = service_logic.get_service_by_id(id_service)
+        existing = await async_service_logic.get_service_by_id(id_service, db=db)
         if not existing:
             raise HTTPException(status_code=404, detail="Service not found")
-        service_logic.update_service(id_service, data.dict())
+        await async_service_logic.update_service(id_service, data.dict(), db=db)
         return {"msg": "Service updated"}
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating service: {str(e)}")
 
-@router.delete("/{id_service}", dependencies=[Depends(verify_admin_token)])
-def delete_service(id_service: int):
+@router.delete("/{id_service}", dependencies=[Depends(require_admin)])
+async def delete_service(id_service: int, db: RequestConnection = Depends(get_db)):
     """
     Elimina un servicio.
     
     Args:
         id_service (int): ID del servicio a eliminar.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación.
@@ -130,10 +132,12 @@ def delete_service(id_service: int):
         HTTPException: Si el servicio no se encuentra o hay un error al eliminarlo.
     """
     try:
-        existing = service_logic.get_service_by_id(id_service)
+        existing = await async_service_logic.get_service_by_id(id_service, db=db)
         if not existing:
             raise HTTPException(status_code=404, detail="Service not found")
-        service_logic.delete_service(id_service)
+        await async_service_logic.delete_service(id_service, db=db)
         return {"msg": "Service deleted"}
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting service: {str(e)}")
\ No newline at end of file
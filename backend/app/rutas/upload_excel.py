@@ -1,104 +1,126 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Header
-from typing import List
-from jose import jwt, JWTError
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from typing import List, Tuple
+import hashlib
+import os
+import tempfile
 from ..config import settings
-from ..core import user_logic, logic_upload_excel
-import time
+from ..async_database import RequestConnection, get_db
+from ..core import import_history, import_jobs, import_schemas
+from ..core.logic_upload_excel import detect_format
+from ..core.import_jobs import ImportQueueFullError
+from ..security import require_admin
 
 router = APIRouter(prefix="/upload", tags=["Excel Upload"])
 
-# Validación token admin
-def verify_admin_token(authorization: str = Header(...)):
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+async def _spool_upload(file: UploadFile) -> Tuple[str, str]:
     """
-    Verifica que el token pertenezca a un administrador.
-    
+    Copia el archivo subido a un archivo temporal por bloques de 1 MB y
+    calcula a la vez la huella sha256 de su contenido.
+
     Args:
-        authorization (str): Token de autorización.
-    
+        file (UploadFile): Archivo recibido.
+
     Returns:
-        dict: Datos del usuario administrador.
-    
+        tuple[str, str]: Ruta del archivo temporal (la borra el trabajo de importación) y huella en hexadecimal.
+
     Raises:
-        HTTPException: Si el token es inválido o el usuario no es administrador.
+        HTTPException: Si el archivo supera ``IMPORT_MAX_FILE_MB``.
     """
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid token header")
-    token = authorization.split(" ")[1]
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        user = user_logic.get_user_by_email(email)
-        if not user or user["id_role"] != 1:
-            raise HTTPException(status_code=403, detail="Not authorized")
-        return user
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    max_bytes = settings.IMPORT_MAX_FILE_MB * 1024 * 1024
+    size = 0
+    digest = hashlib.sha256()
+    suffix = os.path.splitext(file.filename)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix="import-") as spool:
+        try:
+            while chunk := await file.read(SPOOL_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"El archivo {file.filename} excede {settings.IMPORT_MAX_FILE_MB} MB"
+                    )
+                spool.write(chunk)
+                digest.update(chunk)
+        except BaseException:
+            spool.close()
+            os.unlink(spool.name)
+            raise
+    return spool.name, digest.hexdigest()
 
-@router.post("/excel", dependencies=[Depends(verify_admin_token)])
+@router.post("/excel", status_code=202, dependencies=[Depends(require_admin)])
 async def upload_excel(
     files: List[UploadFile] = File(...),
-    max_processing_time: int = 240  # 4 minutos en segundos
+    max_processing_time: int = 240,  # 4 minutos en segundos
+    force: bool = False,
+    kind: str = "services",
+    db: RequestConnection = Depends(get_db)
 ):
     """
-    Procesa la carga de archivos Excel.
+    Acepta la carga masiva de servicios, clientes o reservas históricas
+    (Excel .xlsx, CSV o Parquet) como un trabajo en segundo plano. El formato se detecta por el contenido,
+    no por la extensión.
+
+    Cada archivo se copia a disco y se lee por bloques, así que se aceptan
+    catálogos de hasta ``IMPORT_MAX_FILE_MB`` sin cargarlos enteros en
+    memoria. El procesamiento se hace fuera del event loop; el progreso y el
+    resultado se consultan con ``GET /upload/jobs/{job_id}``.
+
+    Un archivo idéntico (misma huella sha256) a uno ya importado no se vuelve
+    a procesar: se devuelve el resumen guardado. Si todos lo son, la
+    respuesta ya trae el trabajo terminado.
     
     Args:
-        files (List[UploadFile]): Lista de archivos Excel a procesar.
+        files (List[UploadFile]): Lista de archivos a procesar.
         max_processing_time (int): Tiempo máximo de procesamiento en segundos.
+        force (bool): Si es True, procesa los archivos aunque ya estén en el historial.
+        kind (str): Qué se importa: services, users (clientes con perfil) o reservations (históricas).
     
     Returns:
-        dict: Resumen del procesamiento y detalles por archivo.
+        dict: Estado inicial del trabajo, con su ``job_id``.
     
     Raises:
-        HTTPException: Si hay errores en la validación o procesamiento de archivos.
+        HTTPException: Si los archivos no son válidos o la cola de importación está llena.
     """
-    start_time = time.time()
     if len(files) > 5:
         raise HTTPException(status_code=400, detail="No se pueden subir más de 5 archivos.")
+    if kind not in import_schemas.SCHEMAS:
+        raise HTTPException(status_code=400, detail=f"Tipo de importación no válido: {kind}")
     
-    results = []
-    summary = {
-        "total_files": 0,
-        "total_processed": 0,
-        "completed": 0,
-        "skipped": 0,
-        "failed": 0
-    }
-    
+    payload = []
     try:
         for file in files:
-            if not (file.filename.endswith(".xls") or file.filename.endswith(".xlsx")):
-                raise HTTPException(status_code=400, detail=f"Formato no válido: {file.filename}")
-            
-            content = await file.read()
-            if len(content) > 5 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail=f"El archivo {file.filename} excede 5 MB")
-            
-            try:
-                file_result = logic_upload_excel.process_excel(
-                    content, 
-                    file.filename, 
-                    start_time, 
-                    max_time=max_processing_time
-                )
-                
-                # Acumular resultados
-                results.append(file_result)
-                summary["total_files"] += 1
-                summary["total_processed"] += file_result["total"]
-                summary["completed"] += file_result["completed"]
-                summary["skipped"] += file_result["skipped"]
-                summary["failed"] += file_result["failed"]
-                
-            except ValueError as ve:
-                raise HTTPException(status_code=400, detail=str(ve))
-            except TimeoutError as te:
-                raise HTTPException(status_code=408, detail=str(te))
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error inesperado: {str(e)}")
+            path, content_sha256 = await _spool_upload(file)
+            payload.append((file.filename, path, content_sha256))
+            detect_format(path, file.filename)
+        cached = {} if force else await import_history.find_cached(kind, [p[2] for p in payload], db=db)
+        return import_jobs.submit(payload, max_processing_time, cached, kind)
+    except BaseException as e:
+        for _, path, _ in payload:
+            if os.path.exists(path):
+                os.unlink(path)
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        if isinstance(e, ImportQueueFullError):
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+        raise
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(require_admin)])
+async def get_upload_job(job_id: str):
+    """
+    Consulta el progreso o el resultado de un trabajo de importación.
+    
+    Args:
+        job_id (str): ID devuelto por ``POST /upload/excel``.
     
-    return {
-        "summary": summary,
-        "details": results
-    }
\ No newline at end of file
+    Returns:
+        dict: Estado (queued, running, completed, failed), error, resumen y detalles por archivo.
+    
+    Raises:
+        HTTPException: Si el trabajo no existe o ya expiró.
+    """
+    job = import_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
\ No newline at end of file
@@ -1,64 +1,72 @@
 # backend/app/rutas/users.py
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-from ..core import user_logic
+from ..core import async_user_logic
+from ..core.serialization import ORJSONResponse, as_bool
 from ..models import UserOut, UserUpdate
-from ..security import get_current_user
+from ..security import get_current_user, require_admin
+from ..async_database import RequestConnection, get_db
+from ..database import PoolTimeoutError
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("/test")
-def test_auth(current_user: dict = Depends(get_current_user)):
+async def test_auth(current_user: dict = Depends(get_current_user)):
     """
     Endpoint de prueba para verificar la autenticación.
     """
     return {"message": "Auth working", "user": current_user}
 
 @router.get("/debug")
-def debug_users():
+async def debug_users(db: RequestConnection = Depends(get_db)):
     """
     Endpoint de debug para verificar usuarios sin autenticación.
+
+    Args:
+        db (RequestConnection): Conexión de la petición.
     """
     try:
-        users = user_logic.get_all_users()
+        users = await async_user_logic.get_all_users(db=db)
         return {"message": "Debug successful", "users_count": len(users), "users": users}
+    except PoolTimeoutError:
+        raise  # 503 con Retry-After en main.pool_timeout_handler
     except Exception as e:
         return {"message": "Debug failed", "error": str(e)}
 
 @router.get("/", response_model=List[UserOut])
-def get_all_users(current_user: dict = Depends(get_current_user)):
+async def get_all_users(current_user: dict = Depends(require_admin), db: RequestConnection = Depends(get_db)):
     """
     Obtiene todos los usuarios registrados en el sistema.
     Solo accesible para administradores.
     
     Args:
-        current_user (dict): Usuario autenticado actual.
+        current_user (dict): Usuario administrador autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
-        List[UserOut]: Lista de todos los usuarios.
+        List[UserOut]: Lista de todos los usuarios (filas de la base, sin revalidar).
     
     Raises:
         HTTPException: Si el usuario no es administrador.
     """
-    # Verificar que el usuario sea administrador
-    if current_user.get("role") != 1:
-        raise HTTPException(status_code=403, detail="Access denied. Admin role required.")
-    
     try:
-        users = user_logic.get_all_users()
-        return [UserOut(**user) for user in users]
+        users = await async_user_logic.get_all_users(db=db)
+        return ORJSONResponse(as_bool(users, "state"))
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting users: {str(e)}")
 
 @router.get("/{user_id}", response_model=UserOut)
-def get_user(user_id: int, current_user: dict = Depends(get_current_user)):
+async def get_user(user_id: int, current_user: dict = Depends(require_admin), db: RequestConnection = Depends(get_db)):
     """
     Obtiene un usuario específico por su ID.
     Solo accesible para administradores.
     
     Args:
         user_id (int): ID del usuario a obtener.
-        current_user (dict): Usuario autenticado actual.
+        current_user (dict): Usuario administrador autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         UserOut: Datos del usuario.
@@ -66,22 +74,20 @@ def get_user(user_id: int, current_user: dict = Depends(get_current_user)):
     Raises:
         HTTPException: Si el usuario no es administrador o no existe.
     """
-    # Verificar que el usuario sea administrador
-    if current_user.get("role") != 1:
-        raise HTTPException(status_code=403, detail="Access denied. Admin role required.")
-    
     try:
-        user = user_logic.get_user_by_id(user_id)
+        user = await async_user_logic.get_user_by_id(user_id, db=db)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return UserOut(**user)
     except HTTPException:
         raise
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting user: {str(e)}")
 
 @router.put("/{user_id}", response_model=UserOut)
-def update_user(user_id: int, user_data: UserUpdate, current_user: dict = Depends(get_current_user)):
+async def update_user(user_id: int, user_data: UserUpdate, current_user: dict = Depends(require_admin), db: RequestConnection = Depends(get_db)):
     """
     Actualiza los datos de un usuario.
     Solo accesible para administradores.
@@ -89,7 +95,8 @@ def update_user(user_id: int, user_data: UserUpdate, current_user: dict = Depend
     Args:
         user_id (int): ID del usuario a actualizar.
         user_data (UserUpdate): Datos a actualizar.
-        current_user (dict): Usuario autenticado actual.
+        current_user (dict): Usuario administrador autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         UserOut: Datos actualizados del usuario.
@@ -97,33 +104,32 @@ def update_user(user_id: int, user_data: UserUpdate, current_user: dict = Depend
     Raises:
         HTTPException: Si el usuario no es administrador o no existe.
     """
-    # Verificar que el usuario sea administrador
-    if current_user.get("role") != 1:
-        raise HTTPException(status_code=403, detail="Access denied. Admin role required.")
-    
     try:
         # Verificar que el usuario existe
-        existing_user = user_logic.get_user_by_id(user_id)
+        existing_user = await async_user_logic.get_user_by_id(user_id, db=db)
         if not existing_user:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Actualizar usuario
-        updated_user = user_logic.update_user(user_id, user_data.dict(exclude_unset=True))
+        updated_user = await async_user_logic.update_user(user_id, user_data.dict(exclude_unset=True), db=db)
         return UserOut(**updated_user)
     except HTTPException:
         raise
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating user: {str(e)}")
 
 @router.patch("/{user_id}/deactivate")
-def deactivate_user(user_id: int, current_user: dict = Depends(get_current_user)):
+async def deactivate_user(user_id: int, current_user: dict = Depends(require_admin), db: RequestConnection = Depends(get_db)):
     """
     Desactiva un usuario (soft delete).
     Solo accesible para administradores.
     
     Args:
         user_id (int): ID del usuario a desactivar.
-        current_user (dict): Usuario autenticado actual.
+        current_user (dict): Usuario administrador autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación.
@@ -131,33 +137,32 @@ def deactivate_user(user_id: int, current_user: dict = Depends(get_current_user)
     Raises:
         HTTPException: Si el usuario no es administrador o no existe.
     """
-    # Verificar que el usuario sea administrador
-    if current_user.get("role") != 1:
-        raise HTTPException(status_code=403, detail="Access denied. Admin role required.")
-    
     try:
         # Verificar que el usuario existe
-        existing_user = user_logic.get_user_by_id(user_id)
+        existing_user = await async_user_logic.get_user_by_id(user_id, db=db)
         if not existing_user:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Desactivar usuario
-        user_logic.deactivate_user(user_id)
+        await async_user_logic.deactivate_user(user_id, db=db)
         return {"message": "User deactivated successfully"}
     except HTTPException:
         raise
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deactivating user: {str(e)}")
 
 @router.patch("/{user_id}/activate")
-def activate_user(user_id: int, current_user: dict = Depends(get_current_user)):
+async def activate_user(user_id: int, current_user: dict = Depends(require_admin), db: RequestConnection = Depends(get_db)):
     """
     Reactiva un usuario.
     Solo accesible para administradores.
     
     Args:
         user_id (int): ID del usuario a reactivar.
-        current_user (dict): Usuario autenticado actual.
+        current_user (dict): Usuario administrador autenticado.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Mensaje de confirmación.
@@ -165,20 +170,18 @@ def activate_user(user_id: int, current_user: dict = Depends(get_current_user)):
     Raises:
         HTTPException: Si el usuario no es administrador o no existe.
     """
-    # Verificar que el usuario sea administrador
-    if current_user.get("role") != 1:
-        raise HTTPException(status_code=403, detail="Access denied. Admin role required.")
-    
     try:
         # Verificar que el usuario existe
-        existing_user = user_logic.get_user_by_id(user_id)
+        existing_user = await async_user_logic.get_user_by_id(user_id, db=db)
         if not existing_user:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Reactivar usuario
-        user_logic.activate_user(user_id)
+        await async_user_logic.activate_user(user_id, db=db)
         return {"message": "User activated successfully"}
     except HTTPException:
         raise
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error activating user: {str(e)}")
@@ -1,29 +1,40 @@
 # backend/app/security.py
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from . import config
-from .core import user_logic
+from .core import async_user_logic, principal_cache, reference_data, revocation
+from .core.password_hashing import crypt_context
+from .async_database import RequestConnection, get_db
+from .database import PoolTimeoutError
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = crypt_context(config.settings.BCRYPT_ROUNDS)
 
 # Configuración para JWT
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: RequestConnection = Depends(get_db)
+):
     """
     Obtiene el usuario actual basado en el token JWT.
+
+    Los tokens con claims ``uid``/``ver`` se verifican contra el mapa de
+    revocación en memoria, sin acceder a la base de datos. Los tokens
+    antiguos, o los de cuentas que aún no están en el mapa, se resuelven
+    desde la caché de principales y, si hace falta, desde la base.
     
     Args:
         credentials (HTTPAuthorizationCredentials): Credenciales de autorización.
+        db (RequestConnection): Conexión de la petición.
     
     Returns:
         dict: Información del usuario actual.
     
     Raises:
-        HTTPException: Si el token es inválido o el usuario no existe.
+        HTTPException: Si el token es inválido o revocado, el usuario no existe o está desactivado.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,16 +50,70 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+
+    user_id = payload.get("uid")
+    token_version = payload.get("ver")
+    if user_id is not None and token_version is not None:
+        verdict = revocation.check(user_id, token_version)
+        if verdict == revocation.VALID:
+            return {"id_user": user_id, "email": email, "id_role": payload.get("role"), "state": True}
+        if verdict == revocation.REVOKED:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
     
-    user = user_logic.get_user_by_email(email)
+    user = principal_cache.get_principal(email)
     if user is None:
-        raise credentials_exception
+        row = await async_user_logic.get_user_by_email(email, db=db)
+        if row is None:
+            raise credentials_exception
+        user = principal_cache.put_principal(row)
+
+    if not user["state"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
+    if token_version is not None and token_version != user["token_version"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
     
-    return {
-        "email": user["email"],
-        "role": user["id_role"],
-        "user_id": user["id_user"]
-    }
+    return user
+
+async def reference_data_ready(db: RequestConnection = Depends(get_db)):
+    """
+    Garantiza que los datos de referencia (estados y roles) estén cargados
+    antes de atender la petición; si la carga del arranque falló, la reintenta.
+
+    Args:
+        db (RequestConnection): Conexión de la petición.
+
+    Raises:
+        HTTPException: 503 si no se pueden cargar.
+    """
+    if reference_data.loaded():
+        return
+    try:
+        await reference_data.ensure_loaded(db)
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Reference data not available: {str(e)}",
+            headers={"Retry-After": "1"}
+        )
+
+async def require_admin(user: dict = Depends(get_current_user)):
+    """
+    Verifica que el usuario autenticado sea administrador.
+
+    Args:
+        user (dict): Usuario autenticado.
+
+    Returns:
+        dict: Datos del usuario administrador.
+
+    Raises:
+        HTTPException: Si el usuario no es administrador.
+    """
+    if not reference_data.is_admin(user["id_role"]):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    return user
 
 def get_password_hash(password: str) -> str:
     """
@@ -75,6 +140,23 @@ def verify_password(plain: str, hashed: str) -> bool:
     """
     return pwd_context.verify(plain, hashed)
 
+def build_token_claims(user: dict) -> dict:
+    """
+    Construye los claims autosuficientes del token de acceso.
+
+    Args:
+        user (dict): Usuario autenticado (id_user, email, id_role, token_version).
+
+    Returns:
+        dict: Claims ``sub``, ``uid``, ``role`` y ``ver``.
+    """
+    return {
+        "sub": user["email"],
+        "uid": user["id_user"],
+        "role": user["id_role"],
+        "ver": user["token_version"]
+    }
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """
     Crea un token de acceso JWT.
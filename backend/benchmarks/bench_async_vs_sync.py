@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_async_vs_sync.py
+"""
+Benchmark: acceso a datos síncrono vs asíncrono
+===============================================
+Lanza N peticiones concurrentes de listado (servicios y reservas de un usuario)
+contra la base configurada en ``.env``, primero por el camino síncrono
+(mysql-connector en un pool de hilos del tamaño del de FastAPI) y luego por
+el asíncrono (aiomysql en un único event loop).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_async_vs_sync --requests 500 --user-id 1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import reference_data, service_logic, reservation_logic
+from app.core import async_service_logic, async_reservation_logic
+from app.async_database import init_async_pool, close_async_pool
+
+# Hilos que usa por defecto el threadpool de Starlette/AnyIO
+STARLETTE_THREADS = 40
+
+
+def _report(label: str, latencies: list, elapsed: float):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{label:<6} {len(latencies) / elapsed:10.1f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:7.2f}ms  p99={p99 * 1000:7.2f}ms"
+    )
+
+
+def _sync_call(i: int, user_id: int) -> float:
+    started = time.perf_counter()
+    if i % 2:
+        service_logic.get_all_services()
+    else:
+        reservation_logic.get_user_reservations(user_id)
+    return time.perf_counter() - started
+
+
+def bench_sync(n: int, user_id: int):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=STARLETTE_THREADS) as executor:
+        latencies = list(executor.map(lambda i: _sync_call(i, user_id), range(n)))
+    _report("sync", latencies, time.perf_counter() - started)
+
+
+async def _async_call(i: int, user_id: int) -> float:
+    started = time.perf_counter()
+    if i % 2:
+        await async_service_logic.get_all_services()
+    else:
+        await async_reservation_logic.get_user_reservations(user_id)
+    return time.perf_counter() - started
+
+
+async def bench_async(n: int, user_id: int):
+    await init_async_pool()
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(_async_call(i, user_id) for i in range(n)))
+    _report("async", list(latencies), time.perf_counter() - started)
+    await close_async_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--user-id", type=int, default=1)
+    args = parser.parse_args()
+
+    reference_data.load_sync()
+    bench_sync(args.requests, args.user_id)
+    asyncio.run(bench_async(args.requests, args.user_id))
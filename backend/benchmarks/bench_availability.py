@@ -0,0 +1,61 @@
+# backend/benchmarks/bench_availability.py
+"""
+Benchmark: motor de disponibilidad
+==================================
+Mide ``build_bitmap`` + ``find_slots`` sobre bloques sintéticos, sin base de
+datos, para una ventana de N días con M bloques ocupados.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_availability --days 31 --blocks 5000 --duration 60
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.config import settings
+from app.core.availability import build_bitmap, find_slots
+
+
+def _blocks(days: int, count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        start = rng.randrange(0, days * 86400)
+        result.append((start, start + rng.choice((1800, 2700, 3600, 5400))))
+    return result
+
+
+def main(days: int, count: int, duration: int, rounds: int):
+    slot = settings.AVAILABILITY_SLOT_MINUTES
+    open_minute = settings.BUSINESS_OPEN_HOUR * 60
+    close_minute = settings.BUSINESS_CLOSE_HOUR * 60
+    needed = -(-duration // slot)
+    blocks = _blocks(days, count, seed=42)
+
+    build_times, search_times = [], []
+    found = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        bitmap = build_bitmap(days, blocks, slot)
+        built = time.perf_counter()
+        per_day = find_slots(bitmap, days, slot, open_minute, close_minute, needed)
+        build_times.append(built - started)
+        search_times.append(time.perf_counter() - built)
+        found = sum(len(starts) for starts in per_day)
+
+    print(f"days={days} blocks={count} duration={duration}min slot={slot}min -> {found} huecos")
+    print(f"build_bitmap  p50={statistics.median(build_times) * 1000:7.3f}ms")
+    print(f"find_slots    p50={statistics.median(search_times) * 1000:7.3f}ms")
+    total = [b + s for b, s in zip(build_times, search_times)]
+    print(f"total         p50={statistics.median(total) * 1000:7.3f}ms  max={max(total) * 1000:7.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--blocks", type=int, default=5000)
+    parser.add_argument("--duration", type=int, default=60)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    main(args.days, args.blocks, args.duration, args.rounds)
@@ -0,0 +1,83 @@
+# backend/benchmarks/bench_excel_validation.py
+"""
+Benchmark: validación de la importación Excel
+=============================================
+Genera un DataFrame sintético de servicios (con un porcentaje de filas
+inválidas) y compara ``validate_services`` (operaciones por columna) con la
+validación fila a fila con ``iterrows`` que usaba la importación antes.
+No necesita base de datos ni archivo Excel.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_excel_validation --rows 50000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from app.core.logic_upload_excel import validate_services
+
+
+def _frame(rows: int, invalid_ratio: float, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    data = {"name": [], "description": [], "duration_minutes": [], "price": [], "state": []}
+    for i in range(rows):
+        name, duration, price, state = f"Servicio {i}", rng.choice([30, 45, 60, 90]), rng.randint(5, 200), rng.choice([1, 0])
+        if rng.random() < invalid_ratio:
+            broken = rng.randrange(4)
+            if broken == 0:
+                name = ""
+            elif broken == 1:
+                duration = rng.choice([0, -15, "media hora"])
+            elif broken == 2:
+                price = rng.choice([-10, "gratis"])
+            else:
+                state = "quizás"
+        data["name"].append(name)
+        data["description"].append(rng.choice(["", "Descripción de prueba"]))
+        data["duration_minutes"].append(duration)
+        data["price"].append(price)
+        data["state"].append(state)
+    return pd.DataFrame(data)
+
+
+def _iterrows_baseline(df: pd.DataFrame) -> int:
+    failed = 0
+    for _, row in df.fillna("").iterrows():
+        if not row.get("name") or str(row["name"]).strip() == "":
+            failed += 1
+            continue
+        try:
+            duration = int(row["duration_minutes"])
+            price = float(row["price"])
+            bool(int(row["state"]) if str(row["state"]).isdigit() else row["state"])
+            if duration <= 0 or price < 0:
+                raise ValueError()
+        except ValueError:
+            failed += 1
+    return failed
+
+
+def main(rows: int, invalid_ratio: float):
+    df = _frame(rows, invalid_ratio, seed=11)
+
+    started = time.perf_counter()
+    _, reasons = validate_services(df)
+    vectorized = time.perf_counter() - started
+
+    started = time.perf_counter()
+    _iterrows_baseline(df)
+    baseline = time.perf_counter() - started
+
+    print(f"rows={rows} inválidas={int((reasons != '').sum())}")
+    print(f"validate_services  {vectorized * 1000:9.1f}ms")
+    print(f"iterrows           {baseline * 1000:9.1f}ms  ({baseline / vectorized:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--invalid-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+    main(args.rows, args.invalid_ratio)
@@ -0,0 +1,74 @@
+# backend/benchmarks/bench_export.py
+"""
+Benchmark: exportación CSV / Excel
+==================================
+Genera reservas sintéticas en bloques de ``EXPORT_BATCH_SIZE`` y mide tiempo
+y pico de memoria (tracemalloc) de ``stream_csv`` y ``write_xlsx`` de
+``app.core.data_export``, sin base de datos. El pico de memoria debe quedarse
+plano al subir ``--rows``.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_export --rows 200000
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.core.data_export import EXPORTS, stream_csv, write_xlsx
+from app.core.reservation_logic import EXPORT_BATCH_SIZE
+
+
+async def _batches(rows: int):
+    start = datetime(2024, 1, 1, 9)
+    for offset in range(0, rows, EXPORT_BATCH_SIZE):
+        batch = []
+        for i in range(offset, min(offset + EXPORT_BATCH_SIZE, rows)):
+            begin = start + timedelta(minutes=30 * i)
+            batch.append({
+                "email": f"cliente{i % 5000}@example.com",
+                "service": f"Servicio {i % 40}",
+                "start_datetime": begin,
+                "status": "Completado",
+                "payment_method": "Efectivo",
+                "end_datetime": begin + timedelta(minutes=60),
+                "total_price": Decimal("25.50"),
+            })
+        yield batch
+
+
+async def _csv(columns: tuple, rows: int) -> int:
+    size = 0
+    async for chunk in stream_csv(columns, _batches(rows)):
+        size += len(chunk)
+    return size
+
+
+async def _xlsx(columns: tuple, rows: int) -> int:
+    with await write_xlsx(columns, _batches(rows), "reservations") as spool:
+        return spool.seek(0, 2)
+
+
+def _measure(label: str, coro):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = asyncio.run(coro)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:5s} {elapsed * 1000:9.1f}ms  pico={peak / (1024 * 1024):6.1f}MB  archivo={size / (1024 * 1024):6.1f}MB")
+
+
+def main(rows: int):
+    _, columns = EXPORTS["reservations"]
+    print(f"rows={rows} batch={EXPORT_BATCH_SIZE}")
+    _measure("csv", _csv(columns, rows))
+    _measure("xlsx", _xlsx(columns, rows))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    main(parser.parse_args().rows)
@@ -0,0 +1,69 @@
+# backend/benchmarks/bench_import_formats.py
+"""
+Benchmark: lectura y validación por formato de importación
+==========================================================
+Escribe el mismo catálogo sintético como .xlsx, .csv y .parquet y mide
+cuántas filas por segundo procesan ``read_chunks`` + ``validate_services``
+con cada formato (la etapa que corre en el pool de procesos). No necesita
+base de datos.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_import_formats --rows 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+from openpyxl import Workbook
+
+from app.core.logic_upload_excel import detect_format, read_chunks, validate_services
+from benchmarks.bench_excel_validation import _frame
+
+
+def _write_xlsx(df: pd.DataFrame, path: str):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(df.columns))
+    for row in df.itertuples(index=False):
+        sheet.append(list(row))
+    workbook.save(path)
+
+
+def _write_files(df: pd.DataFrame, directory: str) -> dict:
+    paths = {fmt: os.path.join(directory, f"catalogo.{fmt}") for fmt in ("xlsx", "csv", "parquet")}
+    _write_xlsx(df, paths["xlsx"])
+    df.to_csv(paths["csv"], index=False)
+    df.astype(str).to_parquet(paths["parquet"], index=False)
+    return paths
+
+
+def _read_and_validate(path: str) -> int:
+    rows = 0
+    for chunk in read_chunks(path, os.path.basename(path)):
+        validate_services(chunk)
+        rows += len(chunk)
+    return rows
+
+
+def main(rows: int, invalid_ratio: float):
+    df = _frame(rows, invalid_ratio, seed=11)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _write_files(df, directory)
+        print(f"rows={rows}")
+        for fmt, path in paths.items():
+            assert detect_format(path, path) == fmt
+            started = time.perf_counter()
+            read = _read_and_validate(path)
+            elapsed = time.perf_counter() - started
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{fmt:8s} {size:7.1f}MB {elapsed * 1000:9.1f}ms {read / elapsed:12,.0f} filas/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--invalid-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+    main(args.rows, args.invalid_ratio)
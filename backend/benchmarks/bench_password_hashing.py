@@ -0,0 +1,54 @@
+# backend/benchmarks/bench_password_hashing.py
+"""
+Benchmark: verificación de contraseñas en el pool de procesos
+=============================================================
+Simula ráfagas de login verificando la misma contraseña con distintos números
+de procesos en ``password_hashing`` y reporta logins/s totales y por núcleo.
+No necesita base de datos.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_password_hashing --logins 200 --workers 1 2 4 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.config import settings
+from app.core import password_hashing
+
+
+async def _burst(n: int, hashed: str) -> float:
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(password_hashing.verify_and_update("benchmark-password", hashed) for _ in range(n))
+    )
+    elapsed = time.perf_counter() - started
+    assert all(valid for valid, _ in results)
+    return elapsed
+
+
+async def main(logins: int, workers: list, rounds: int):
+    settings.BCRYPT_ROUNDS = rounds
+    settings.HASH_QUEUE_LIMIT = logins
+    hashed = password_hashing.crypt_context(rounds).hash("benchmark-password")
+    print(f"bcrypt rounds={rounds}  logins={logins}  cpus={os.cpu_count()}")
+
+    for count in workers:
+        settings.HASH_WORKERS = count
+        password_hashing.shutdown()
+        await _burst(count, hashed)  # arranque de los procesos
+        elapsed = await _burst(logins, hashed)
+        rate = logins / elapsed
+        print(f"workers={count:<3} {rate:8.1f} logins/s  {rate / count:8.1f} logins/s por núcleo")
+
+    password_hashing.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.workers, args.rounds))
@@ -0,0 +1,103 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Benchmark: serialización de listados
+====================================
+Compara, por cada 10k filas, el camino anterior de los listados (``strftime``
+por fila, validación con el ``response_model`` y ``json`` de la librería
+estándar) con el actual (filas del driver codificadas con ``ORJSONResponse``).
+Usa filas sintéticas de reservas y de usuarios, sin base de datos.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.reservation_logic import format_datetimes
+from app.core.serialization import ORJSONResponse, as_bool
+from app.models import ReservationOut, UserOut
+
+_reservations_adapter = TypeAdapter(list[ReservationOut])
+_users_adapter = TypeAdapter(list[UserOut])
+
+
+def _reservations(rows: int) -> list:
+    start = datetime(2024, 1, 1, 9)
+    result = []
+    for i in range(rows):
+        begin = start + timedelta(minutes=30 * i)
+        result.append({
+            "id_reservation": i + 1, "id_user": i % 5000 + 1, "id_service": i % 40 + 1,
+            "id_reservation_status": i % 4 + 1, "start_datetime": begin,
+            "end_datetime": begin + timedelta(minutes=60), "created_at": begin - timedelta(days=3),
+            "total_price": Decimal("25.50"), "payment_method": "Efectivo", "state": 1,
+            "service_name": f"Servicio {i % 40}", "status_name": "Confirmado",
+            "first_name": "Ana", "last_name": "Pérez", "email": f"cliente{i % 5000}@example.com",
+        })
+    return result
+
+
+def _users(rows: int) -> list:
+    return [
+        {"id_user": i + 1, "email": f"cliente{i}@example.com", "id_role": 2, "state": 1,
+         "first_name": "Ana", "last_name": "Pérez", "phone": "600000000"}
+        for i in range(rows)
+    ]
+
+
+def _before_reservations(rows: list) -> bytes:
+    for row in rows:
+        format_datetimes(row)
+    models = _reservations_adapter.validate_python(rows)
+    return JSONResponse(_reservations_adapter.dump_python(models, mode="json")).body
+
+
+def _after_reservations(rows: list) -> bytes:
+    return ORJSONResponse(as_bool(rows, "state")).body
+
+
+def _before_users(rows: list) -> bytes:
+    # La ruta construía UserOut(**user) y FastAPI volvía a validarlos con el response_model
+    models = _users_adapter.validate_python([UserOut(**row) for row in rows])
+    return JSONResponse(_users_adapter.dump_python(models, mode="json")).body
+
+
+def _after_users(rows: list) -> bytes:
+    return ORJSONResponse(as_bool(rows, "state")).body
+
+
+def _measure(label: str, make_rows, fn, rows: int, repeat: int) -> float:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        data = make_rows(rows)
+        started = time.perf_counter()
+        size = len(fn(data))
+        best = min(best, time.perf_counter() - started)
+    per_10k = best * 1000 * 10000 / rows
+    print(f"{label:22s} {per_10k:8.1f}ms/10k filas  ({size / 1024:8.1f} KB)")
+    return per_10k
+
+
+def main(rows: int, repeat: int):
+    print(f"rows={rows} repeat={repeat} (mejor de {repeat})")
+    for name, make_rows, before, after in (
+        ("reservas", _reservations, _before_reservations, _after_reservations),
+        ("usuarios", _users, _before_users, _after_users),
+    ):
+        slow = _measure(f"{name} antes", make_rows, before, rows, repeat)
+        fast = _measure(f"{name} ahora", make_rows, after, rows, repeat)
+        print(f"{'':22s} x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
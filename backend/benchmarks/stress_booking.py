@@ -0,0 +1,153 @@
+# backend/benchmarks/stress_booking.py
+"""
+Prueba de estrés: reservas concurrentes sin dobles reservas
+===========================================================
+Lanza muchas reservas en paralelo sobre pocos horarios que se solapan entre sí
+(inicios cada 30 minutos con duración de 60) repartidos en varios días, y
+comprueba en la base que no quedó ningún par de bloques activos solapados.
+
+Las reservas creadas se eliminan al terminar salvo que se pase ``--keep``.
+
+Uso (desde backend/):
+    python -m benchmarks.stress_booking --requests 500 --concurrency 100 --user-id 1 --service-id 1
+    python -m benchmarks.stress_booking --mode sync --requests 500
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import aiomysql
+
+from app.async_database import init_async_pool, close_async_pool, get_async_conn
+from app.core import async_reservation_logic, reference_data, reservation_logic
+from app.core.reservation_logic import ReservationConflictError, ACTIVE_BLOCKS_IN_RANGE, blocks_in_range_params
+
+SQL_OVERLAPPING_PAIRS = """
+    SELECT COUNT(*) AS pairs
+    FROM calendar_block a
+    JOIN calendar_block b ON a.id_block < b.id_block
+     AND a.start_datetime < b.end_datetime AND b.start_datetime < a.end_datetime
+    WHERE a.id_block IN ({ids}) AND b.id_block IN ({ids})
+"""
+SQL_ACTIVE_BLOCK_IDS = "SELECT b.id_block" + ACTIVE_BLOCKS_IN_RANGE
+
+
+def _requests(n: int, first_day: date, days: int, slots: int, seed: int) -> list:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(n):
+        start = datetime.combine(first_day + timedelta(days=rng.randrange(days)), datetime.min.time())
+        start += timedelta(hours=9, minutes=30 * rng.randrange(slots))
+        result.append((start, start + timedelta(minutes=60)))
+    return result
+
+
+def _payload(service_id: int, start: datetime, end: datetime) -> dict:
+    return {
+        "id_service": service_id,
+        "start_datetime": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "end_datetime": end.strftime("%Y-%m-%d %H:%M:%S"),
+        "payment_method": "Efectivo",
+    }
+
+
+async def _run_async(windows: list, user_id: int, service_id: int, concurrency: int) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes, created = Counter(), []
+
+    async def book(start, end):
+        async with semaphore:
+            try:
+                created.append(await async_reservation_logic.create_reservation(
+                    user_id, _payload(service_id, start, end)
+                ))
+                outcomes["created"] += 1
+            except ReservationConflictError:
+                outcomes["conflict"] += 1
+            except Exception:
+                outcomes["error"] += 1
+
+    await asyncio.gather(*(book(start, end) for start, end in windows))
+    return outcomes, created
+
+
+def _run_sync(windows: list, user_id: int, service_id: int, concurrency: int) -> tuple:
+    def book(window):
+        try:
+            return "created", reservation_logic.create_reservation(user_id, _payload(service_id, *window))
+        except ReservationConflictError:
+            return "conflict", None
+        except Exception:
+            return "error", None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(book, windows))
+    return Counter(kind for kind, _ in results), [new_id for kind, new_id in results if new_id]
+
+
+async def _verify_and_cleanup(first_day: date, days: int, created: list, keep: bool) -> int:
+    window_start = datetime.combine(first_day, datetime.min.time())
+    window_end = window_start + timedelta(days=days)
+    async with get_async_conn() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cur:
+            await cur.execute(
+                SQL_ACTIVE_BLOCK_IDS,
+                blocks_in_range_params(window_start, window_end)
+            )
+            ids = [row["id_block"] for row in await cur.fetchall()]
+            pairs = 0
+            if ids:
+                placeholders = ", ".join(["%s"] * len(ids))
+                await cur.execute(SQL_OVERLAPPING_PAIRS.format(ids=placeholders), ids + ids)
+                pairs = (await cur.fetchone())["pairs"]
+
+            if created and not keep:
+                placeholders = ", ".join(["%s"] * len(created))
+                await cur.execute(f"DELETE FROM calendar_block WHERE id_reservation IN ({placeholders})", created)
+                await cur.execute(f"DELETE FROM reservation WHERE id_reservation IN ({placeholders})", created)
+    return pairs
+
+
+async def main(args):
+    first_day = date.fromisoformat(args.first_day)
+    windows = _requests(args.requests, first_day, args.days, args.slots, seed=7)
+    await init_async_pool()
+    await reference_data.load()
+    try:
+        started = time.perf_counter()
+        if args.mode == "async":
+            outcomes, created = await _run_async(windows, args.user_id, args.service_id, args.concurrency)
+        else:
+            outcomes, created = await asyncio.to_thread(
+                _run_sync, windows, args.user_id, args.service_id, args.concurrency
+            )
+        elapsed = time.perf_counter() - started
+
+        pairs = await _verify_and_cleanup(first_day, args.days, created, args.keep)
+    finally:
+        await close_async_pool()
+
+    print(f"mode={args.mode} requests={args.requests} concurrency={args.concurrency} "
+          f"{args.requests / elapsed:.1f} req/s")
+    print(f"created={outcomes['created']} conflict={outcomes['conflict']} error={outcomes['error']}")
+    print(f"bloques solapados: {pairs}")
+    if pairs:
+        raise SystemExit("FALLO: hay reservas solapadas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=("async", "sync"), default="async")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--service-id", type=int, default=1)
+    parser.add_argument("--first-day", default=(date.today() + timedelta(days=365)).isoformat())
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--slots", type=int, default=6)
+    parser.add_argument("--keep", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,137 @@
+# backend/tests/conftest.py
+"""
+Configuración común de las pruebas
+==================================
+Rellena las variables obligatorias de ``Settings`` (las pruebas no abren
+conexiones reales) y ofrece ``FakeConnection``: una conexión MySQL en memoria
+con autocommit activado, transacciones explícitas y savepoints, que imita lo
+necesario de mysql-connector para probar la importación masiva.
+"""
+
+import copy
+import os
+
+for _name in ("MYSQL_HOST", "MYSQL_USER", "MYSQL_PASSWORD", "MYSQL_DATABASE", "MYSQL_ROOT_PASSWORD", "SECRET_KEY"):
+    os.environ.setdefault(_name, "test")
+
+import pytest
+
+
+class SavepointError(Exception):
+    """Equivalente a MySQL 1305: SAVEPOINT does not exist."""
+
+
+class FakeCursor:
+    """
+    Cursor de ``FakeConnection``. Entiende SAVEPOINT / ROLLBACK TO SAVEPOINT
+    y los INSERT/SELECT de servicios y usuarios que usa la importación.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        statement = " ".join(sql.split())
+        if statement.startswith("SAVEPOINT "):
+            self.conn.savepoint(statement.split()[1])
+        elif statement.startswith("ROLLBACK TO SAVEPOINT "):
+            self.conn.rollback_to(statement.split()[3])
+        elif statement.startswith("SELECT id_user, email FROM user_account WHERE email IN"):
+            wanted = set(params)
+            self._rows = [
+                {"id_user": id_user, "email": account["email"]}
+                for id_user, account in self.conn.tables["user_account"].items()
+                if account["email"] in wanted
+            ]
+        else:
+            raise AssertionError(f"SQL no esperado en la prueba: {statement}")
+
+    def executemany(self, sql, seq_params):
+        statement = " ".join(sql.split())
+        for params in seq_params:
+            if statement.startswith("INSERT INTO service"):
+                name = params[0]
+                if not name:
+                    raise ValueError("Column 'name' cannot be null")
+                self.conn.write("service", {"name": name, "price": params[3]})
+            elif statement.startswith("INSERT INTO user_account"):
+                email = params[0]
+                if any(a["email"] == email for a in self.conn.tables["user_account"].values()):
+                    raise ValueError(f"Duplicate entry '{email}'")
+                self.conn.write("user_account", {"email": email, "id_role": params[2]})
+            elif statement.startswith("INSERT INTO user_profile"):
+                if len(params[3]) > 15:
+                    raise ValueError("Data too long for column 'phone'")
+                self.conn.write("user_profile", {"id_user": params[0], "phone": params[3]})
+            else:
+                raise AssertionError(f"SQL no esperado en la prueba: {statement}")
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """
+    Conexión en memoria con ``autocommit=True`` como las del pool: fuera de
+    ``start_transaction()`` cada escritura queda confirmada al momento y los
+    savepoints no sobreviven a la sentencia que los crea.
+    """
+
+    def __init__(self):
+        self.tables = {"service": {}, "user_account": {}, "user_profile": {}}
+        self._next_id = 1
+        self._begin = None          # copia de las tablas al abrir la transacción
+        self._savepoints = {}
+
+    @property
+    def in_transaction(self):
+        return self._begin is not None
+
+    def _snapshot(self):
+        return copy.deepcopy(self.tables), self._next_id
+
+    def _restore(self, snapshot):
+        tables, self._next_id = snapshot
+        self.tables = copy.deepcopy(tables)
+
+    def write(self, table, row):
+        self.tables[table][self._next_id] = row
+        self._next_id += 1
+
+    def start_transaction(self):
+        if self.in_transaction:
+            raise RuntimeError("Transaction already in progress")
+        self._begin = self._snapshot()
+
+    def savepoint(self, name):
+        # En autocommit MySQL acepta SAVEPOINT pero lo descarta al terminar la sentencia
+        if self.in_transaction:
+            self._savepoints[name] = self._snapshot()
+
+    def rollback_to(self, name):
+        if name not in self._savepoints:
+            raise SavepointError(f"SAVEPOINT {name} does not exist")
+        self._restore(self._savepoints[name])
+
+    def commit(self):
+        self._begin = None
+        self._savepoints.clear()
+
+    def rollback(self):
+        if self.in_transaction:
+            self._restore(self._begin)
+        self._begin = None
+        self._savepoints.clear()
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self)
+
+
+@pytest.fixture
+def conn():
+    return FakeConnection()
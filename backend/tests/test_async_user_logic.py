@@ -0,0 +1,32 @@
+# backend/tests/test_async_user_logic.py
+import asyncio
+
+from app.core import async_user_logic, password_hashing
+
+
+class _RequestConnection:
+    def __init__(self):
+        self.held = True
+
+    def release(self):
+        self.held = False
+
+
+def test_authenticate_releases_request_connection_before_hashing(monkeypatch):
+    db = _RequestConnection()
+    held_while_hashing = []
+
+    async def get_user_by_email(email, db=None):
+        return {"id_user": 7, "email": email, "password": "hash", "state": True}
+
+    async def verify_and_update(password, hashed):
+        held_while_hashing.append(db.held)
+        return True, None
+
+    monkeypatch.setattr(async_user_logic, "get_user_by_email", get_user_by_email)
+    monkeypatch.setattr(password_hashing, "verify_and_update", verify_and_update)
+
+    user = asyncio.run(async_user_logic.authenticate_user("ana@example.com", "secreto", db=db))
+
+    assert user == {"id_user": 7, "email": "ana@example.com", "state": True}
+    assert held_while_hashing == [False]
@@ -0,0 +1,26 @@
+# backend/tests/test_data_export.py
+import io
+
+from app.core import data_export, reference_data
+
+
+def test_reservation_rows_take_status_name_from_registry(monkeypatch):
+    monkeypatch.setattr(reference_data, "_data", reference_data.ReferenceData(
+        [{"id_reservation_status": 2, "name": "Confirmado"}], []
+    ))
+    row = {"email": "ana@example.com", "id_reservation_status": 2}
+
+    data_export.ROW_HOOKS["reservations"](row)
+
+    assert row["status"] == "Confirmado"
+    assert "status_name" not in row
+
+
+def test_iter_file_closes_spool_when_download_stops():
+    spool = io.BytesIO(b"x" * (data_export.FILE_CHUNK_BYTES * 3))
+    chunks = data_export.iter_file(spool)
+
+    next(chunks)
+    chunks.close()
+
+    assert spool.closed
@@ -0,0 +1,45 @@
+# backend/tests/test_import_jobs.py
+from concurrent.futures import Future
+
+from app.core import import_history, import_jobs, logic_upload_excel
+
+
+class InlineExecutor:
+    """Ejecuta cada tarea al enviarla, en el hilo de la prueba."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def _prepare(path, filename, max_time, schema):
+    return {"filename": filename, "total": 2, "failed": 0, "errors": [], "omitted_errors": 0,
+            "rows_path": path, "timings": {"parse": 0.0, "validate": 0.0}}
+
+
+def _write(prepared, deadline, on_progress=None, schema=None):
+    if prepared["filename"] == "roto.csv":
+        raise RuntimeError("Lost connection to MySQL server")
+    return {"filename": prepared["filename"], "total": 2, "completed": 2, "skipped": 0, "failed": 0,
+            "errors": [], "timings": dict(prepared["timings"], write=0.0)}
+
+
+def test_unexpected_error_fails_only_its_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(import_jobs, "_get_executor", InlineExecutor)
+    monkeypatch.setattr(import_jobs, "_get_parse_executor", InlineExecutor)
+    monkeypatch.setattr(logic_upload_excel, "prepare_file", _prepare)
+    monkeypatch.setattr(logic_upload_excel, "write_prepared", _write)
+    monkeypatch.setattr(import_history, "record", lambda *args: None)
+    files = []
+    for name in ("roto.csv", "bueno.csv"):
+        path = tmp_path / name
+        path.write_text("name\n")
+        files.append((name, str(path), name))
+
+    job = import_jobs.get_job(import_jobs.submit(files, 60)["job_id"])
+
+    assert job["status"] == import_jobs.COMPLETED
+    assert [d["status"] for d in job["details"]] == [import_jobs.FAILED, import_jobs.COMPLETED]
+    assert "Lost connection" in job["details"][0]["error"]
+    assert job["summary"]["completed"] == 2
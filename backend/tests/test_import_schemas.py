@@ -0,0 +1,36 @@
+# backend/tests/test_import_schemas.py
+from functools import partial
+
+from app.core import password_hashing
+from app.core.import_schemas import UserSchema
+from app.core.logic_upload_excel import insert_chunk
+
+
+def test_user_passwords_are_hashed_when_preparing_the_file(monkeypatch):
+    monkeypatch.setattr(password_hashing.settings, "BCRYPT_ROUNDS", 4)
+    rows = [(2, "ana@example.com", "secreto", "Ana", "Pérez", "600000001")]
+
+    prepared = UserSchema().prepare(rows)
+
+    assert prepared[0][:2] == rows[0][:2] and prepared[0][3:] == rows[0][3:]
+    assert password_hashing.crypt_context(4).verify("secreto", prepared[0][2])
+
+
+def test_user_import_rolls_back_account_when_profile_fails(conn):
+    cur = conn.cursor(dictionary=True)
+    rows = [
+        (2, "ana@example.com", "hash", "Ana", "Pérez", "600000001"),
+        (3, "luis@example.com", "hash", "Luis", "Gómez", "6" * 20),   # teléfono demasiado largo para la columna
+        (4, "eva@example.com", "hash", "Eva", "Ruiz", "600000003"),
+    ]
+    results = {"completed": 0, "failed": 0, "errors": [], "omitted_errors": 0}
+
+    insert_chunk(conn, cur, rows, results, partial(UserSchema().insert, context={"id_role": 2}))
+
+    assert results["completed"] == 2
+    assert results["failed"] == 1
+    emails = {account["email"] for account in conn.tables["user_account"].values()}
+    assert emails == {"ana@example.com", "eva@example.com"}
+    # Ninguna cuenta sin perfil
+    assert {profile["id_user"] for profile in conn.tables["user_profile"].values()} == set(conn.tables["user_account"])
+    assert not conn.in_transaction
@@ -0,0 +1,35 @@
+# backend/tests/test_logic_upload_excel.py
+from app.core.logic_upload_excel import insert_chunk
+
+
+def _results():
+    return {"completed": 0, "failed": 0, "errors": [], "omitted_errors": 0}
+
+
+def test_insert_chunk_isolates_bad_row(conn):
+    cur = conn.cursor(dictionary=True)
+    chunk = [
+        (2, "Corte", "", 30, 15.0, True),
+        (3, "", "", 30, 10.0, True),          # falla el INSERT del bloque
+        (4, "Tinte", "", 60, 40.0, True),
+    ]
+    results = _results()
+
+    insert_chunk(conn, cur, chunk, results)
+
+    assert results["completed"] == 2
+    assert results["failed"] == 1
+    assert results["errors"] == ["Fila 3: error al insertar"]
+    assert sorted(row["name"] for row in conn.tables["service"].values()) == ["Corte", "Tinte"]
+    assert not conn.in_transaction
+
+
+def test_insert_chunk_commits_clean_chunk(conn):
+    cur = conn.cursor(dictionary=True)
+    results = _results()
+
+    insert_chunk(conn, cur, [(2, "Corte", "", 30, 15.0, True)], results)
+
+    assert results == {"completed": 1, "failed": 0, "errors": [], "omitted_errors": 0}
+    assert len(conn.tables["service"]) == 1
+    assert not conn.in_transaction
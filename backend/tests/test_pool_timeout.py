@@ -0,0 +1,28 @@
+# backend/tests/test_pool_timeout.py
+from fastapi.testclient import TestClient
+
+from app import async_database
+from app.core import reference_data
+from app.database import PoolTimeoutError
+from app.main import app
+
+
+async def _fake_pool():
+    return object()
+
+
+async def _exhausted(pool):
+    raise PoolTimeoutError("No se obtuvo una conexión asíncrona en 5s")
+
+
+def test_exhausted_pool_returns_503(monkeypatch):
+    monkeypatch.setattr(async_database, "init_async_pool", _fake_pool)
+    monkeypatch.setattr(async_database, "_acquire", _exhausted)
+    monkeypatch.setattr(reference_data, "_data", reference_data.ReferenceData([], []))
+    client = TestClient(app)   # sin ``with``: no se ejecuta el startup ni se abre el pool real
+
+    response = client.get("/services/")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert "Servicio saturado" in response.json()["detail"]
@@ -0,0 +1,42 @@
+# backend/tests/test_principal_cache.py
+import pytest
+
+from app.core import principal_cache
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def small_cache(monkeypatch):
+    cache = TTLCache(maxsize=2, ttl=60, on_evict=principal_cache._forget)
+    monkeypatch.setattr(principal_cache, "_principals", cache)
+    monkeypatch.setattr(principal_cache, "_email_by_id", {})
+    return cache
+
+
+def _user(id_user):
+    return {"id_user": id_user, "email": f"u{id_user}@example.com", "password": "hash", "id_role": 2}
+
+
+def test_index_follows_lru_eviction(small_cache):
+    for id_user in (1, 2, 3):
+        principal_cache.put_principal(_user(id_user))
+
+    assert len(small_cache) == 2
+    assert principal_cache._email_by_id == {2: "u2@example.com", 3: "u3@example.com"}
+
+
+def test_index_drops_expired_entries(small_cache):
+    small_cache.ttl = -1
+    principal_cache.put_principal(_user(1))
+
+    assert principal_cache.get_principal("u1@example.com") is None
+    assert principal_cache._email_by_id == {}
+
+
+def test_invalidate_by_email_drops_index(small_cache):
+    principal_cache.put_principal(_user(1))
+
+    principal_cache.invalidate_principal(email="u1@example.com")
+
+    assert principal_cache.get_principal("u1@example.com") is None
+    assert principal_cache._email_by_id == {}
@@ -0,0 +1,34 @@
+# backend/tests/test_reference_data.py
+import asyncio
+
+import pytest
+
+from app.core import reference_data
+
+
+def test_ensure_loaded_retries_after_failed_startup(monkeypatch):
+    attempts = []
+
+    async def flaky_load(db=None):
+        attempts.append(db)
+        if len(attempts) == 1:
+            raise ConnectionError("MySQL no disponible")
+        data = reference_data.ReferenceData(
+            [{"id_reservation_status": 1, "name": "Pendiente"}], [{"id_role": 1, "name": "empleado"}]
+        )
+        monkeypatch.setattr(reference_data, "_data", data)
+        return data
+
+    monkeypatch.setattr(reference_data, "_data", None)
+    monkeypatch.setattr(reference_data, "load", flaky_load)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(reference_data.ensure_loaded())
+    with pytest.raises(RuntimeError):
+        reference_data.current()
+
+    asyncio.run(reference_data.ensure_loaded())
+
+    assert reference_data.is_admin(1)
+    asyncio.run(reference_data.ensure_loaded())
+    assert len(attempts) == 2
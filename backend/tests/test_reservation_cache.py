@@ -0,0 +1,31 @@
+# backend/tests/test_reservation_cache.py
+import pytest
+
+from app.core import reservation_cache
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def small_versions(monkeypatch):
+    versions = TTLCache(maxsize=2, ttl=60, on_evict=reservation_cache._version_dropped)
+    monkeypatch.setattr(reservation_cache, "_versions", versions)
+    monkeypatch.setattr(reservation_cache, "_bodies", TTLCache(maxsize=10, ttl=60))
+    return versions
+
+
+def test_version_counters_stay_bounded(small_versions):
+    for id_user in range(1, 6):
+        reservation_cache.invalidate(id_user)
+
+    assert len(small_versions) == 2
+
+
+def test_stale_read_is_not_stored_after_its_counter_is_dropped(small_versions):
+    seen = reservation_cache.version(1)     # lectura que empieza antes de una escritura
+    reservation_cache.invalidate(1)
+    reservation_cache.invalidate(2)
+    reservation_cache.invalidate(3)         # expulsa el contador del cliente 1
+
+    reservation_cache.put(1, b"[]", seen)
+
+    assert reservation_cache.get(1) is None
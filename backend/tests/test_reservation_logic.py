@@ -0,0 +1,156 @@
+# backend/tests/test_reservation_logic.py
+import copy
+from contextlib import contextmanager
+
+import pytest
+
+from app.core import reference_data, reservation_logic as logic
+from app.core.reservation_logic import ReservationConflictError
+
+PENDING, CANCELLED = 1, 3
+
+
+class BookingCursor:
+    """Cursor que entiende las consultas de reserva de ``reservation_logic``."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.lastrowid = None
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        tables = self.conn.tables
+        if sql == logic.SQL_ACTIVE_SERVICE:
+            self._rows = [{"name": "Corte", "duration_minutes": 60, "price": 15}]
+        elif sql.startswith("SELECT day FROM calendar_day_lock"):
+            assert self.conn.in_transaction, "FOR UPDATE fuera de transacción"
+            self._rows = [{"day": day} for day in params]
+        elif sql == logic.SQL_OVERLAPPING_BLOCK:
+            start, end_limit, end, cancelled = params
+            self._rows = [
+                {"id_block": id_block}
+                for id_block, block in tables["calendar_block"].items()
+                if start < block["end"] <= end_limit and block["start"] < end
+                and tables["reservation"][block["id_reservation"]]["status"] != cancelled
+            ][:1]
+        elif sql == logic.SQL_INSERT_RESERVATION:
+            id_user, _, status, start, end, _, _ = params
+            self.lastrowid = self.conn.insert("reservation", {
+                "id_user": id_user, "status": status, "start": start, "end": end
+            })
+        elif sql == logic.SQL_INSERT_BLOCK:
+            id_reservation, _, start, end = params
+            self.conn.insert("calendar_block", {"id_reservation": id_reservation, "start": start, "end": end})
+        elif sql == logic.SQL_RESERVATION_WINDOW:
+            row = tables["reservation"].get(params[0])
+            self._rows = [] if row is None else [{
+                "id_user": row["id_user"], "id_reservation_status": row["status"],
+                "start_datetime": row["start"], "end_datetime": row["end"],
+            }]
+        elif sql == logic.SQL_UPDATE_STATUS:
+            status, id_reservation = params
+            tables["reservation"][id_reservation]["status"] = status
+        else:
+            raise AssertionError(f"SQL no esperado en la prueba: {sql}")
+
+    def executemany(self, sql, seq_params):
+        assert sql == logic.SQL_ENSURE_DAY_LOCK
+
+    def fetchone(self):
+        rows, self._rows = self._rows, []
+        return rows[0] if rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class BookingConnection:
+    """Base en memoria de reservas y bloques, en autocommit salvo dentro de ``start_transaction``."""
+
+    def __init__(self):
+        self.tables = {"reservation": {}, "calendar_block": {}}
+        self._next_id = 1
+        self._begin = None
+
+    @property
+    def in_transaction(self):
+        return self._begin is not None
+
+    def insert(self, table, row):
+        new_id, self._next_id = self._next_id, self._next_id + 1
+        self.tables[table][new_id] = row
+        return new_id
+
+    def start_transaction(self):
+        assert not self.in_transaction
+        self._begin = copy.deepcopy((self.tables, self._next_id))
+
+    def commit(self):
+        self._begin = None
+
+    def rollback(self):
+        if self.in_transaction:
+            self.tables, self._next_id = self._begin
+        self._begin = None
+
+    def cursor(self, dictionary=False):
+        return BookingCursor(self)
+
+
+@pytest.fixture
+def booking_db(monkeypatch):
+    conn = BookingConnection()
+
+    @contextmanager
+    def get_conn():
+        yield conn
+
+    monkeypatch.setattr(logic, "get_conn", get_conn)
+    monkeypatch.setattr(reference_data, "_data", reference_data.ReferenceData(
+        [{"id_reservation_status": PENDING, "name": "Pendiente"},
+         {"id_reservation_status": CANCELLED, "name": "Cancelado"}],
+        [],
+    ))
+    return conn
+
+
+def _book(user, start, end):
+    return logic.create_reservation(user, {
+        "id_service": 1, "payment_method": "Efectivo",
+        "start_datetime": f"2025-03-10 {start}:00", "end_datetime": f"2025-03-10 {end}:00",
+    })
+
+
+def test_overlapping_booking_is_rejected(booking_db):
+    _book(1, "10:00", "11:00")
+
+    with pytest.raises(ReservationConflictError):
+        _book(2, "10:30", "11:30")
+    _book(2, "11:00", "12:00")      # contiguo: no se solapa
+
+    assert len(booking_db.tables["reservation"]) == 2
+    assert len(booking_db.tables["calendar_block"]) == 2
+    assert not booking_db.in_transaction
+
+
+def test_reactivating_cancelled_reservation_checks_overlap(booking_db):
+    first = _book(1, "10:00", "11:00")
+    logic.update_reservation_status(first, CANCELLED)
+    _book(2, "10:00", "11:00")      # el horario quedó libre
+
+    with pytest.raises(ReservationConflictError):
+        logic.update_reservation_status(first, PENDING)
+
+    assert booking_db.tables["reservation"][first]["status"] == CANCELLED
+    assert not booking_db.in_transaction
+
+
+def test_booking_longer_than_max_block_is_rejected(booking_db, monkeypatch):
+    monkeypatch.setattr(logic.settings, "MAX_BLOCK_MINUTES", 120)
+
+    with pytest.raises(ValueError):
+        _book(1, "09:00", "12:00")
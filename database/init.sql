@@ -18,10 +18,13 @@ CREATE TABLE user_account (
     password VARCHAR(255) NOT NULL,
     is_logged_in BOOLEAN NOT NULL DEFAULT FALSE,
     state BOOLEAN NOT NULL DEFAULT TRUE,
+    token_version INT NOT NULL DEFAULT 0 COMMENT 'Se incrementa para revocar todos los tokens del usuario',
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (id_role) REFERENCES role(id_role)
 );
 CREATE INDEX idx_user_email ON user_account (email);
 CREATE INDEX idx_user_role ON user_account (id_role);
+CREATE INDEX idx_user_updated_at ON user_account (updated_at);
 
 -- Perfil de usuario
 CREATE TABLE user_profile (
@@ -65,13 +68,17 @@ CREATE TABLE reservation (
     total_price DECIMAL(10,2) NOT NULL,
     payment_method VARCHAR(50) NOT NULL COMMENT 'ej., Efectivo, Tarjeta, Transferencia (ficticio)',
     state BOOLEAN NOT NULL DEFAULT TRUE,
+    updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (id_user) REFERENCES user_account(id_user),
     FOREIGN KEY (id_service) REFERENCES service(id_service),
     FOREIGN KEY (id_reservation_status) REFERENCES reservation_status(id_reservation_status)
 );
-CREATE INDEX idx_reservation_user ON reservation (id_user);
-CREATE INDEX idx_reservation_service ON reservation (id_service);
+CREATE INDEX idx_reservation_user_state ON reservation (id_user, state, start_datetime);
+CREATE INDEX idx_reservation_service_state ON reservation (id_service, state, start_datetime);
+CREATE INDEX idx_reservation_status_state ON reservation (id_reservation_status, state, start_datetime);
 CREATE INDEX idx_reservation_start_date ON reservation (start_datetime);
+CREATE INDEX idx_reservation_listing ON reservation (state, start_datetime, id_reservation);
+CREATE INDEX idx_reservation_updated_at ON reservation (updated_at);
 
 -- Bloques del calendario (nueva tabla)
 CREATE TABLE calendar_block (
@@ -85,6 +92,12 @@ CREATE TABLE calendar_block (
     state BOOLEAN DEFAULT TRUE,
     FOREIGN KEY (id_reservation) REFERENCES reservation(id_reservation)
 );
+CREATE INDEX idx_block_window_cover ON calendar_block (end_datetime, start_datetime, state, id_reservation);
+
+-- Cerrojo por día: serializa las reservas que comparten fecha
+CREATE TABLE calendar_day_lock (
+    day DATE PRIMARY KEY
+);
 
 -- Recordatorios automáticos
 CREATE TABLE reminder (
@@ -98,6 +111,28 @@ CREATE TABLE reminder (
 CREATE INDEX idx_reminder_reservation ON reminder (id_reservation);
 CREATE INDEX idx_reminder_datetime ON reminder (reminder_datetime);
 
+-- Historial de importaciones: resumen por tipo y huella (sha256) del contenido subido
+CREATE TABLE import_history (
+    id_import INT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL DEFAULT 'services' COMMENT 'services, users, reservations',
+    content_sha256 CHAR(64) NOT NULL,
+    filename VARCHAR(255) NOT NULL,
+    summary JSON NOT NULL COMMENT 'Resultado del archivo tal como lo devolvió la importación',
+    imported_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_import_content (kind, content_sha256)
+);
+
+-- Migraciones aplicadas (app/migrations); este archivo ya incluye hasta la V003
+CREATE TABLE schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO schema_migrations (version, name) VALUES
+(1, 'catch_up_schema'),
+(2, 'covering_indexes_hot_queries'),
+(3, 'reservation_updated_at');
+
 -- Datos iniciales
 INSERT INTO role (name, description) VALUES
 ('empleado', 'Empleado del salón con acceso limitado'),
@@ -1,7 +1,8 @@
-import { Component, OnInit } from '@angular/core';
+import { Component, OnDestroy, OnInit } from '@angular/core';
 import { Router } from '@angular/router';
 import { ServiceService, Service } from '../../../../services/service.service';
 import { HttpClient, HttpHeaders, HttpEventType } from '@angular/common/http';
+import { Subscription, switchMap, takeWhile, timer } from 'rxjs';
 
 interface FileItem {
   file: File;
@@ -9,8 +10,12 @@ interface FileItem {
 }
 
 interface UploadResult {
+  job_id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  error: string | null;
   summary: {
     total_files: number;
+    failed_files: number;
     total_processed: number;
     completed: number;
     skipped: number;
@@ -18,6 +23,10 @@ interface UploadResult {
   };
   details: Array<{
     filename: string;
+    status: 'queued' | 'running' | 'completed' | 'failed';
+    error: string | null;
+    cached: boolean;
+    timings: { parse?: number; validate?: number; write?: number };
     completed: number;
     skipped: number;
     failed: number;
@@ -31,7 +40,7 @@ interface UploadResult {
   templateUrl: './services.component.html',
   styleUrls: ['./services.component.css']
 })
-export class ServicesComponent implements OnInit {
+export class ServicesComponent implements OnInit, OnDestroy {
   services: Service[] = [];
   loading = false;
   error = '';
@@ -41,6 +50,7 @@ export class ServicesComponent implements OnInit {
   uploading = false;
   progress = 0;
   uploadResult: UploadResult | null = null;
+  private jobPolling?: Subscription;
 
   constructor(
     private serviceService: ServiceService,
@@ -52,6 +62,10 @@ export class ServicesComponent implements OnInit {
     this.fetchServices();
   }
 
+  ngOnDestroy(): void {
+    this.jobPolling?.unsubscribe();
+  }
+
   fetchServices(): void {
     this.loading = true;
     this.error = '';
@@ -111,9 +125,8 @@ export class ServicesComponent implements OnInit {
     }
 
     // Validar extensión
-    const invalidFiles = newFiles.filter(f => 
-      !f.name.toLowerCase().endsWith('.xls') && 
-      !f.name.toLowerCase().endsWith('.xlsx')
+    const invalidFiles = newFiles.filter(f =>
+      !['.xls', '.xlsx', '.csv', '.parquet'].some(ext => f.name.toLowerCase().endsWith(ext))
     );
     if (invalidFiles.length > 0) {
       alert(`Archivos con formato inválido: ${invalidFiles.map(f => f.name).join(', ')}`);
@@ -121,10 +134,10 @@ export class ServicesComponent implements OnInit {
       return;
     }
 
-    // Validar tamaño (5 MB por archivo)
-    const oversized = newFiles.filter(f => f.size > 5 * 1024 * 1024);
+    // Validar tamaño (100 MB por archivo)
+    const oversized = newFiles.filter(f => f.size > 100 * 1024 * 1024);
     if (oversized.length > 0) {
-      alert(`Archivos que superan 5 MB: ${oversized.map(f => f.name).join(', ')}`);
+      alert(`Archivos que superan 100 MB: ${oversized.map(f => f.name).join(', ')}`);
       event.target.value = '';
       return;
     }
@@ -185,22 +198,11 @@ export class ServicesComponent implements OnInit {
       next: event => {
         if (event.type === HttpEventType.UploadProgress && event.total) {
           this.progress = Math.round((event.loaded / event.total) * 100);
-        } else if (event.type === HttpEventType.Response) {
-          this.uploadResult = event.body;
-          this.uploading = false;
+        } else if (event.type === HttpEventType.Response && event.body) {
+          // El servidor acepta la carga como trabajo; se consulta su progreso
           this.progress = 100;
           this.selectedFiles = [];  // Limpiar archivos seleccionados
-          this.fetchServices(); // Recargar lista de servicios
-          
-          // Mostrar mensaje de éxito
-          if (this.uploadResult) {
-            const { completed, failed } = this.uploadResult.summary;
-            if (failed === 0) {
-              alert(`✓ Carga completada: ${completed} servicios agregados`);
-            } else {
-              alert(`Carga finalizada: ${completed} exitosos, ${failed} fallidos`);
-            }
-          }
+          this.pollUploadJob(event.body.job_id, headers);
         }
       },
       error: err => {
@@ -214,6 +216,40 @@ export class ServicesComponent implements OnInit {
     });
   }
 
+  private pollUploadJob(jobId: string, headers: HttpHeaders): void {
+    this.jobPolling?.unsubscribe();
+    this.jobPolling = timer(0, 1000).pipe(
+      switchMap(() => this.http.get<UploadResult>(`http://localhost:8000/upload/jobs/${jobId}`, { headers })),
+      takeWhile(job => job.status === 'queued' || job.status === 'running', true)
+    ).subscribe({
+      next: job => {
+        this.uploadResult = job;  // Conteos en vivo mientras se procesa
+        if (job.status === 'completed') {
+          this.uploading = false;
+          this.fetchServices(); // Recargar lista de servicios
+
+          // Mostrar mensaje de éxito
+          const { completed, failed } = job.summary;
+          if (failed === 0) {
+            alert(`✓ Carga completada: ${completed} servicios agregados`);
+          } else {
+            alert(`Carga finalizada: ${completed} exitosos, ${failed} fallidos`);
+          }
+        } else if (job.status === 'failed') {
+          this.uploading = false;
+          this.error = job.error || 'Error desconocido al procesar archivos';
+          this.fetchServices();
+          alert(`Error: ${this.error}`);
+        }
+      },
+      error: err => {
+        this.uploading = false;
+        this.error = err.error?.detail || 'No se pudo consultar el estado de la carga';
+        console.error('Error upload job:', err);
+      }
+    });
+  }
+
   getFileSize(bytes: number): string {
     if (bytes < 1024) return bytes + ' B';
     if (bytes < 1024 * 1024) return (bytes / 1024).toFixed(1) + ' KB';
@@ -143,7 +143,7 @@ export class ClientDashboardComponent implements OnInit {
     const reservation: ReservationCreate = {
       id_service: this.selectedService.id_service!,
       start_datetime: this.reservationData.start_datetime.replace('T', ' ') + ':00',
-      end_datetime: end.toISOString().slice(0, 19).replace('T', ' '),
+      end_datetime: this.toLocalDateTime(end),
       payment_method: this.reservationData.payment_method
     };
 
@@ -164,6 +164,13 @@ export class ClientDashboardComponent implements OnInit {
     });
   }
 
+  // Formatea en hora local (YYYY-MM-DD HH:MM:SS), igual que start_datetime
+  private toLocalDateTime(date: Date): string {
+    const pad = (n: number) => String(n).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())} ` +
+      `${pad(date.getHours())}:${pad(date.getMinutes())}:${pad(date.getSeconds())}`;
+  }
+
   getMinDateTime(): string {
     const tomorrow = new Date();
     tomorrow.setDate(tomorrow.getDate() + 1);
@@ -1,5 +1,5 @@
 import { Injectable } from '@angular/core';
-import { HttpClient, HttpHeaders } from '@angular/common/http';
+import { HttpClient, HttpHeaders, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
 
 export interface Reservation {
@@ -10,6 +10,7 @@ export interface Reservation {
   start_datetime: string;
   end_datetime: string;
   created_at?: string;
+  updated_at?: string;
   total_price?: number;
   payment_method: string;
   state?: boolean;
@@ -22,6 +23,27 @@ export interface Reservation {
   email?: string;
 }
 
+export interface ReservationPage {
+  items: Reservation[];
+  next_cursor: string | null;
+}
+
+export interface ReservationChanges {
+  items: Reservation[];
+  next_token: string;
+  has_more: boolean;
+}
+
+export interface ReservationFilters {
+  cursor?: string;
+  limit?: number;
+  from?: string;
+  to?: string;
+  id_reservation_status?: number;
+  id_service?: number;
+  id_user?: number;
+}
+
 export interface ReservationCreate {
   id_service: number;
   start_datetime: string;
@@ -29,6 +51,18 @@ export interface ReservationCreate {
   payment_method: string;
 }
 
+export interface AvailabilityDay {
+  date: string;
+  slots: string[];
+}
+
+export interface Availability {
+  id_service: number;
+  duration_minutes: number;
+  slot_minutes: number;
+  days: AvailabilityDay[];
+}
+
 @Injectable({
   providedIn: 'root'
 })
@@ -60,10 +94,44 @@ export class ReservationService {
   }
 
   /**
-   * Obtiene todas las reservas del sistema (solo para administradores)
+   * Obtiene una página de reservas del sistema (solo para administradores).
+   * Para la siguiente página se pasa el next_cursor recibido como cursor.
+   */
+  getAll(filters: ReservationFilters = {}): Observable<ReservationPage> {
+    let params = new HttpParams();
+    for (const [key, value] of Object.entries(filters)) {
+      if (value !== undefined && value !== null && value !== '') {
+        params = params.set(key, value);
+      }
+    }
+    return this.http.get<ReservationPage>(`${this.apiUrl}/`, { headers: this.getAuthHeaders(), params });
+  }
+
+  /**
+   * Obtiene las reservas insertadas, modificadas o borradas (state = false) desde
+   * un token (solo para administradores). Sin token devuelve solo el token inicial,
+   * que se pide antes de cargar el listado; si has_more es true se repite con next_token.
+   */
+  getChanges(since?: string, limit?: number): Observable<ReservationChanges> {
+    let params = new HttpParams();
+    if (since) {
+      params = params.set('since', since);
+    }
+    if (limit) {
+      params = params.set('limit', limit);
+    }
+    return this.http.get<ReservationChanges>(`${this.apiUrl}/changes`, { headers: this.getAuthHeaders(), params });
+  }
+
+  /**
+   * Obtiene los horarios disponibles de un servicio entre dos fechas (YYYY-MM-DD)
    */
-  getAll(): Observable<Reservation[]> {
-    return this.http.get<Reservation[]>(this.apiUrl, { headers: this.getAuthHeaders() });
+  getAvailability(idService: number, from: string, to: string): Observable<Availability> {
+    const params = new HttpParams()
+      .set('id_service', idService)
+      .set('from', from)
+      .set('to', to);
+    return this.http.get<Availability>(`${this.apiUrl}/availability`, { headers: this.getAuthHeaders(), params });
   }
 
   /**